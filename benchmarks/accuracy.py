@@ -0,0 +1,66 @@
+'''
+Accuracy benchmark for float geometric sums with common ratios close to 1.
+Compares the direct formula (1 - r**n) / (1 - r) and the engine's stable 
+expm1/log1p evaluation against an exact Fraction reference computed from the 
+same float ratio. Run from the repository root: python benchmarks/accuracy.py
+'''
+
+import math
+import os
+import sys
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import seriesengine
+
+offsets = [10.0 ** -exponent for exponent in range(2, 13)] # |r - 1| values
+lengths = [10, 100, 1000, 10000, 100000] # Number of terms
+
+
+def engineFactor(ratio: float, numberOfTerms: int) -> float:
+    try:
+        return seriesengine.geometricFactor(ratio, numberOfTerms)
+    except OverflowError:
+        return math.inf
+
+
+def relativeError(value: float, reference: Fraction) -> float:
+    if not math.isfinite(value):
+        return math.inf
+    # Only the difference needs to be exact, dividing two huge fractions 
+    # would be very slow
+    return abs(float(Fraction(value) - reference)) / abs(float(reference))
+
+
+def directFactor(ratio: float, numberOfTerms: int) -> float:
+    try:
+        return (1 - ratio ** numberOfTerms) / (1 - ratio)
+    except OverflowError:
+        return math.inf
+
+
+def run() -> None:
+    worst = {"direct": 0.0, "engine": 0.0}
+    print(f"{'ratio':>22} {'n':>7} {'direct error':>14} {'engine error':>14}")
+    for offset in offsets:
+        for ratio in (1 + offset, 1 - offset):
+            exactRatio = Fraction(ratio) # The float ratio, represented exactly
+            for numberOfTerms in lengths:
+                reference = ((1 - exactRatio ** numberOfTerms) 
+                             / (1 - exactRatio))
+                direct = relativeError(directFactor(ratio, numberOfTerms), 
+                                       reference)
+                engine = relativeError(engineFactor(ratio, numberOfTerms), 
+                                       reference)
+                if math.isinf(direct) and math.isinf(engine):
+                    continue # Both overflow, the sum is out of float range
+                worst["direct"] = max(worst["direct"], direct)
+                worst["engine"] = max(worst["engine"], engine)
+                print(f"{ratio:>22.15g} {numberOfTerms:>7} "
+                      f"{direct:>14.3e} {engine:>14.3e}")
+    print(f"\nWorst relative error - direct: {worst['direct']:.3e}, "
+          f"engine: {worst['engine']:.3e}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,70 @@
+'''
+Helpers shared by the benchmarks. Importing this module also makes the
+repository root importable, so the benchmarks can be run as scripts.
+'''
+
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+rootDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if rootDir not in sys.path:
+    sys.path.insert(0, rootDir)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    '''Statistics of a list of durations in seconds'''
+    return {"min": min(samples),
+            "median": statistics.median(samples),
+            "mean": statistics.fmean(samples),
+            "max": max(samples),
+            "samples": len(samples)}
+
+
+def measure(func: Callable[[], object],
+            repeat: int = 5,
+            setup: Optional[Callable[[], object]] = None
+            ) -> Dict[str, float]:
+    '''Time repeat calls of func (setup runs before each call, untimed)'''
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def hasDisplay() -> bool:
+    '''Whether Tk windows can be created (run under xvfb-run otherwise)'''
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return False
+    root.destroy()
+    return True
+
+
+class PreservedFile:
+    '''Context manager restoring a file's contents on exit, so benchmarks
+    that drive the GUI leave config.ini untouched'''
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __enter__(self) -> "PreservedFile":
+        with open(self.path, "rb") as f:
+            self.contents = f.read()
+        return self
+
+    def __exit__(self, *excInfo: object) -> None:
+        with open(self.path, "wb") as f:
+            f.write(self.contents)
@@ -0,0 +1,118 @@
+'''
+Throughput of the series engine. The scalar benchmark follows the path of
+Buttons.calculate (parse the entry strings, then evaluate), the batch
+benchmark the paths used by seriesbatch.py (batchSum and, with numpy,
+vectorSum). Every series type and precision mode is covered. Inputs are
+pseudo random but seeded, so runs are comparable.
+Run from the repository root: python benchmarks/engine.py [--quick]
+'''
+
+import argparse
+import json
+import random
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+import common
+import seriesengine
+
+SERIES_TYPES = {"arithmetic": seriesengine.ARITHMETIC,
+                "geometric": seriesengine.GEOMETRIC}
+# Rows per sample, exact geometric sums of long series are far slower than
+# float ones so the slower modes use fewer rows
+SCALAR_ROWS = {seriesengine.FLOAT: 20000,
+               seriesengine.DECIMAL: 5000,
+               seriesengine.EXACT: 500}
+BATCH_ROWS = {seriesengine.FLOAT: 200000,
+              seriesengine.DECIMAL: 20000,
+              seriesengine.EXACT: 2000}
+VECTOR_ROWS = 1000000
+
+
+def makeRows(count: int, seed: int = 0) -> List[Tuple[str, str, str]]:
+    '''Entry strings as typed into the calculator'''
+    generator = random.Random(seed)
+    return [(f"{generator.uniform(-100, 100):.3f}",
+             f"{generator.uniform(0.5, 1.5):.4f}",
+             str(generator.randint(1, 2000))) for _ in range(count)]
+
+
+def resetCaches() -> None:
+    seriesengine.cachedPower.cache_clear() # Keep repeated samples honest
+
+
+def throughput(timing: Dict[str, float], rows: int) -> Dict[str, Any]:
+    return {"rows": rows,
+            "seconds": timing,
+            "rowsPerSecond": rows / timing["median"],
+            "microsecondsPerRow": timing["median"] / rows * 1e6}
+
+
+def scalar(repeat: int, scale: float) -> Dict[str, Any]:
+    results = {}
+    for typeName, seqType in SERIES_TYPES.items():
+        for mode in seriesengine.PRECISION_MODES:
+            rows = makeRows(max(1, int(SCALAR_ROWS[mode] * scale)))
+
+            def calculate() -> None:
+                for firstTerm, commonDiffOrRatio, numberOfTerms in rows:
+                    seriesengine.evaluate(seqType, *seriesengine.parseInputs(
+                                            firstTerm, commonDiffOrRatio,
+                                            numberOfTerms, mode), mode)
+
+            results[f"{typeName}/{mode}"] = throughput(
+                common.measure(calculate, repeat, resetCaches), len(rows))
+    return results
+
+
+def batch(repeat: int, scale: float) -> Dict[str, Any]:
+    results = {}
+    for typeName, seqType in SERIES_TYPES.items():
+        for mode in seriesengine.PRECISION_MODES:
+            triples = [seriesengine.parseInputs(*row, mode) for row in
+                       makeRows(max(1, int(BATCH_ROWS[mode] * scale)))]
+            results[f"{typeName}/{mode}"] = throughput(
+                common.measure(
+                    lambda: seriesengine.batchSum(seqType, triples, mode),
+                    repeat, resetCaches),
+                len(triples))
+    return results
+
+
+def vector(repeat: int, scale: float) -> Dict[str, Any]:
+    try:
+        import numpy as np
+    except ImportError:
+        return {"skipped": "numpy is not installed"}
+    count = max(1, int(VECTOR_ROWS * scale))
+    generator = np.random.default_rng(0)
+    firstTerms = generator.uniform(-100, 100, count)
+    ratios = generator.uniform(0.5, 1.5, count)
+    lengths = generator.integers(1, 2001, count)
+    return {typeName: throughput(common.measure(
+                lambda: seriesengine.vectorSum(seqType, firstTerms, ratios,
+                                               lengths), repeat), count)
+            for typeName, seqType in SERIES_TYPES.items()}
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    repeat, scale = (3, 0.1) if quick else (5, 1.0)
+    started = time.perf_counter()
+    results = {"scalar": scalar(repeat, scale),
+               "batch": batch(repeat, scale),
+               "vector": vector(repeat, scale)}
+    results["elapsedSeconds"] = time.perf_counter() - started
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split(". ")[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="fewer rows and samples")
+    print(json.dumps(run(parser.parse_args().quick), indent=2))
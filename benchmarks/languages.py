@@ -0,0 +1,98 @@
+'''
+Language loading and switching latency for every translation file. Loading
+is measured both ways the GUI can read a language: parsing the JSON file and
+reshaping it (Languages.langDbConfigurer) and reading it from the
+precompiled bundle. Switching (Languages.switchLang, including the widget
+updates) needs a display and is skipped without one, use xvfb-run on
+headless machines.
+Run from the repository root: python benchmarks/languages.py [--quick]
+'''
+
+import argparse
+import json
+import os
+import time
+from typing import (
+    Any,
+    Dict,
+)
+
+import common
+import langbundle
+
+translationsPath = os.path.join(common.rootDir, "translations")
+bundlePath = os.path.join(common.rootDir, langbundle.BUNDLE_NAME)
+
+
+def readJson(lang: str) -> Dict[str, Any]:
+    with open(os.path.join(translationsPath, f"{lang}.json"), "r") as f:
+        return langbundle.shapeLangDb(json.load(f))
+
+
+def loading(repeat: int) -> Dict[str, Any]:
+    bundle = langbundle.openBundle(translationsPath, bundlePath)
+    if bundle is None:
+        raise SystemExit(f"Could not build {bundlePath}")
+    perLanguage = {}
+    try:
+        for fileName in sorted(os.listdir(translationsPath)):
+            lang = fileName[:-len(".json")]
+            result = {"json": common.measure(lambda: readJson(lang), repeat)}
+            if lang in bundle:
+                result["bundle"] = common.measure(lambda: bundle.read(lang),
+                                                  repeat)
+            perLanguage[lang] = result
+    finally:
+        bundle.close()
+    summary = {}
+    for source in ("json", "bundle"):
+        medians = [result[source]["median"] for result in
+                   perLanguage.values() if source in result]
+        summary[source] = common.summarize(medians)
+    return {"languages": len(perLanguage), "summary": summary,
+            "perLanguage": perLanguage}
+
+
+def switching() -> Dict[str, Any]:
+    if not common.hasDisplay():
+        return {"skipped": "no display (run under xvfb-run)"}
+    import seriescalculator
+
+    with common.PreservedFile(os.path.join(common.rootDir, "config.ini")):
+        program = seriescalculator.Program("Summing Series", (700, 580))
+        try:
+            program.update()
+            languages = program.languages
+            current = languages.loadedLangTuple[0]
+            # Finish on the starting language, switching to the language
+            # that is already loaded only shows a message box
+            order = [lang for lang in languages.availableLanguages
+                     if lang != current] + [current]
+            perLanguage = {}
+            for lang in order:
+                start = time.perf_counter()
+                languages.switchLang(lang)
+                program.update_idletasks() # Include redrawing the widgets
+                perLanguage[lang] = time.perf_counter() - start
+        finally:
+            program.cfg.dirty = False # config.ini is restored instead
+            program.destroy()
+    return {"languages": len(perLanguage),
+            "summary": common.summarize(list(perLanguage.values())),
+            "perLanguage": perLanguage}
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    started = time.perf_counter()
+    results = {"load": loading(3 if quick else 10),
+               "switch": switching()}
+    results["elapsedSeconds"] = time.perf_counter() - started
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split(". ")[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="fewer samples")
+    print(json.dumps(run(parser.parse_args().quick), indent=2))
@@ -0,0 +1,84 @@
+'''
+Runs the benchmark suite (engine.py, languages.py and startup.py) and writes
+the results as JSON, together with the environment they were measured in, so
+results can be compared across releases. GUI benchmarks need a display:
+    xvfb-run python benchmarks/run.py --output results.json
+accuracy.py is not part of the suite, it prints a table for reading.
+'''
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+
+import common
+import engine
+import languages
+import startup
+
+SUITES = {"engine": engine.run,
+          "languages": languages.run,
+          "startup": startup.run}
+
+
+def gitCommit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"],
+                              cwd=common.rootDir, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        import numpy
+        numpyVersion = numpy.__version__
+    except ImportError:
+        numpyVersion = None
+    return {"timestamp": datetime.datetime.now(
+                            datetime.timezone.utc).isoformat(),
+            "commit": gitCommit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": numpyVersion,
+            "display": common.hasDisplay()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split(". ")[0])
+    parser.add_argument("-o", "--output",
+                        help="JSON file to write (default: standard output)")
+    parser.add_argument("--quick", action="store_true",
+                        help="fewer rows and samples, for a quick check")
+    parser.add_argument("--only", choices=SUITES, action="append",
+                        help="run only this suite (can be repeated)")
+    args = parser.parse_args(argv)
+
+    results = {"environment": environment(), "quick": args.quick}
+    for name in args.only or SUITES:
+        print(f"Running {name} benchmarks", file=sys.stderr)
+        results[name] = SUITES[name](args.quick)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
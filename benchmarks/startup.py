@@ -0,0 +1,92 @@
+'''
+Cold start time. Each sample runs in a fresh interpreter: the time to import
+seriescalculator is always measured, building the window (normal and fast
+start, see seriescalculator.StartupTimer for the phases) needs a display
+and is skipped without one, use xvfb-run on headless machines.
+Run from the repository root: python benchmarks/startup.py [--quick]
+'''
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+import common
+
+IMPORT_CODE = """
+import json, time
+start = time.perf_counter()
+import seriescalculator
+print(json.dumps({"import": time.perf_counter() - start}))
+"""
+
+# Builds the window and processes everything queued for idle time (the
+# deferred work of fast start included), then exits without showing it
+WINDOW_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import seriescalculator
+timer = seriescalculator.StartupTimer(start)
+timer.mark("imports")
+program = seriescalculator.Program("Summing Series", (700, 580),
+                                   fastStart=sys.argv[1] == "fast",
+                                   timer=timer)
+program.update()
+program.cfg.dirty = False # Leave config.ini untouched
+print(json.dumps({"phases": dict(timer.phases),
+                  "total": timer.last - timer.start}))
+program.destroy()
+"""
+
+
+def sample(code: str, *args: str) -> Dict[str, Any]:
+    '''Run code in a new interpreter, returns the JSON it prints with the
+    wall time of the whole process added'''
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", code, *args],
+                               cwd=common.rootDir, capture_output=True,
+                               text=True, check=True)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - start
+    return result
+
+
+def summarizeSamples(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary = {key: common.summarize([s[key] for s in samples])
+               for key in samples[0] if key != "phases"}
+    if "phases" in samples[0]:
+        summary["phases"] = {phase: common.summarize(
+                                [s["phases"][phase] for s in samples])
+                             for phase in samples[0]["phases"]}
+    return summary
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    repeat = 3 if quick else 10
+    started = time.perf_counter()
+    results = {"import": summarizeSamples(
+                            [sample(IMPORT_CODE) for _ in range(repeat)])}
+    if common.hasDisplay():
+        with common.PreservedFile(os.path.join(common.rootDir, "config.ini")):
+            for mode in ("normal", "fast"):
+                results[f"window/{mode}"] = summarizeSamples(
+                    [sample(WINDOW_CODE, mode) for _ in range(repeat)])
+    else:
+        results["window"] = {"skipped": "no display (run under xvfb-run)"}
+    results["elapsedSeconds"] = time.perf_counter() - started
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split(". ")[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="fewer samples")
+    print(json.dumps(run(parser.parse_args().quick), indent=2))
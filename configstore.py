@@ -0,0 +1,76 @@
+''' In-memory configuration store. The program reads config.ini once and
+keeps the settings in memory as the single source of truth. Changes mark the
+store dirty and are written back after a short quiet period (so several
+changes in a row cause a single write) or when the program exits. Writes go
+to a temporary file that then replaces config.ini, so the file is never left
+half written.
+'''
+
+import atexit
+import os
+import tempfile
+from configparser import ConfigParser
+from typing import Any
+
+
+class ConfigStore(ConfigParser):
+    '''ConfigParser that tracks changes and flushes them to disk lazily'''
+    def __init__(self, path: str, section: str = "Main",
+                 flushDelay: int = 1000) -> None:
+        super().__init__()
+        self.path = path
+        self.section = section
+        self.flushDelay = flushDelay # Milliseconds without changes
+        self.read(path)
+        if not self.has_section(section):
+            self.add_section(section)
+        self.dirty = False
+        self.scheduler = None # Tk widget providing after/after_cancel
+        self.pendingFlush = None
+        atexit.register(self.flush) # Last resort if the program is killed
+
+    def attach(self, scheduler: Any) -> None:
+        '''Debounce flushes with scheduler's after method (a Tk widget).
+        Without a scheduler every change is written immediately'''
+        self.scheduler = scheduler
+
+    def setValues(self, **values: Any) -> bool:
+        '''Store settings in the section, returns True if anything changed'''
+        changed = False
+        for key, value in values.items():
+            value = str(value)
+            if self.get(self.section, key, fallback=None) != value:
+                self.set(self.section, key, value)
+                changed = True
+        if changed:
+            self.dirty = True
+            self.scheduleFlush()
+        return changed
+
+    def scheduleFlush(self) -> None:
+        if self.scheduler is None:
+            self.flush()
+            return
+        if self.pendingFlush is not None: # Restart the quiet period
+            self.scheduler.after_cancel(self.pendingFlush)
+        self.pendingFlush = self.scheduler.after(self.flushDelay, self.flush)
+
+    def flush(self) -> None:
+        '''Write the settings to disk if they changed since the last write'''
+        self.pendingFlush = None
+        if not self.dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tempPath = tempfile.mkstemp(dir=directory, prefix=".config-",
+                                        suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                self.write(f)
+            if os.path.exists(self.path): # mkstemp creates private files
+                os.chmod(tempPath, os.stat(self.path).st_mode)
+            os.replace(tempPath, self.path)
+        except OSError:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            raise
+        self.dirty = False
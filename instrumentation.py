@@ -0,0 +1,193 @@
+''' Opt-in instrumentation of the program's hot paths. Functions decorated
+with timed (or code wrapped in timer) record their call count and a latency
+histogram while instrumentation is enabled. When it is disabled, the only
+cost is a check of a module level flag per call.
+
+Metrics can be written to a JSON file (dump) or served as JSON from a local
+HTTP endpoint (serve). A whole run can also be wrapped in cProfile
+(profiled). The calculator exposes these with the --metrics, --metrics-port
+and --profile flags. The HTTP server and the profiler are imported only 
+when they are used, so importing this module costs little.
+'''
+
+import bisect
+import contextlib
+import functools
+import json
+import math
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+)
+
+if TYPE_CHECKING:
+    import cProfile
+    from http.server import ThreadingHTTPServer
+
+# Histogram bucket upper bounds in seconds (the last bucket is unbounded)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0,
+           math.inf)
+
+enabled = False
+metricsLock = threading.Lock() # Metrics are read by the HTTP server thread
+
+
+class Metric:
+    '''Call count, total, extremes and histogram of one timed operation'''
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0 # Calls that raised an exception
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def record(self, seconds: float, failed: bool = False) -> None:
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def asDict(self) -> Dict[str, Any]:
+        return {"count": self.count,
+                "errors": self.errors,
+                "totalSeconds": self.total,
+                "meanSeconds": self.total / self.count if self.count else None,
+                "minSeconds": self.min if self.count else None,
+                "maxSeconds": self.max,
+                # Upper bound of each bucket ("inf" for the last one)
+                "histogram": {("inf" if math.isinf(bound) else str(bound)):
+                              count for bound, count in
+                              zip(BUCKETS, self.buckets)}}
+
+
+metrics: Dict[str, Metric] = {}
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    with metricsLock:
+        metrics.clear()
+
+
+def record(name: str, seconds: float, failed: bool = False) -> None:
+    with metricsLock:
+        metric = metrics.get(name)
+        if metric is None:
+            metric = metrics[name] = Metric()
+        metric.record(seconds, failed)
+
+
+@contextlib.contextmanager
+def timer(name: str) -> Iterator[None]:
+    '''Time the body of a with statement'''
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        record(name, time.perf_counter() - start, failed)
+
+
+def timed(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    '''Decorator timing every call of a function, recorded under name
+    (the function's qualified name by default)'''
+    def decorator(func: Callable) -> Callable:
+        metricName = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record(metricName, time.perf_counter() - start, failed)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> Dict[str, Any]:
+    with metricsLock:
+        return {"enabled": enabled,
+                "metrics": {name: metric.asDict()
+                            for name, metric in sorted(metrics.items())}}
+
+
+def dump(path: str) -> None:
+    '''Write the metrics to a JSON file'''
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+        f.write("\n")
+
+
+def serve(port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    '''Serve the metrics as JSON on http://host:port/metrics from a daemon
+    thread. Only listens on the local machine by default. Call shutdown() on
+    the returned server to stop it'''
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = json.dumps(snapshot(), indent=2).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass # Keep the terminal quiet
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics",
+                     daemon=True).start()
+    return server
+
+
+@contextlib.contextmanager
+def profiled(path: Optional[str]
+             ) -> Iterator[Optional["cProfile.Profile"]]:
+    '''Run the body of a with statement under cProfile and write the stats
+    to path (view them with python -m pstats path). Does nothing if path is
+    None'''
+    if path is None:
+        yield None
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,196 @@
+''' Precompiled translation bundle. All files in translations/ are compiled
+into a single file (translations.bundle) holding every language database,
+already reshaped the way the GUI uses it, behind an offset table. The GUI
+reads the table once and then loads a single language by slicing its bytes
+out of a memory map, instead of scanning the directory and parsing a JSON
+file on every switch.
+
+File layout:
+MAGIC | header length (4 bytes, big endian) | header | language blobs
+The header is JSON: {"languages": {name: [offset, length], ...},
+"directory": mtime in ns}, with offsets relative to the start of the blobs.
+Each blob is compact JSON. The directory stamp is the modification time of
+translations/ when the bundle was built, checking it costs a single stat on
+startup. It changes when a file is added, removed or saved by replacing it
+(as most editors do), but not when a file is rewritten in place.
+
+The bundle is a build artifact and is not kept in the repository, the
+program builds it in the background on first run or when it is stale (see
+openBundle). Rebuild with: python langbundle.py (translator.py also 
+rebuilds it after writing or updating translations)
+'''
+
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+
+MAGIC = b"SSBUNDLE3\n"
+BUNDLE_NAME = "translations.bundle"
+
+currentDir = os.path.dirname(os.path.abspath(__file__))
+defaultTranslationsPath = os.path.join(currentDir, "translations")
+
+
+def shapeLangDb(rawLangDb: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+    '''Make the order of arrays more logical based on hierarchy
+    (using array slicing)'''
+    rawLangDb["entries"][1:3] = [rawLangDb["entries"][1:3]]
+    rawLangDb["fontsize"][1:4] = [rawLangDb["fontsize"][1:4]]
+    values = rawLangDb["appearance"]
+    rawLangDb["appearance"] = [[values[0], values[2:5]],
+                               [values[1], values[5:]]]
+    return rawLangDb
+
+
+def directoryStamp(translationsPath: Optional[str] = None) -> int:
+    '''Modification time (ns) of the translations directory, a change means
+    the bundle is out of date'''
+    return os.stat(translationsPath or defaultTranslationsPath).st_mtime_ns
+
+
+def buildBundle(translationsPath: Optional[str] = None,
+                bundlePath: Optional[str] = None) -> List[str]:
+    '''Compile every valid translation file into a bundle. Returns the names
+    of the files that were skipped because they are empty or malformed'''
+    translationsPath = translationsPath or defaultTranslationsPath
+    bundlePath = bundlePath or os.path.join(currentDir, BUNDLE_NAME)
+    # Taken before reading, so a file changed during the build makes the 
+    # bundle stale rather than silently missing the change
+    stamp = directoryStamp(translationsPath)
+    offsets = {}
+    blobs = []
+    position = 0
+    skipped = []
+    for fileName in sorted(os.listdir(translationsPath)):
+        if not fileName.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(translationsPath, fileName), "r") as f:
+                langDb = shapeLangDb(json.load(f))
+        except (json.decoder.JSONDecodeError, KeyError, IndexError):
+            skipped.append(fileName)
+            continue
+        blob = json.dumps(langDb, ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+        offsets[fileName[:-len(".json")]] = [position, len(blob)]
+        blobs.append(blob)
+        position += len(blob)
+
+    header = json.dumps({"languages": offsets, "directory": stamp}, 
+                        ensure_ascii=False,
+                        separators=(",", ":")).encode("utf-8")
+    # Write then rename, so the GUI never sees a half written bundle (the 
+    # temporary name is unique so concurrent builds do not share it)
+    temporaryPath = f"{bundlePath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporaryPath, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack(">I", len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(temporaryPath, bundlePath)
+    return skipped
+
+
+class LangBundle:
+    '''Read only view of a translation bundle'''
+    def __init__(self, bundlePath: Optional[str] = None) -> None:
+        self.bundlePath = bundlePath or os.path.join(currentDir, BUNDLE_NAME)
+        self.file = open(self.bundlePath, "rb")
+        try:
+            if self.file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.bundlePath} is not a bundle")
+            headerLength = struct.unpack(">I", self.file.read(4))[0]
+            header = json.loads(self.file.read(headerLength).decode("utf-8"))
+            self.offsets = header["languages"]
+            self.directory = header["directory"]
+            self.dataStart = len(MAGIC) + 4 + headerLength
+            self.data = mmap.mmap(self.file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except (struct.error, KeyError, TypeError):
+            self.file.close()
+            raise ValueError(f"{self.bundlePath} is corrupted") from None
+        except Exception:
+            self.file.close()
+            raise
+
+    def isCurrent(self, translationsPath: Optional[str] = None) -> bool:
+        '''Whether the translations directory is unchanged since the bundle 
+        was built (see the module docstring for what this detects)'''
+        try:
+            return self.directory == directoryStamp(translationsPath)
+        except OSError:
+            return False
+
+    def languages(self) -> List[str]:
+        return sorted(self.offsets)
+
+    def __contains__(self, lang: str) -> bool:
+        return lang in self.offsets
+
+    def read(self, lang: str) -> Dict[str, List[Any]]:
+        '''Load one language database (raises KeyError if it is missing)'''
+        offset, length = self.offsets[lang]
+        start = self.dataStart + offset
+        return json.loads(self.data[start:start + length].decode("utf-8"))
+
+    def close(self) -> None:
+        self.data.close()
+        self.file.close()
+
+
+def rebuildInBackground(translationsPath: Optional[str] = None,
+                        bundlePath: Optional[str] = None
+                        ) -> threading.Thread:
+    '''Build the bundle in a daemon thread, failures are ignored (the 
+    translation files are read directly until a build succeeds)'''
+    def rebuild() -> None:
+        try:
+            buildBundle(translationsPath, bundlePath)
+        except (OSError, ValueError):
+            pass
+    thread = threading.Thread(target=rebuild, name="bundle rebuild", 
+                              daemon=True)
+    thread.start()
+    return thread
+
+
+def openBundle(translationsPath: Optional[str] = None,
+               bundlePath: Optional[str] = None,
+               background: bool = False) -> Optional[LangBundle]:
+    '''Open the bundle, building it first if it is missing, corrupted or 
+    older than the translations directory. Returns None if it cannot be 
+    built (e.g. a read only installation), the translation files are then 
+    read directly. With background, a missing or stale bundle is rebuilt 
+    in another thread for the next run and None is returned at once'''
+    try:
+        bundle = LangBundle(bundlePath)
+    except (OSError, ValueError):
+        bundle = None
+    if bundle is not None:
+        if bundle.isCurrent(translationsPath):
+            return bundle
+        bundle.close() # Closed before it is replaced
+    if background:
+        rebuildInBackground(translationsPath, bundlePath)
+        return None
+    try:
+        buildBundle(translationsPath, bundlePath)
+        return LangBundle(bundlePath)
+    except (OSError, ValueError):
+        return None
+
+
+if __name__ == "__main__":
+    skippedFiles = buildBundle()
+    print(f"Bundle written to {os.path.join(currentDir, BUNDLE_NAME)}")
+    if skippedFiles:
+        print(f"Skipped (empty or malformed): {', '.join(skippedFiles)}")
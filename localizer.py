@@ -0,0 +1,73 @@
+''' Table-driven localisation. Each widget property that shows translated
+text is bound to a key path in the language database (see translator.py for
+the keys) once, when the widget is created. Applying a language walks the
+bindings and only calls the setters whose text actually changes, so switching
+languages does the minimum amount of Tk work and new widgets are localised
+without touching the language switching code.
+'''
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+KeyPath = Tuple[Any, ...] # e.g. ("entries", 1, 0)
+_unset = object() # Value of bindings that were never applied
+
+
+class Localizer:
+    '''Registry of (key path, setter) bindings'''
+    def __init__(self) -> None:
+        self.bindings: List[Tuple[KeyPath, Callable[[Any], None]]] = []
+        self.applied: List[Any] = [] # Last value given to each setter
+        self.langDb: Optional[Dict[str, Any]] = None
+        self.fallbackDb: Optional[Dict[str, Any]] = None
+
+    def bind(self, setter: Callable[[Any], None], *keyPath: Any) -> None:
+        '''Call setter with the translation at keyPath whenever it changes.
+        If a language was already applied, the setter is called right away'''
+        self.bindings.append((keyPath, setter))
+        self.applied.append(_unset)
+        if self.langDb is not None:
+            self.applyBinding(len(self.bindings) - 1)
+
+    def bindOption(self, widget: Any, option: str, *keyPath: Any) -> None:
+        '''Bind a widget configuration option such as text or
+        placeholder_text'''
+        self.bind(lambda value: widget.configure(**{option: value}), *keyPath)
+
+    def lookup(self, keyPath: KeyPath) -> Any:
+        '''Translation at keyPath, taken from the fallback database (English)
+        when the current language does not have it yet'''
+        for langDb in (self.langDb, self.fallbackDb):
+            value = langDb
+            try:
+                for key in keyPath:
+                    value = value[key]
+                return value
+            except (KeyError, IndexError, TypeError):
+                continue
+        raise KeyError(keyPath)
+
+    def applyBinding(self, index: int) -> bool:
+        keyPath, setter = self.bindings[index]
+        value = self.lookup(keyPath)
+        if value == self.applied[index]:
+            return False
+        # Lists are copied so that setters cannot modify the database
+        setter(list(value) if isinstance(value, list) else value)
+        self.applied[index] = value
+        return True
+
+    def apply(self, langDb: Dict[str, Any],
+              fallbackDb: Optional[Dict[str, Any]] = None) -> int:
+        '''Switch to a language database. Returns the number of setters that
+        were called'''
+        self.langDb = langDb
+        if fallbackDb is not None:
+            self.fallbackDb = fallbackDb
+        return sum(self.applyBinding(i) for i in range(len(self.bindings)))
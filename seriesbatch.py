@@ -0,0 +1,512 @@
+''' Headless batch mode. Streams rows of (series type, first term, common
+difference or ratio, number of terms) from CSV or JSONL input, computes the
+sums in chunks with seriesengine and streams the results back out, using the
+localised error messages from the translation files. With --solve, rows also
+have a target sum and the named column is solved for instead (its input value
+is ignored). With --modulus, integer rows are summed modulo m instead.
+
+Usage: python seriesbatch.py [input file] [options]
+   or: python seriescalculator.py --batch [input file] [options]
+Reads from stdin when no input file (or "-") is given. Run with --help for
+the list of options.
+'''
+
+import argparse
+import csv
+import decimal
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from configparser import ConfigParser
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+import seriesengine
+
+currentDir = os.path.dirname(os.path.abspath(__file__))
+
+sumCache = None # Per-process result cache, see getCache
+
+FIELDS = ["type", "firstTerm", "commonDiffOrRatio", "numberOfTerms"]
+SOLVE_FIELDS = FIELDS + ["target"]
+# Columns of the two known quantities for each unknown (see --solve)
+KNOWN_COLUMNS = {seriesengine.NUMBER_OF_TERMS: (1, 2),
+                 seriesengine.FIRST_TERM: (2, 3),
+                 seriesengine.COMMON_DIFF_OR_RATIO: (1, 3)}
+SERIES_TYPES = {
+    "1": seriesengine.ARITHMETIC,
+    "a": seriesengine.ARITHMETIC,
+    "arithmetic": seriesengine.ARITHMETIC,
+    "2": seriesengine.GEOMETRIC,
+    "g": seriesengine.GEOMETRIC,
+    "geometric": seriesengine.GEOMETRIC,
+    "3": seriesengine.CUSTOM,
+    "c": seriesengine.CUSTOM,
+    "custom": seriesengine.CUSTOM,
+    "4": seriesengine.ARITHMETICO_GEOMETRIC,
+    "ag": seriesengine.ARITHMETICO_GEOMETRIC,
+    "arithmetico-geometric": seriesengine.ARITHMETICO_GEOMETRIC,
+    "5": seriesengine.POWER,
+    "p": seriesengine.POWER,
+    "power": seriesengine.POWER,
+}
+
+
+def readConfig() -> ConfigParser:
+    cfg = ConfigParser()
+    cfg.read(f"{currentDir}/config.ini")
+    return cfg
+
+
+def loadErrorMessages(language: str) -> List[str]:
+    '''Error messages in the given language, falling back to English (also 
+    for messages the language has not been translated for yet)'''
+    messages = []
+    for lang in (language, "English"):
+        try:
+            with open(os.path.join(currentDir, "translations",
+                                   f"{lang.title()}.json"), "r") as f:
+                errors = json.load(f)["errors"]
+        except (OSError, json.decoder.JSONDecodeError, KeyError):
+            continue
+        messages += errors[len(messages):]
+    if not messages:
+        raise FileNotFoundError(
+            "No translations with error messages were found")
+    return messages
+
+
+def readRows(stream: TextIO, 
+             fmt: str, 
+             fields: List[str] = FIELDS) -> Iterator[List[Any]]:
+    '''Yield rows as [type, first term, difference/ratio, number of terms]
+    (followed by the target with SOLVE_FIELDS)'''
+    if fmt == "jsonl":
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.decoder.JSONDecodeError:
+                yield [line.rstrip("\n")] + [None] * (len(fields) - 1)
+                continue
+            if isinstance(record, dict):
+                yield [record.get(field) for field in fields]
+            else:
+                yield (list(record) + [None] * len(fields))[:len(fields)]
+        return
+
+    reader = csv.reader(stream)
+    for i, row in enumerate(reader):
+        if not row:
+            continue
+        if i == 0 and str(row[0]).strip().lower() == fields[0].lower():
+            continue # Skip the header row
+        yield (row + [None] * len(fields))[:len(fields)]
+
+
+def parseType(value: Any) -> int:
+    seqType = SERIES_TYPES.get(str(value).strip().lower())
+    if seqType is None:
+        raise ValueError(f"Unknown series type: {value!r}")
+    return seqType
+
+
+def parseRow(row: List[Any],
+             mode: str) -> Tuple[int, Any, Any, int]:
+    '''Convert a raw row into engine inputs (raises ValueError)'''
+    seqType = parseType(row[0])
+    numberOfTerms = row[3]
+    if isinstance(numberOfTerms, float) and numberOfTerms.is_integer():
+        numberOfTerms = int(numberOfTerms) # JSON numbers such as 10.0
+    if (not isinstance(numberOfTerms, (int, str)) 
+            or isinstance(numberOfTerms, bool)):
+        raise ValueError(f"Invalid number of terms: {numberOfTerms!r}")
+    if seqType == seriesengine.CUSTOM: # The first term column holds the 
+                                       # term formula
+        if not isinstance(row[1], str):
+            raise ValueError(f"Invalid formula: {row[1]!r}")
+        seriesengine.compileFormula(row[1].strip())
+        return (seqType, row[1], seriesengine.toNumber(row[2], mode), 
+                int(numberOfTerms))
+    if seqType == seriesengine.ARITHMETICO_GEOMETRIC: # "d;r" or [d, r]
+        pair = row[2].split(";") if isinstance(row[2], str) else row[2]
+        if not isinstance(pair, list) or len(pair) != 2:
+            raise ValueError(f"Invalid difference and ratio: {row[2]!r}")
+        return (seqType, seriesengine.toNumber(row[1], mode), 
+                tuple(seriesengine.toNumber(value, mode) for value in pair),
+                int(numberOfTerms))
+    if seqType == seriesengine.POWER: # The first term column holds the 
+                                      # exponent, the ratio is not used
+        return (seqType, seriesengine.toExponent(row[1]), None, 
+                int(numberOfTerms))
+    firstTerm, commonDiffOrRatio, numberOfTerms = seriesengine.parseInputs(
+                                    row[1], row[2], numberOfTerms, mode)
+    return seqType, firstTerm, commonDiffOrRatio, numberOfTerms
+
+
+def getCache(maxsize: int) -> seriesengine.SumCache:
+    '''The process's result cache, kept between chunks so that repeated 
+    rows anywhere in the input are only computed once per process'''
+    global sumCache
+    if sumCache is None:
+        sumCache = seriesengine.SumCache(maxsize)
+    elif sumCache.maxsize != maxsize:
+        sumCache.resize(maxsize)
+    return sumCache
+
+
+def solveChunk(rows: List[List[Any]],
+               unknown: str,
+               mode: str,
+               context: Optional[decimal.Context] = None
+               ) -> List[Tuple[Optional[Any], int]]:
+    '''Solve a chunk of SOLVE_FIELDS rows for the unknown, grouped by series 
+    type like processChunk (one batchSolve call per type)'''
+    results = [(None, seriesengine.VALUE_ERROR)] * len(rows)
+    groups = {seriesengine.ARITHMETIC: ([], []),
+              seriesengine.GEOMETRIC: ([], [])} # Type: (indexes, rows)
+    first, second = KNOWN_COLUMNS[unknown]
+    for i, row in enumerate(rows):
+        try:
+            seqType = parseType(row[0])
+        except ValueError:
+            continue
+        if seqType not in groups: # Custom series cannot be solved
+            continue
+        groups[seqType][0].append(i)
+        groups[seqType][1].append((row[first], row[second], row[4]))
+    for seqType, (indexes, known) in groups.items():
+        if not indexes:
+            continue
+        values, codes = seriesengine.batchSolve(unknown, seqType, known, 
+                                                mode, context)
+        for i, result, code in zip(indexes, values, codes):
+            results[i] = (result, code)
+    return results
+
+
+def processChunk(rows: List[List[Any]],
+                 mode: str,
+                 context: Optional[decimal.Context] = None,
+                 cacheSize: int = 0,
+                 unknown: Optional[str] = None,
+                 modulus: Optional[int] = None
+                 ) -> List[Tuple[Optional[Any], int]]:
+    '''Compute the sums of a chunk of rows (or solve them for the unknown, 
+    see solveChunk, or sum them modulo the modulus). Rows are grouped by 
+    series type so that each group is evaluated with a single batchSum (or 
+    batchModularSum) call'''
+    if unknown is not None:
+        return solveChunk(rows, unknown, mode, context)
+    results = [(None, seriesengine.VALUE_ERROR)] * len(rows)
+    groups = {seriesengine.ARITHMETIC: ([], []),
+              seriesengine.GEOMETRIC: ([], []),
+              seriesengine.CUSTOM: ([], []),
+              seriesengine.ARITHMETICO_GEOMETRIC: ([], []),
+              seriesengine.POWER: ([], [])} # Type: (indexes, triples)
+    for i, row in enumerate(rows):
+        try:
+            seqType, *triple = parseRow(row, mode)
+        except (ValueError, TypeError):
+            continue
+        except OverflowError: # Infinite values in exact mode
+            results[i] = (None, seriesengine.OVERFLOW_ERROR)
+            continue
+        groups[seqType][0].append(i)
+        groups[seqType][1].append(triple)
+
+    cache = getCache(cacheSize) if cacheSize > 0 else None
+    for seqType, (indexes, triples) in groups.items():
+        if not indexes:
+            continue
+        if modulus is not None:
+            if seqType == seriesengine.CUSTOM: # No modular sum
+                continue
+            sums, codes = seriesengine.batchModularSum(seqType, triples, 
+                                                       modulus)
+        else:
+            sums, codes = seriesengine.batchSum(seqType, triples, mode, 
+                                                context, cache)
+        for i, result, code in zip(indexes, sums, codes):
+            results[i] = (result, code)
+    return results
+
+
+def _jsonValue(result: Any) -> Any:
+    if result is None or isinstance(result, (int, float)):
+        return result
+    return seriesengine.formatResult(result) # Decimal and Fraction
+
+
+def writeResults(stream: TextIO,
+                 fmt: str,
+                 rows: List[List[Any]],
+                 results: List[Tuple[Optional[Any], int]],
+                 errors: List[str],
+                 writer: Any = None,
+                 unknown: Optional[str] = None) -> None:
+    fields = FIELDS if unknown is None else SOLVE_FIELDS
+    for row, (result, code) in zip(rows, results):
+        message = errors[code] if code != seriesengine.NO_ERROR else None
+        if fmt == "jsonl":
+            record = dict(zip(fields, row))
+            record[unknown or "sum"] = _jsonValue(result)
+            record["error"] = message
+            stream.write(json.dumps(record) + "\n")
+            continue
+        text = "" if result is None else seriesengine.formatResult(result)
+        if unknown is None:
+            writer.writerow(row + [text, message or ""])
+        else: # The solution takes the place of the ignored input
+            row = list(row)
+            row[FIELDS.index(unknown)] = text
+            writer.writerow(row + [message or ""])
+
+
+def chunked(rows: Iterable[List[Any]],
+            chunkSize: int) -> Iterator[List[List[Any]]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunkSize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _timedChunk(rows: List[List[Any]],
+                mode: str,
+                context: Optional[decimal.Context],
+                cacheSize: int,
+                unknown: Optional[str] = None,
+                modulus: Optional[int] = None
+                ) -> Tuple[List[Tuple[Optional[Any], int]], float]:
+    '''Worker process entry point, also returns the time spent on the chunk'''
+    start = time.perf_counter()
+    results = processChunk(rows, mode, context, cacheSize, unknown, modulus)
+    return results, time.perf_counter() - start
+
+
+def _timedBatchSum(triples: List[Tuple[Any, Any, int]],
+                   seqType: int,
+                   mode: str,
+                   context: Optional[decimal.Context]
+                   ) -> Tuple[Tuple[List[Optional[Any]], List[int]], float]:
+    start = time.perf_counter()
+    results = seriesengine.batchSum(seqType, triples, mode, context)
+    return results, time.perf_counter() - start
+
+
+def scheduleChunks(items: Iterable[Any],
+                   worker: Callable,
+                   args: Tuple = (),
+                   workers: Optional[int] = None,
+                   initialChunkSize: int = 1000,
+                   targetSeconds: float = 0.25,
+                   maxChunkSize: int = 200000) -> Iterator[Tuple[List, Any]]:
+    '''Evaluate worker(chunk, *args) over chunks of items in a process pool 
+    and yield (chunk, result) pairs in input order. Chunk sizes adapt so that 
+    each chunk takes roughly targetSeconds of worker time: small enough to 
+    balance the load across processes, large enough to amortise the cost of 
+    sending the chunk. At most two chunks per process are in flight, so 
+    memory use stays bounded for any input size'''
+    workers = workers or os.cpu_count() or 1
+    iterator = iter(items)
+    chunkSize = initialChunkSize
+    pending = deque() # (chunk, future) in submission order
+    exhausted = False
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while not exhausted and len(pending) < 2 * workers:
+                chunk = list(islice(iterator, chunkSize))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.append((chunk, executor.submit(worker, chunk, *args)))
+            if not pending:
+                return
+            chunk, future = pending.popleft()
+            result, elapsed = future.result()
+            if elapsed > 0:
+                chunkSize = int(len(chunk) * targetSeconds / elapsed)
+                chunkSize = max(1, min(chunkSize, maxChunkSize))
+            yield chunk, result
+
+
+def parallelBatchSum(seqType: int,
+                     triples: Iterable[Tuple[Any, Any, int]],
+                     mode: str = seriesengine.FLOAT,
+                     context: Optional[decimal.Context] = None,
+                     workers: Optional[int] = None
+                     ) -> Tuple[List[Optional[Any]], List[int], 
+                                Dict[str, float]]:
+    '''seriesengine.batchSum spread across a process pool. Returns the sums, 
+    the error codes and throughput statistics'''
+    start = time.perf_counter()
+    sums = []
+    codes = []
+    for _, (chunkSums, chunkCodes) in scheduleChunks(
+                                triples, _timedBatchSum, 
+                                (seqType, mode, context), workers):
+        sums.extend(chunkSums)
+        codes.extend(chunkCodes)
+    return sums, codes, _throughput(len(sums), time.perf_counter() - start)
+
+
+def _throughput(rows: int, seconds: float) -> Dict[str, float]:
+    return {"rows": rows, 
+            "seconds": seconds, 
+            "rowsPerSecond": rows / seconds if seconds > 0 else 0.0}
+
+
+def runBatch(inStream: TextIO,
+             outStream: TextIO,
+             fmt: str = "csv",
+             mode: str = seriesengine.FLOAT,
+             errors: Optional[List[str]] = None,
+             chunkSize: int = 10000,
+             workers: int = 1,
+             context: Optional[decimal.Context] = None,
+             cacheSize: int = 0,
+             unknown: Optional[str] = None,
+             modulus: Optional[int] = None) -> Dict[str, float]:
+    '''Stream rows from inStream to outStream, in worker processes when 
+    workers is more than 1 (0 uses every core). Each process caches up to 
+    cacheSize results. When unknown (one of seriesengine.UNKNOWNS) is given, 
+    rows are SOLVE_FIELDS and are solved for it instead of summed. When a 
+    modulus is given, rows are read as exact numbers and summed modulo it 
+    (see seriesengine.modularSum). Returns the number of rows and errors 
+    and the throughput'''
+    start = time.perf_counter()
+    if modulus is not None: # Integer inputs, parsed without rounding
+        mode = seriesengine.EXACT
+    errors = errors or loadErrorMessages("English")
+    fields = FIELDS if unknown is None else SOLVE_FIELDS
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(outStream, lineterminator="\n")
+        writer.writerow(fields + (["sum"] if unknown is None else []) 
+                        + ["error"])
+    rows = readRows(inStream, fmt, fields)
+    if workers == 1:
+        chunks = ((chunk, processChunk(chunk, mode, context, cacheSize, 
+                                       unknown, modulus)) 
+                  for chunk in chunked(rows, chunkSize))
+    else:
+        chunks = scheduleChunks(rows, _timedChunk, 
+                                (mode, context, cacheSize, unknown, modulus), 
+                                workers or None, 
+                                maxChunkSize=max(chunkSize, 1))
+    errorCount = 0
+    rowCount = 0
+    for chunk, results in chunks:
+        writeResults(outStream, fmt, chunk, results, errors, writer, 
+                     unknown)
+        rowCount += len(chunk)
+        errorCount += sum(code != seriesengine.NO_ERROR 
+                          for _, code in results)
+    stats = _throughput(rowCount, time.perf_counter() - start)
+    stats["errors"] = errorCount
+    if workers == 1 and cacheSize > 0:
+        stats["cache"] = getCache(cacheSize).stats()
+    return stats
+
+
+def buildParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+            description="Compute arithmetic, geometric, custom, "
+                        "arithmetico-geometric and power series sums from "
+                        "CSV or JSONL rows of (type, first term, term "
+                        "formula or exponent, common difference/ratio, r "
+                        "or \"difference;ratio\", number of terms)")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="input file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"],
+                        help="input and output format (default: from the "
+                             "input file extension, otherwise csv)")
+    parser.add_argument("-p", "--precision",
+                        choices=seriesengine.PRECISION_MODES,
+                        help="precision mode (default: from config.ini)")
+    parser.add_argument("-l", "--language",
+                        help="language of the error messages (default: "
+                             "from config.ini)")
+    parser.add_argument("--chunk-size", type=int, default=10000,
+                        help="rows evaluated per chunk, the maximum chunk "
+                             "size with --workers (default: 10000)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="worker processes, 0 uses every core. Chunk "
+                             "sizes adapt to the cost of each row "
+                             "(default: 1)")
+    parser.add_argument("-c", "--cache", type=int, default=0,
+                        help="cache up to this many results per process, "
+                             "for inputs with repeated rows (default: 0)")
+    parser.add_argument("-s", "--solve", choices=seriesengine.UNKNOWNS,
+                        help="solve for this column instead, rows get a "
+                             "fifth column with the target sum (the solved "
+                             "column's value is ignored)")
+    parser.add_argument("-m", "--modulus", type=int,
+                        help="sum integer rows modulo this number instead "
+                             "(not custom series or --solve)")
+    parser.add_argument("--stats", action="store_true",
+                        help="print the row count and throughput to stderr")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = buildParser()
+    args = parser.parse_args(argv)
+    if args.modulus is not None and args.solve is not None:
+        parser.error("--modulus cannot be combined with --solve")
+    if args.chunk_size < 1: # 0 would drop every row
+        parser.error("--chunk-size must be at least 1")
+    cfg = readConfig()
+    fmt = args.format or ("jsonl" if args.input.endswith((".jsonl", ".json"))
+                          else "csv")
+    mode = args.precision or cfg.get("Main", "precision",
+                                     fallback=seriesengine.FLOAT)
+    errors = loadErrorMessages(args.language or cfg.get(
+                                "Main", "language", fallback="English"))
+
+    inStream = (sys.stdin if args.input == "-"
+                else open(args.input, "r", newline=""))
+    outStream = (sys.stdout if args.output == "-"
+                 else open(args.output, "w", newline=""))
+    try:
+        stats = runBatch(inStream, outStream, fmt, mode, errors, 
+                         args.chunk_size, args.workers, 
+                         cacheSize=args.cache, unknown=args.solve, 
+                         modulus=args.modulus)
+    finally:
+        if inStream is not sys.stdin:
+            inStream.close()
+        if outStream is not sys.stdout:
+            outStream.close()
+    if args.stats:
+        print(f"{stats['rows']} rows ({stats['errors']} errors) in "
+              f"{stats['seconds']:.3f}s: {stats['rowsPerSecond']:.0f} "
+              "rows/s", file=sys.stderr)
+        if "cache" in stats:
+            print(f"Cache: {stats['cache']['hits']} hits, "
+                  f"{stats['cache']['misses']} misses, "
+                  f"{stats['cache']['evictions']} evictions", 
+                  file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,31 +2,96 @@
 in the keys, values and array elements of currentLangDb (translations)
 '''
 
+import time
+startupStarted = time.perf_counter() # Start of the --startup-time breakdown
+
+import sys
+
+if __name__ == "__main__" and "--batch" in sys.argv[1:]: 
+    # Headless batch mode (see seriesbatch.py), dispatched before the GUI 
+    # modules are imported so that batch jobs do not pay for them
+    import seriesbatch
+    sys.argv.remove("--batch")
+    sys.exit(seriesbatch.main(sys.argv[1:]))
+
 import re
 import json
 import os
-from configparser import ConfigParser
+import threading
+from collections import OrderedDict
+from types import ModuleType
 import tkinter as tk 
-import tkinter.messagebox
 from typing import (
+    TYPE_CHECKING,
+    Callable,
     Tuple,
     List,
     Dict,
+    Optional,
 )
 
 import customtkinter as ctk
 
+import configstore
+import instrumentation # Cheap, its HTTP server and profiler are imported 
+                       # when enabled
+import localizer
+import seriesengine
+
+# Imported on first use to keep startup fast: concurrent.futures (the 
+# calculation worker and language preloading), tkinter.messagebox (see 
+# messagebox) and langbundle (Languages.openBundle)
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+def messagebox() -> ModuleType:
+    '''tkinter.messagebox, imported the first time a message is shown'''
+    import tkinter.messagebox
+    return tkinter.messagebox
+
+
+class StartupTimer:
+    '''Measures the startup phases, printed with the --startup-time flag'''
+    def __init__(self, start: float, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.start = start
+        self.last = start
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        '''End the current phase (started by the previous mark)'''
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self, title: str) -> None:
+        if not self.enabled:
+            return
+        print(title)
+        for phase, seconds in self.phases:
+            print(f"  {phase:<24}{seconds * 1000:9.1f} ms")
+        print(f"  {'total':<24}{(self.last - self.start) * 1000:9.1f} ms")
+
+
 class Program(ctk.CTk):
     '''Main Program Window'''
-    def __init__(self, title: str, size: Tuple[int, int]) -> None: 
+    def __init__(self, title: str, size: Tuple[int, int], 
+                 fastStart: bool = False, 
+                 timer: Optional[StartupTimer] = None) -> None: 
         super().__init__()
+        self.timer = timer or StartupTimer(time.perf_counter())
         # Providing program directory for assistance to child classes
         self.currentDir = os.path.dirname(os.path.abspath(__file__)) 
         # Detect window deletion -> display messagebox
         self.protocol("WM_DELETE_WINDOW", 
                       lambda: self.restartProgram(themeRestart=False))
-        self.cfg = ConfigParser() # Assign config parser instance to variable
-        self.cfg.read(f"{self.currentDir}/config.ini") 
+        self.restartRequested = False # Checked once mainloop() returns
+        # In-memory settings, written back to config.ini when changes settle
+        self.cfg = configstore.ConfigStore(f"{self.currentDir}/config.ini") 
+        # Fast start shows the calculator first and builds the rest when idle
+        self.fastStart = fastStart or self.cfg.getboolean("Main", "faststart", 
+                                                          fallback=False)
 
         '''Default program configuration'''
         self.title(title)
@@ -36,7 +101,12 @@ class Program(ctk.CTk):
         ctk.set_default_color_theme(self.cfg.get("Main", "theme"))
         ctk.set_widget_scaling(self.cfg.getfloat("Main", "scale"))
     
+        self.cfg.attach(self) # Debounce config writes with self.after
+        # Widgets bind their translated text here, see localizer.py
+        self.localizer = localizer.Localizer()
+        self.timer.mark("window")
         self.frameGen()
+        self.timer.mark("frames")
         self.classInst()
 
     def frameGen(self) -> None:
@@ -67,6 +137,8 @@ class Program(ctk.CTk):
                                        font=ctk.CTkFont(size=23, 
                                                         weight="bold"))
         self.titleLabel.grid(row=1, column=1, padx=20)
+        self.localizer.bind(self.title, "title", 0)
+        self.localizer.bindOption(self.titleLabel, "text", "title", 0)
 
     def classInst(self) -> None:
         '''Widget Classes'''
@@ -77,57 +149,117 @@ class Program(ctk.CTk):
                                self.radiobuttons, self.output)
         '''File Menu Classes'''
         self.filemenu = FileMenu(self)
+        self.timer.mark("calculator widgets")
         '''Accessibility Classes'''
+        self.languages = Languages(self, self.sidebarFrame)
+        language = self.cfg.get("Main", "language")
+        if self.fastStart:
+            if language == "English":
+                self.languages.switchLang(language)
+            else: # Show English until the configured language is loaded
+                self.languages.currentLangDb = \
+                                        self.languages.getFallbackLangDb()
+                self.localizer.apply(self.languages.currentLangDb)
+            self.timer.mark("language")
+            # Idle callbacks run in order, after Tk has drawn the window
+            self.after_idle(self.timer.mark, "first frame")
+            self.after_idle(self.sidebarInst)
+            if language != "English":
+                self.after_idle(self.languages.switchLang, language)
+        else:
+            self.sidebarInst()
+            self.languages.switchLang(language)
+            self.timer.mark("language")
+        self.after_idle(self.startupDone)
+
+    def sidebarInst(self) -> None:
         self.fontsize = FontSize(self, self.sidebarFrame)
         self.appearance = Appearance(self, self.sidebarFrame)
-        self.languages = Languages(self, self.sidebarFrame, self.entries, 
-                                   self.buttons, self.radiobuttons, 
-                                   self.fontsize, self.appearance, 
-                                   self.filemenu)
-        self.languages.switchLang(self.cfg.get("Main", "language"))
+        self.languages.langOptionsMaker()
+        self.timer.mark("sidebar")
+
+    def startupDone(self) -> None:
+        self.languages.preloadLanguages()
+        self.timer.mark("deferred work" if self.fastStart else "first frame")
+        self.timer.report("Startup time (fast start)" if self.fastStart 
+                          else "Startup time")
     
+    @instrumentation.timed()
     def configUpdater(self, 
                       scale: bool = False, 
                       appearance: bool = False, 
                       theme: bool = False, 
-                      language: bool = False) -> None:
-        # Read data from self.cfg
-        self.cfg.read(f"{self.currentDir}/config.ini")
+                      language: bool = False, 
+                      recentLanguages: bool = False) -> None:
+        '''Stores changed settings in memory, configstore writes them to 
+        config.ini once they stop changing (or on exit)'''
         if scale:
-            self.cfg["Main"]["scale"] = str(scale)
+            self.cfg.setValues(scale=scale)
         if appearance:
-            self.cfg["Main"]["appearance"] = appearance
+            self.cfg.setValues(appearance=appearance)
         if theme:
-            self.cfg["Main"]["theme"] = theme
+            self.cfg.setValues(theme=theme)
         if language:
-            self.cfg["Main"]["language"] = str(language)
+            self.cfg.setValues(language=language)
+        if recentLanguages:
+            self.cfg.setValues(recentlanguages=",".join(recentLanguages))
+
+    def reapplyTheme(self, theme: str) -> None:
+        '''Restyle the existing widgets with a colour theme in place, so entry 
+        contents, output and selections are kept'''
+        ctk.set_default_color_theme(theme) # Loads ctk.ThemeManager.theme
+        self.restyleWidgets(self)
 
-        with open(f"{self.currentDir}/config.ini", "w") as f:
-            self.cfg.write(f) 
+    def restyleWidgets(self, widget: tk.Misc) -> None:
+        for child in widget.winfo_children():
+            # Theme entries are keyed by widget class name (e.g. CTkButton). 
+            # Frames are skipped, their colours are identical in every theme 
+            # and calcFrame/sidebarFrame use custom colours
+            colours = ctk.ThemeManager.theme.get(type(child).__name__, {})
+            colours = {option: value for option, value in colours.items() 
+                       if option.endswith("_color")}
+            if colours and not isinstance(child, ctk.CTkFrame):
+                try:
+                    child.configure(**colours)
+                except ValueError: # Option not supported by this widget
+                    for option, value in colours.items():
+                        try:
+                            child.configure(**{option: value})
+                        except ValueError:
+                            pass
+            self.restyleWidgets(child)
 
     def onWindowDestroy(self, themeRestart: bool) -> bool:
         if themeRestart:
             # Create message box (Y/n)
-            if tk.messagebox.askokcancel(
+            if messagebox().askokcancel(
                     self.languages.currentLangDb["destroy"][2], 
                     self.languages.currentLangDb["destroy"][0]\
                     .format(self.languages.currentLangDb["destroy"][2])):
                 return True 
         else:
-            if tk.messagebox.askokcancel(
+            if messagebox().askokcancel(
                     self.languages.currentLangDb["destroy"][1], 
                     self.languages.currentLangDb["destroy"][0]\
                     .format(self.languages.currentLangDb["destroy"][1])):
                 return True
 
+    @instrumentation.timed()
     def restartProgram(self, themeRestart: bool = True) -> None:
         if self.onWindowDestroy(themeRestart):
-            if themeRestart: # Restart
-                self.destroy()
-                self.program = Program("Summing Series", (700, 580)) 
-                self.program.mainloop()
-            else: # Close
-                self.destroy() 
+            if self.languages.preloader is not None:
+                self.languages.preloader.shutdown(wait=False, 
+                                                  cancel_futures=True)
+            if self.buttons.worker is not None:
+                self.buttons.worker.shutdown()
+            if self.languages.bundle is not None:
+                self.languages.bundle.close()
+            self.cfg.flush() # Pending changes must be on disk before exit 
+                             # or before the restarted program reads them
+            # Restarting is handled at the bottom of this file once 
+            # mainloop() returns, so restarts do not nest mainloops
+            self.restartRequested = themeRestart 
+            self.destroy()
 
 
 class Entries(ctk.CTkFrame):
@@ -135,24 +267,96 @@ class Entries(ctk.CTkFrame):
     def __init__(self, master: Program, calcframe: ctk.CTkFrame) -> None: 
         super().__init__(calcframe) 
         self.grid(row=2, column=1, sticky="e")
-        self.placeholderText = ["Common difference", "Common ratio"] 
+        self.localizer = master.localizer
+        self.placeholderText = ["Common difference", "Common ratio", 
+                                "Parameter r"] 
+        self.placeholderIndex = 0 # Placeholder shown in commonDifference
+        self.firstTermText = ["First term", "Term formula", "Exponent p"] 
+        self.firstTermIndex = 0 # Placeholder shown in firstTerm (1 for 
+                                # custom series, 2 for power sums)
+        self.termsText = ["Number of terms", "Target sum"] 
+        self.termsIndex = 0 # Placeholder shown in numberOfTerms (1 when 
+                            # solving for the number of terms)
         self.entryGen() 
 
     def entryGen(self) -> None: 
         self.firstTerm = ctk.CTkEntry(self) 
         self.commonDifference = ctk.CTkEntry(self)
+        self.commonRatio = ctk.CTkEntry(self) # Arithmetico-geometric only
         self.numberOfTerms = ctk.CTkEntry(self)
         self.firstTerm.grid(row=1, column=1)
         self.commonDifference.grid(row=2, column=1, pady=10)
-        self.numberOfTerms.grid(row=3, column=1)
+        self.commonRatio.grid(row=3, column=1, pady=(0, 10))
+        self.commonRatio.grid_remove()
+        self.numberOfTerms.grid(row=4, column=1)
+        self.localizer.bind(lambda text: self.setFirstTermText(0, text), 
+                            "entries", 0)
+        self.localizer.bind(lambda text: self.setFirstTermText(1, text), 
+                            "entries", 3)
+        self.localizer.bind(self.setPlaceholderText, "entries", 1)
+        self.localizer.bind(lambda text: self.setPlaceholderText([text], 2), 
+                            "entries", 4)
+        self.localizer.bind(lambda text: self.setFirstTermText(2, text), 
+                            "entries", 5)
+        self.localizer.bind(lambda text: self.setTermsText(0, text), 
+                            "entries", 2)
+        self.localizer.bind(lambda text: self.setTermsText(1, text), 
+                            "solver", 1)
+
+    def setFirstTermText(self, index: int, text: str) -> None:
+        self.firstTermText[index] = text
+        self.firstTerm.configure(
+            placeholder_text = self.firstTermText[self.firstTermIndex])
+
+    def setPlaceholderText(self, placeholderText: List[str], 
+                           start: int = 0) -> None:
+        self.placeholderText[start:start + len(placeholderText)] = \
+                                                            placeholderText
+        self.commonDifference.configure(
+            placeholder_text = self.placeholderText[self.placeholderIndex])
+        self.commonRatio.configure(placeholder_text = self.placeholderText[1])
+
+    def setTermsText(self, index: int, text: str) -> None:
+        self.termsText[index] = text
+        self.numberOfTerms.configure(
+            placeholder_text = self.termsText[self.termsIndex])
+
+    def termsSwitcher(self, solve: int) -> None:
+        self.termsIndex = solve
+        self.numberOfTerms.configure(
+            placeholder_text = self.termsText[self.termsIndex])
+        self.master.focus()
+
+    def setInfinite(self, infinite: int) -> None:
+        '''Sums to infinity have no number of terms, so the entry is cleared 
+        and disabled'''
+        if infinite:
+            if self.numberOfTerms.get() != "":
+                self.numberOfTerms.delete(0, ctk.END)
+            self.numberOfTerms.configure(state="disabled")
+        else:
+            self.numberOfTerms.configure(state="normal")
+        self.master.focus()
 
     def placeholderSwitcher(self, entry: int) -> None: 
-        if entry == 1:
-            self.commonDifference.configure(
-                placeholder_text = self.placeholderText[0])
+        self.placeholderIndex = {seriesengine.GEOMETRIC: 1, 
+                                 seriesengine.CUSTOM: 2}.get(entry, 0)
+        self.firstTermIndex = {seriesengine.CUSTOM: 1, 
+                               seriesengine.POWER: 2}.get(entry, 0)
+        self.commonDifference.configure(
+            placeholder_text = self.placeholderText[self.placeholderIndex])
+        self.firstTerm.configure(
+            placeholder_text = self.firstTermText[self.firstTermIndex])
+        # Arithmetico-geometric series take a common ratio as well as the 
+        # common difference, power sums take neither
+        if entry == seriesengine.POWER:
+            self.commonDifference.grid_remove()
         else:
-            self.commonDifference.configure(
-                placeholder_text = self.placeholderText[1])
+            self.commonDifference.grid()
+        if entry == seriesengine.ARITHMETICO_GEOMETRIC:
+            self.commonRatio.grid()
+        else:
+            self.commonRatio.grid_remove()
         self.master.focus() # Remove focus from widget to prevent placeholder 
                             # text becoming editable (focusing on main CTk 
                             # instance which acts as a dummy)
@@ -162,6 +366,8 @@ class Entries(ctk.CTkFrame):
             self.firstTerm.delete(0, ctk.END)
         if self.commonDifference.get() != "":
             self.commonDifference.delete(0, ctk.END)
+        if self.commonRatio.get() != "":
+            self.commonRatio.delete(0, ctk.END)
         if self.numberOfTerms.get() != "":
             self.numberOfTerms.delete(0, ctk.END)
         self.refreshPlaceholderText()
@@ -169,6 +375,7 @@ class Entries(ctk.CTkFrame):
     def refreshPlaceholderText(self) -> None:
         self.firstTerm.focus()
         self.commonDifference.focus()
+        self.commonRatio.focus()
         self.numberOfTerms.focus()
         self.master.focus() 
 
@@ -203,23 +410,160 @@ class Radiobuttons(ctk.CTkFrame):
         super().__init__(calcframe)
         self.grid(row=1, column=1, columnspan=2, pady=(55, 20), sticky="s")
         self.entries = entries
+        self.localizer = master.localizer
         self.radioButtonGen()
 
     def radioButtonGen(self) -> None:
         self.selection = tk.IntVar(value=1) 
-        # Dynamic text switching for entry no.2
+        # Dynamic text switching for entries no.1 and no.2
         self.arithButton = ctk.CTkRadioButton(
                         self, 
                         variable=self.selection, 
                         value=1, 
-                        command=lambda: self.entries.placeholderSwitcher(1))
+                        command=lambda: self.switchType(1))
         self.geomButton = ctk.CTkRadioButton(
                         self, 
                         variable=self.selection, 
                         value=2, 
-                        command=lambda: self.entries.placeholderSwitcher(2))
+                        command=lambda: self.switchType(2))
+        # Custom series: entry no.1 takes a term formula, entry no.2 its 
+        # parameter r
+        self.customButton = ctk.CTkRadioButton(
+                        self, 
+                        variable=self.selection, 
+                        value=3, 
+                        command=lambda: self.switchType(3))
+        # Arithmetico-geometric series: a third entry takes the common 
+        # ratio. Power sums: entry no.1 takes the exponent p, entry no.2 is 
+        # not used
+        self.arithGeomButton = ctk.CTkRadioButton(
+                        self, 
+                        variable=self.selection, 
+                        value=4, 
+                        command=lambda: self.switchType(4))
+        self.powerButton = ctk.CTkRadioButton(
+                        self, 
+                        variable=self.selection, 
+                        value=5, 
+                        command=lambda: self.switchType(5))
         self.arithButton.grid(row=1, column=1, padx=(0, 10))
-        self.geomButton.grid(row=1, column=2)
+        self.geomButton.grid(row=1, column=2, padx=(0, 10))
+        self.customButton.grid(row=1, column=3)
+        self.arithGeomButton.grid(row=2, column=1, columnspan=2, 
+                                  pady=(10, 0))
+        self.powerButton.grid(row=2, column=3, pady=(10, 0))
+        self.localizer.bindOption(self.arithButton, "text", 
+                                  "radiobuttons", 0)
+        self.localizer.bindOption(self.geomButton, "text", "radiobuttons", 1)
+        self.localizer.bindOption(self.customButton, "text", 
+                                  "radiobuttons", 2)
+        self.localizer.bindOption(self.arithGeomButton, "text", 
+                                  "radiobuttons", 3)
+        self.localizer.bindOption(self.powerButton, "text", 
+                                  "radiobuttons", 4)
+        # Solve mode: the third entry takes a target sum and the number of 
+        # terms needed to reach it is calculated
+        self.solveMode = tk.IntVar(value=0)
+        self.solveBox = ctk.CTkCheckBox(
+                        self, 
+                        variable=self.solveMode, 
+                        command=lambda: self.switchMode(self.solveBox))
+        self.solveBox.grid(row=3, column=1, columnspan=3, pady=(10, 0))
+        self.localizer.bindOption(self.solveBox, "text", "solver", 0)
+        # Infinite mode: the sum to infinity, the third entry is not used
+        self.infiniteMode = tk.IntVar(value=0)
+        self.infiniteBox = ctk.CTkCheckBox(
+                        self, 
+                        variable=self.infiniteMode, 
+                        command=lambda: self.switchMode(self.infiniteBox))
+        self.infiniteBox.grid(row=4, column=1, columnspan=3, pady=(10, 0))
+        self.localizer.bindOption(self.infiniteBox, "text", "infinite", 0)
+
+    def switchMode(self, checkBox: ctk.CTkCheckBox) -> None:
+        '''Solve and infinite mode exclude each other'''
+        if self.solveMode.get() and self.infiniteMode.get():
+            (self.infiniteBox if checkBox is self.solveBox 
+             else self.solveBox).deselect()
+        self.entries.termsSwitcher(self.solveMode.get())
+        self.entries.setInfinite(self.infiniteMode.get())
+
+    def switchType(self, seqType: int) -> None:
+        self.entries.placeholderSwitcher(seqType)
+        # Only the number of terms of arithmetic and geometric series can be 
+        # solved for
+        solvable = seqType in (seriesengine.ARITHMETIC, 
+                               seriesengine.GEOMETRIC)
+        if not solvable and self.solveMode.get():
+            self.solveBox.deselect()
+            self.entries.termsSwitcher(0)
+        self.solveBox.configure(state="normal" if solvable else "disabled")
+
+
+class Worker:
+    '''A daemon thread running the latest submitted calculation. Submitting
+    cancels the calculation before it (seriesengine's term by term loops 
+    check for cancellation, see seriesengine.cancellable), and the thread 
+    does not keep the program alive after the window is closed'''
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.job = None # (future, function, arguments, timeLimit) to run
+        self.running = None # Cancel event of the running calculation
+        self.closed = False
+        threading.Thread(target=self.run, name="calculation", 
+                         daemon=True).start()
+
+    def submit(self, function: Callable, arguments: Tuple, 
+               timeLimit: Optional[float] = None) -> "Future":
+        '''Run function(*arguments), cancelled after timeLimit seconds'''
+        from concurrent.futures import Future
+        future = Future()
+        with self.condition:
+            self._cancel()
+            self.job = (future, function, arguments, timeLimit)
+            self.condition.notify()
+        return future
+
+    def cancel(self) -> None:
+        '''Cancel the waiting and running calculations'''
+        with self.condition:
+            self._cancel()
+
+    def _cancel(self) -> None:
+        if self.job is not None:
+            self.job[0].cancel()
+            self.job = None
+        if self.running is not None:
+            self.running.set()
+
+    def shutdown(self) -> None:
+        with self.condition:
+            self.closed = True
+            self._cancel()
+            self.condition.notify()
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                while self.job is None and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                future, function, arguments, timeLimit = self.job
+                self.job = None
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self.running = event = threading.Event()
+            deadline = (None if timeLimit is None else 
+                        time.monotonic() + timeLimit)
+            try:
+                with seriesengine.cancellable(event, deadline):
+                    result = function(*arguments)
+            except BaseException as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+            with self.condition:
+                self.running = None
 
 
 class Buttons(ctk.CTkFrame):
@@ -230,6 +574,7 @@ class Buttons(ctk.CTkFrame):
                  output: Output) -> None:
         super().__init__(calcframe)
         self.grid(row=2, column=2, padx=(20, 0), sticky="w")
+        self.master = master
         self.entries = entries 
         self.radiobuttons = radiobuttons
         self.output = output
@@ -241,55 +586,266 @@ class Buttons(ctk.CTkFrame):
             appropriate length",
             "An exception occured: OverflowError - Please reduce the value of \
             the entered integers",
+            "An exception occured: NoSolution - No value reaches the target \
+            sum, please check the entered values",
+            "An exception occured: Divergent - The series does not converge, \
+            so it has no sum to infinity",
+            "An exception occured: NotConverged - The series converges too \
+            slowly to estimate its sum to infinity accurately",
             ]
+        self.infiniteText = ["Sum to infinity", "Estimated error", 
+                             "Terms used"]
+        self.errorCode = None # Index of the error shown in the output box
+        self.cache = seriesengine.SumCache(
+                        self.master.cfg.getint("Main", "cachesize", 
+                                               fallback=256))
+        # Live calculation (opt-in): recalculate while the user types
+        self.liveDelay = self.master.cfg.getint("Main", "livedelay", 
+                                                fallback=250) # Milliseconds
+        # Seconds a live calculation may take, longer ones are left to the
+        # Calculate button
+        self.liveTimeLimit = self.master.cfg.getfloat("Main", 
+                                                      "livetimelimit", 
+                                                      fallback=2.0)
+        self.pendingLive = None # after id of the scheduled calculation
+        self.request = 0 # Increases with every calculation, results of 
+                         # older calculations are dropped
+        self.worker = None # Computes the expensive cases, started on first
+                           # use
         self.buttonGen()
+        if self.master.cfg.getboolean("Main", "livecalculation", 
+                                      fallback=False):
+            self.enableLiveCalculation()
         
     def buttonGen(self) -> None:
         self.clearButton = ctk.CTkButton(self, command=self.clear)
         self.calculateButton = ctk.CTkButton(self, command=self.calculate)
         self.clearButton.grid(row=1, column=1, pady=(0, 10))
         self.calculateButton.grid(row=2, column=1)
+        self.master.localizer.bindOption(self.clearButton, "text", 
+                                         "buttons", 0)
+        self.master.localizer.bindOption(self.calculateButton, "text", 
+                                         "buttons", 1)
+        # Bound one by one, so that messages a language has not been 
+        # translated for yet are shown in English
+        for i in range(len(self.errors)):
+            self.master.localizer.bind(
+                lambda text, i=i: self.setError(i, text), "errors", i)
+        self.master.localizer.bind(self.setInfiniteText, "infinite")
     
+    def setError(self, errorCode: int, error: str) -> None:
+        self.errors[errorCode] = error
+        if self.errorCode == errorCode: # Regenerate it in the new language
+            self.showError(self.errorCode)
+
+    def setInfiniteText(self, infiniteText: List[str]) -> None:
+        self.infiniteText = infiniteText
+
+    def showError(self, errorCode: int) -> None:
+        self.errorCode = errorCode
+        self.output.insertText(self.errors[errorCode])
+
     def clear(self) -> None:
         self.entries.clearEntries()
         self.radiobuttons.arithButton.invoke() # Simulate clicking
+        self.errorCode = None
         self.output.insertText("")
 
+    def readInputs(self) -> None:
+        '''Read the series type, precision and entries (raises ValueError)'''
+        self.seqType = self.radiobuttons.selection.get() # 1 to 5
+        self.solving = bool(self.radiobuttons.solveMode.get())
+        self.infinite = bool(self.radiobuttons.infiniteMode.get())
+
+        # Precision mode ("float", "decimal" or "exact"), see seriesengine.py
+        self.precision = self.master.cfg.get("Main", "precision", 
+                                             fallback=seriesengine.FLOAT)
+
+        if self.seqType == seriesengine.CUSTOM: # A term formula and r
+            self.solving = False
+            self.firstTerm = self.entries.firstTerm.get()
+            seriesengine.compileFormula(self.firstTerm.strip()) # Validate
+            self.commonDiffOrRatio = seriesengine.toNumber(
+                        self.entries.commonDifference.get(), self.precision)
+            if not self.infinite:
+                self.numberOfTerms = int(self.entries.numberOfTerms.get())
+            return
+        if self.seqType in (seriesengine.ARITHMETICO_GEOMETRIC, 
+                            seriesengine.POWER):
+            self.solving = False
+            if self.seqType == seriesengine.POWER: # The exponent p only
+                self.firstTerm = seriesengine.toExponent(
+                                                self.entries.firstTerm.get())
+                self.commonDiffOrRatio = None
+            else: # a, and the (d, r) pair
+                first, difference, ratio = (
+                    seriesengine.toNumber(entry.get(), self.precision) 
+                    for entry in (self.entries.firstTerm, 
+                                  self.entries.commonDifference, 
+                                  self.entries.commonRatio))
+                self.firstTerm, self.commonDiffOrRatio = (first, 
+                                                          (difference, ratio))
+            if not self.infinite:
+                self.numberOfTerms = int(self.entries.numberOfTerms.get())
+            return
+        if self.solving or self.infinite: # The third entry holds the 
+                                          # target sum, or is not used
+            self.firstTerm, self.commonDiffOrRatio = (
+                seriesengine.toNumber(entry.get(), self.precision) 
+                for entry in (self.entries.firstTerm, 
+                              self.entries.commonDifference))
+            if self.solving:
+                self.target = seriesengine.toNumber(
+                            self.entries.numberOfTerms.get(), self.precision)
+            return
+        self.firstTerm, self.commonDiffOrRatio, self.numberOfTerms = \
+            seriesengine.parseInputs(self.entries.firstTerm.get(), 
+                                     self.entries.commonDifference.get(), 
+                                     self.entries.numberOfTerms.get(), 
+                                     self.precision)
+
+    def evaluation(self) -> Tuple[Callable, Tuple]:
+        '''The engine call for the inputs that were read, as (function, 
+        arguments), returning (result, errorCode)'''
+        if self.infinite:
+            return seriesengine.evaluateInfinite, (
+                        self.seqType, self.firstTerm, self.commonDiffOrRatio, 
+                        self.precision)
+        if self.solving:
+            return seriesengine.evaluateInverse, (
+                        seriesengine.NUMBER_OF_TERMS, self.seqType, 
+                        self.firstTerm, self.commonDiffOrRatio, self.target, 
+                        self.precision)
+        # Cached, so repeating a calculation does not recompute the sum
+        return self.cache.evaluate, (self.seqType, self.firstTerm, 
+                                     self.commonDiffOrRatio, 
+                                     self.numberOfTerms, self.precision)
+
+    def isCheap(self) -> bool:
+        '''Whether the inputs that were read are evaluated by a float 
+        closed form, fast enough for the Tk thread'''
+        return (self.precision == seriesengine.FLOAT 
+                and self.seqType in (seriesengine.ARITHMETIC, 
+                                     seriesengine.GEOMETRIC, 
+                                     seriesengine.ARITHMETICO_GEOMETRIC))
+
+    def newRequest(self) -> None:
+        '''Make the results of earlier calculations stale, and stop the 
+        one running'''
+        self.request += 1
+        if self.worker is not None:
+            self.worker.cancel()
+
+    @instrumentation.timed()
     def calculate(self) -> None:
-        self.seqType = self.radiobuttons.selection.get() # 1 or 2
+        self.newRequest()
+        try: 
+            self.readInputs()
+        except ValueError:
+            self.showError(seriesengine.VALUE_ERROR)
+            return
+        function, arguments = self.evaluation()
+        if self.isCheap():
+            self.showResult(*function(*arguments))
+            return
+        self.calculateInWorker(function, arguments)
+
+    def calculateInWorker(self, function: Callable, arguments: Tuple, 
+                          timeLimit: Optional[float] = None) -> None:
+        '''Decimal and exact sums of long series (custom series, which are 
+        summed term by term, and power sums, whose Bernoulli numbers are 
+        tabulated on first use) and sums to infinity can take seconds, 
+        compute them in the worker so the window keeps responding'''
+        if self.worker is None:
+            self.worker = Worker()
+        request = self.request
+        self.worker.submit(function, arguments, timeLimit).add_done_callback(
+            lambda future: self.calculated(request, future))
+
+    def showResult(self, result: seriesengine.Number, errorCode: int) -> None:
+        if errorCode != seriesengine.NO_ERROR:
+            self.showError(errorCode)
+            return
+        self.errorCode = None
+        if isinstance(result, tuple): # Sum to infinity
+            self.sum, error, terms, _ = result
+            text = seriesengine.formatResult(self.sum)
+            if terms: # Not a closed form, show how good the estimate is
+                text += (f"\n{self.infiniteText[1]}: {error:.3g}"
+                         f"\n{self.infiniteText[2]}: {terms}")
+            self.output.insertText(text)
+            return
+        self.sum = result
+        self.output.insertText(seriesengine.formatResult(self.sum))
+
+    def enableLiveCalculation(self) -> None:
+        for entry in (self.entries.firstTerm, self.entries.commonDifference, 
+                      self.entries.commonRatio, self.entries.numberOfTerms):
+            entry.bind("<KeyRelease>", self.scheduleLiveCalculation, 
+                       add="+")
+        self.radiobuttons.selection.trace_add("write", 
+                                              self.scheduleLiveCalculation)
+        self.radiobuttons.solveMode.trace_add("write", 
+                                              self.scheduleLiveCalculation)
+        self.radiobuttons.infiniteMode.trace_add(
+                                "write", self.scheduleLiveCalculation)
+
+    def scheduleLiveCalculation(self, *args) -> None:
+        '''Debounce, only calculate once typing pauses for liveDelay'''
+        if self.pendingLive is not None:
+            self.after_cancel(self.pendingLive)
+        self.pendingLive = self.after(self.liveDelay, self.liveCalculate)
 
+    @instrumentation.timed()
+    def liveCalculate(self) -> None:
+        self.pendingLive = None
+        self.newRequest()
+        seqType = self.radiobuttons.selection.get()
+        entries = [self.entries.firstTerm.get()]
+        if seqType != seriesengine.POWER:
+            entries.append(self.entries.commonDifference.get())
+        if seqType == seriesengine.ARITHMETICO_GEOMETRIC:
+            entries.append(self.entries.commonRatio.get())
+        if not self.radiobuttons.infiniteMode.get():
+            entries.append(self.entries.numberOfTerms.get())
+        if "" in entries: # Still typing, do not show an error yet
+            self.errorCode = None
+            self.output.insertText("")
+            return
         try: 
-            self.firstTerm = float(self.entries.firstTerm.get())
-            self.commonDiffOrRatio = float(self.entries.commonDifference.get())
-            self.numberOfTerms = int(self.entries.numberOfTerms.get())
-            if self.seqType == 1: # Arithmetic series
-                if self.numberOfTerms <= 0: 
-                    self.output.insertText(self.errors[1])
-                else:
-                    self.sum = ((
-                        self.numberOfTerms / 2) 
-                        * (2 * self.firstTerm + (self.numberOfTerms - 1) \
-                        * self.commonDiffOrRatio))
-                    self.output.insertText(self.sum)
-                    
-            elif self.seqType == 2: # Geometric Series
-                if self.numberOfTerms <= 0: 
-                    self.output.insertText(self.errors[1])
-                else:
-                    if self.commonDiffOrRatio == 1:
-                        self.sum = self.firstTerm * self.numberOfTerms
-                    else:
-                        self.sum = (
-                            self.firstTerm 
-                            * (1 - self.commonDiffOrRatio 
-                               ** self.numberOfTerms) 
-                            / (1 - self.commonDiffOrRatio))
-                    self.output.insertText(self.sum)
-    
+            self.readInputs()
         except ValueError:
-            self.output.insertText(self.errors[0])
-        except OverflowError:
-            self.output.insertText(self.errors[2])
+            self.showError(seriesengine.VALUE_ERROR)
+            return
+        function, arguments = self.evaluation()
+        if self.isCheap():
+            self.showResult(*function(*arguments))
+            return
+        self.calculateInWorker(function, arguments, self.liveTimeLimit)
+
+    def calculated(self, request: int, future: "Future") -> None:
+        '''Runs in the worker thread, hands the result to the Tk thread'''
+        if future.cancelled():
+            return
+        if isinstance(future.exception(), seriesengine.Cancelled):
+            result = None # Stale, or over the live calculation time limit
+        else:
+            result = future.result()
+        try:
+            self.after(0, self.showCalculated, request, result)
+        except (RuntimeError, tk.TclError): # The window was destroyed
+            pass
+
+    def showCalculated(self, request: int, 
+                       result: Optional[Tuple[seriesengine.Number, int]]
+                       ) -> None:
+        if request != self.request: # Drop results the user typed past
+            return
+        if result is None: # Too slow to calculate live
+            self.errorCode = None
+            self.output.insertText("")
+            return
+        self.showResult(*result)
 
 
 class FontSize(ctk.CTkFrame):
@@ -316,14 +872,28 @@ class FontSize(ctk.CTkFrame):
         self.fontOptions.set(self.scaleStr) # Set current optionbox selection
         self.fontOptions.grid(row=2, column=1)
         self.fontOptionsLabel.grid(row=1, column=1)
+        self.master.localizer.bindOption(self.fontOptionsLabel, "text", 
+                                         "fontsize", 0)
+        self.master.localizer.bind(self.setSizeLabels, "fontsize", 1)
+        # Reuse same selection text from the array in the "langloader" key 
+        self.master.localizer.bind(self.setSameSelection, "langloader", 1)
+
+    def setSizeLabels(self, sizes: List[str]) -> None:
+        # Keep the selection by its position, the labels are translated
+        sizeIndex = self.sizes.index(self.fontOptions.get())
+        self.sizes = sizes
+        self.fontOptions.configure(values=self.sizes)
+        self.fontOptions.set(self.sizes[sizeIndex])
+
+    def setSameSelection(self, sameSelection: str) -> None:
+        self.sameSelection = sameSelection
     
     def changeScale(self, choice: int) -> None:
         self.scaleChoice = (0.7 if self.sizes.index(choice) == 0 else 
                             1.0 if self.sizes.index(choice) == 1 else 1.3)
         # Is the user trying to switch to an already selected option? 
-        self.master.cfg.read(f"{self.master.currentDir}/config.ini")
         if self.master.cfg.getfloat("Main", "scale") == self.scaleChoice:
-            tk.messagebox.showinfo(message=f"{self.sameSelection} {choice}")
+            messagebox().showinfo(message=f"{self.sameSelection} {choice}")
             return
         ctk.set_widget_scaling(self.scaleChoice)
         self.master.configUpdater(scale=self.scaleChoice)
@@ -364,14 +934,36 @@ class Appearance(ctk.CTkFrame):
         self.themeOptions.grid(row=4, column=1)
         self.appearanceOptionsLabel.grid(row=1, column=1)
         self.themeOptionsLabel.grid(row=3, column=1)
+        localizer = self.master.localizer
+        localizer.bindOption(self.appearanceOptionsLabel, "text", 
+                             "appearance", 0, 0)
+        localizer.bind(self.setAppearanceLabels, "appearance", 0, 1)
+        localizer.bindOption(self.themeOptionsLabel, "text", 
+                             "appearance", 1, 0)
+        localizer.bind(self.setThemeLabels, "appearance", 1, 1)
+        localizer.bind(self.setSameSelection, "langloader", 1)
+
+    def setAppearanceLabels(self, appearances: List[str]) -> None:
+        appearanceIndex = self.appearances.index(self.appearanceOptions.get())
+        self.appearances = appearances
+        self.appearanceOptions.configure(values=self.appearances)
+        self.appearanceOptions.set(self.appearances[appearanceIndex])
+
+    def setThemeLabels(self, themes: List[str]) -> None:
+        themeIndex = self.themes.index(self.themeOptions.get())
+        self.themes = themes
+        self.themeOptions.configure(values=self.themes)
+        self.themeOptions.set(self.themes[themeIndex])
+
+    def setSameSelection(self, sameSelection: str) -> None:
+        self.sameSelection = sameSelection
 
     def changeAppearance(self, choice: int) -> None: 
         self.appearanceChoice = (
                 "light" if self.appearances.index(choice) == 0 else 
                 "dark" if self.appearances.index(choice) == 1 else "system")
-        self.master.cfg.read(f"{self.master.currentDir}/config.ini")
         if self.master.cfg.get("Main", "appearance") == self.appearanceChoice: 
-            tk.messagebox.showinfo(message=f"{self.sameSelection} {choice}")
+            messagebox().showinfo(message=f"{self.sameSelection} {choice}")
             return
         ctk.set_appearance_mode(self.appearanceChoice)
         self.master.configUpdater(appearance=self.appearanceChoice)
@@ -379,12 +971,11 @@ class Appearance(ctk.CTkFrame):
     def changeTheme(self, choice: int) -> None:
         self.themeChoice = "blue" if self.themes.index(choice) == 0 else \
         "green" if self.themes.index(choice) == 1 else "dark-blue"
-        self.master.cfg.read(f"{self.master.currentDir}/config.ini")
         if self.master.cfg.get("Main", "theme") == self.themeChoice:
-            tk.messagebox.showinfo(message=f"{self.sameSelection} {choice}")
+            messagebox().showinfo(message=f"{self.sameSelection} {choice}")
             return
         self.master.configUpdater(theme=self.themeChoice)
-        self.master.restartProgram() # Must restart to reapply theme
+        self.master.reapplyTheme(self.themeChoice)
 
 
 class FileMenu(tk.Menu):
@@ -404,192 +995,199 @@ class FileMenu(tk.Menu):
         # Creating file menu cascade
         self.fileMenu = tk.Menu(self.menu)
         self.menu.add_cascade(label=self.menuLabels[0], menu=self.fileMenu)
+        self.bindLabel(self.menu, 0)
         # Creating commands within the file cascade
         self.fileMenu.add_command(
                             label=self.menuLabels[1], 
                             command=lambda: self.master.restartProgram())
+        self.bindLabel(self.fileMenu, 1)
         self.fileMenu.add_separator()
         self.fileMenu.add_command(
                             label=self.menuLabels[2], 
                             command=lambda: self.master.restartProgram(
                                                     themeRestart=False))
+        self.bindLabel(self.fileMenu, 2)
         # Setting main menu
         self.master.config(menu=self.menu)
 
+    def bindLabel(self, menu: tk.Menu, labelIndex: int) -> None:
+        '''Bind the label of the entry last added to menu to 
+        filemenu[labelIndex]. Entries are addressed by position, so renaming 
+        them does not break later lookups'''
+        entryIndex = menu.index(tk.END)
+        self.master.localizer.bind(
+            lambda label: menu.entryconfigure(entryIndex, label=label), 
+            "filemenu", labelIndex)
+
 
 class Languages(ctk.CTkFrame):
     '''Loads language jsons and switches widget text'''
-    def __init__(self, 
-                 master: Program, 
-                 sidebarframe: ctk.CTkFrame, 
-                 entries: Entries, 
-                 buttons: Buttons, 
-                 radiobuttons: Radiobuttons,
-                 fontsize: FontSize, 
-                 appearance: Appearance, 
-                 filemenu: FileMenu) -> None:
+    def __init__(self, master: Program, sidebarframe: ctk.CTkFrame) -> None:
         super().__init__(sidebarframe)
         self.grid(row=4, column=1)
         self.master = master
-        self.entries = entries
-        self.buttons = buttons
-        self.radiobuttons = radiobuttons
-        self.fontsize = fontsize
-        self.appearance = appearance
-        self.filemenu = filemenu
         
         self.translationsPath = os.path.join(self.master.currentDir, 
                                              "translations") 
         self.currentLangDb = {} 
+        self.fallbackLangDb = None # English, for strings a translation lacks
         self.loadedLangTuple = ("",) # Aids to detect if user is switching to
                                      # the same language
-        self.loadedLanguages = [] # Stores loaded language dictionaries
-        self.langOptionsMaker() 
+        # Stores loaded language dictionaries, least recently used first
+        self.loadedLanguages = OrderedDict() 
+        self.langCacheSize = self.master.cfg.getint("Main", "langcachesize", 
+                                                    fallback=10)
+        self.recentLanguages = [lang for lang in self.master.cfg.get(
+                                    "Main", "recentlanguages", 
+                                    fallback="").split(",") if lang]
+        # Languages being loaded in the background and the lock guarding 
+        # them and loadedLanguages (preloading happens in worker threads)
+        self.pendingLanguages = {} 
+        self.langCacheLock = threading.Lock()
+        self.preloader = None # Started by preloadLanguages
+        self.langOptions = None # Created by langOptionsMaker (Program calls 
+                                # it, fast start defers it until idle)
+        self.openBundle()
+
+    def openBundle(self) -> None:
+        # Prefer the precompiled bundle (see langbundle.py), which loads a 
+        # language without parsing its JSON file. Checking it costs a single
+        # stat, a missing or stale bundle is rebuilt in the background for 
+        # the next run and the JSON files are read meanwhile (None)
+        import langbundle
+        self.bundle = langbundle.openBundle(
+                        self.translationsPath, 
+                        os.path.join(self.master.currentDir, 
+                                     langbundle.BUNDLE_NAME),
+                        background=True)
 
     def langOptionsMaker(self) -> None:
-        self.availableLanguages = os.listdir(self.translationsPath) 
-        self.availableLanguages = [jsonFile.replace(".json", "") 
-                                   for jsonFile in self.availableLanguages]
-        self.availableLanguages = sorted(self.availableLanguages) 
+        if self.bundle is not None:
+            self.availableLanguages = self.bundle.languages()
+        else:
+            self.availableLanguages = os.listdir(self.translationsPath) 
+            self.availableLanguages = [jsonFile.replace(".json", "") 
+                                    for jsonFile in self.availableLanguages]
+            self.availableLanguages = sorted(self.availableLanguages) 
         self.langOptions = ctk.CTkOptionMenu(self, 
                                             values=self.availableLanguages, 
                                             command=self.switchLang)
         self.langOptionsLabel = ctk.CTkLabel(self)
+        self.langOptions.set(self.master.cfg.get("Main", "language"))
         self.langOptions.grid(row=2, column=1)
         self.langOptionsLabel.grid(row=1, column=1)
+        self.master.localizer.bindOption(self.langOptionsLabel, "text", 
+                                         "languages", 0)
 
+    @instrumentation.timed()
     def switchLang(self, lang: str) -> None:
         self.langLoader(lang) 
-        '''Entries'''
-        self.entries.firstTerm.configure(
-                        placeholder_text=self.currentLangDb["entries"][0])
-        self.entries.placeholderText[0] = self.currentLangDb["entries"][1][0]
-        self.entries.placeholderText[1] = self.currentLangDb["entries"][1][1]
-        self.entries.placeholderSwitcher(self.radiobuttons.selection.get())
-        self.entries.numberOfTerms.configure(
-                        placeholder_text=self.currentLangDb["entries"][2])
-        '''Buttons'''
-        self.buttons.clearButton.configure(
-                                    text=self.currentLangDb["buttons"][0])
-        self.buttons.calculateButton.configure(
-                                    text=self.currentLangDb["buttons"][1])
-        '''Radiobuttons'''
-        self.radiobuttons.arithButton.configure(
-                                    text=self.currentLangDb["radiobuttons"][0])
-        self.radiobuttons.geomButton.configure(
-                                    text=self.currentLangDb["radiobuttons"][1])
-        '''Fontsize optionbox and label'''
-        self.fontsize.fontOptionsLabel.configure(
-                                        text=self.currentLangDb["fontsize"][0])
-        self.sizeIndex = self.fontsize.sizes.index(
-                                            self.fontsize.fontOptions.get())
-        for i, _ in enumerate(self.fontsize.sizes):
-            self.fontsize.sizes[i] = self.currentLangDb["fontsize"][1][i]
-        self.fontsize.fontOptions.configure(values=self.fontsize.sizes)
-        self.fontsize.fontOptions.set(self.fontsize.sizes[self.sizeIndex])
-        # Reuse same selection text from the array in the "langloader" key 
-        self.fontsize.sameSelection = self.currentLangDb["langloader"][1]
-
-        '''Appearance optionbox and label'''
-        self.appearance.appearanceOptionsLabel.configure(
-                                text=self.currentLangDb["appearance"][0][0])
-        self.appearanceIndex = self.appearance.appearances.index(
-                                    self.appearance.appearanceOptions.get())
-        for i, _ in enumerate(self.appearance.appearances):
-            self.appearance.appearances[i] = \
-                                    self.currentLangDb["appearance"][0][1][i]
-        self.appearance.appearanceOptions.configure(
-                                            values=self.appearance.appearances)
-        self.appearance.appearanceOptions.set(
-                            self.appearance.appearances[self.appearanceIndex])
-
-        self.appearance.themeOptionsLabel.configure(
-                                text=self.currentLangDb["appearance"][1][0])
-        self.themeIndex = self.appearance.themes.index(
-                                            self.appearance.themeOptions.get())
-        for i, _ in enumerate(self.appearance.themes):
-            self.appearance.themes[i] = \
-                                    self.currentLangDb["appearance"][1][1][i]
-        self.appearance.themeOptions.configure(
-                                                values=self.appearance.themes)
-        self.appearance.themeOptions.set(
-                                    self.appearance.themes[self.themeIndex])
-        self.appearance.sameSelection = self.currentLangDb["langloader"][1]
-
-        '''Language optionbox and label'''
-        self.langOptionsLabel.configure(
-                                    text=self.currentLangDb["languages"][0])
-        self.langOptions.set(self.master.cfg.get("Main", "language"))
+        # Every widget bound its text to the localizer when it was created, 
+        # only the texts that differ from the current ones are reconfigured
+        self.master.localizer.apply(self.currentLangDb, 
+                                    self.getFallbackLangDb())
+        if self.langOptions is not None:
+            self.langOptions.set(self.master.cfg.get("Main", "language"))
 
-        '''Error text'''
-        for i, _ in enumerate(self.buttons.errors):
-            self.buttons.errors[i] = self.currentLangDb["errors"][i]
-        self.buttons.calculate() # Regenerate error (if there is one), now 
-                                 # with the updated language 
-
-        '''Filemenu'''
-        self.filemenu.menu.entryconfigure(self.filemenu.menuLabels[0], 
-                                    label=self.currentLangDb["filemenu"][0])
-        self.filemenu.fileMenu.entryconfigure(self.filemenu.menuLabels[1], 
-                                    label=self.currentLangDb["filemenu"][1])
-        self.filemenu.fileMenu.entryconfigure(self.filemenu.menuLabels[2], 
-                                    label=self.currentLangDb["filemenu"][2])
-        for i, _ in enumerate(self.filemenu.menuLabels):
-            self.filemenu.menuLabels[i] = self.currentLangDb["filemenu"][i]
-
-        '''Title and title label'''
-        self.master.title(self.currentLangDb["title"][0])
-        self.master.titleLabel.configure(text=self.currentLangDb["title"][0])
-        
+    def getFallbackLangDb(self) -> Dict[str, List[str]]:
+        if self.fallbackLangDb is None:
+            try:
+                self.fallbackLangDb = self.getLangDb("English")
+            except (OSError, json.decoder.JSONDecodeError):
+                self.fallbackLangDb = {}
+        return self.fallbackLangDb
+
+    @instrumentation.timed()
     def langLoader(self, lang: str) -> None:
         '''Handles loading and storing of language data and responds to errors 
         and repetitive inputs'''
         # If the language is already set to the language being switched to
         if self.loadedLangTuple[0] == lang:
-            tk.messagebox.showinfo(
+            messagebox().showinfo(
                     title=self.currentLangDb["langloader"][0], 
                     message=f"{self.currentLangDb['langloader'][1]} {lang}")
             return
 
-        # If the required language is not loaded, load the new language and
-        # switch the database
-        if not any(langTuple[0] == lang for langTuple in self.loadedLanguages):
-            try:
-                with open(f"{self.translationsPath}/{lang.title()}.json", 
-                        "r") as f: 
-                    self.rawLangDb = json.load(f)
-                    self.loadedLangTuple = self.langDbConfigurer(
-                                                        lang, self.rawLangDb)
-                    self.currentLangDb = self.loadedLangTuple[1] 
-                    self.master.configUpdater(
-                                            language=self.loadedLangTuple[0])
-            
-            # The json file is likely empty or formatted incorrectly
-            except json.decoder.JSONDecodeError:
-                tk.messagebox.showinfo(
-                    title=self.currentLangDb["langloader"][0], 
-                    message=f"{lang} {self.currentLangDb['langloader'][2]}")
+        try:
+            langDb = self.getLangDb(lang)
+        # The json file is likely missing, empty or formatted incorrectly
+        except (OSError, json.decoder.JSONDecodeError):
+            messagebox().showinfo(
+                title=self.currentLangDb["langloader"][0], 
+                message=f"{lang} {self.currentLangDb['langloader'][2]}")
+            if self.langOptions is not None:
                 self.langOptions.set(self.loadedLangTuple[0]) 
-        # Switch database to already loaded language
-        else:
-            self.loadedLangTuple = tuple(langTuple for langTuple 
-                                         in self.loadedLanguages 
-                                         if langTuple[0] == lang)
-            self.currentLangDb = self.loadedLangTuple[0][1]
-            self.master.configUpdater(language = self.loadedLangTuple[0][0])
-            
+            return
+
+        self.loadedLangTuple = (lang, langDb)
+        self.currentLangDb = langDb
+        # Most recently used languages first, these are preloaded on startup
+        self.recentLanguages = ([lang] + [recent for recent in 
+                                          self.recentLanguages 
+                                          if recent != lang]
+                                )[:self.langCacheSize]
+        self.master.configUpdater(language=lang, 
+                                  recentLanguages=self.recentLanguages)
+
+    def getLangDb(self, lang: str) -> Dict[str, List[str]]:
+        '''Return a language database from the cache, waiting for it if it is
+        being preloaded and reading it from disk otherwise'''
+        with self.langCacheLock:
+            if lang in self.loadedLanguages:
+                self.loadedLanguages.move_to_end(lang)
+                return self.loadedLanguages[lang]
+            pending = self.pendingLanguages.get(lang)
+        langDb = pending.result() if pending else self.readLangDb(lang)
+        self.cacheLangDb(lang, langDb)
+        return langDb
+
+    def cacheLangDb(self, lang: str, langDb: Dict[str, List[str]]) -> None:
+        with self.langCacheLock:
+            self.loadedLanguages[lang] = langDb
+            self.loadedLanguages.move_to_end(lang)
+            self.pendingLanguages.pop(lang, None)
+            while len(self.loadedLanguages) > self.langCacheSize:
+                self.loadedLanguages.popitem(last=False)
+
+    def readLangDb(self, lang: str) -> Dict[str, List[str]]:
+        '''Read and configure a language json (safe to call from any thread, 
+        raises OSError or JSONDecodeError)'''
+        if self.bundle is not None and lang.title() in self.bundle:
+            return self.bundle.read(lang.title()) # Already configured
+        with open(f"{self.translationsPath}/{lang.title()}.json", "r") as f: 
+            return self.langDbConfigurer(lang, json.load(f))[1]
+
+    def preloadLanguages(self) -> None:
+        '''Load the most recently used languages into the cache in the 
+        background, so switching back to them does not touch the disk'''
+        if self.preloader is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.preloader = ThreadPoolExecutor(max_workers=2)
+        for lang in self.recentLanguages[:self.langCacheSize]:
+            with self.langCacheLock:
+                if lang in self.loadedLanguages or \
+                        lang in self.pendingLanguages:
+                    continue
+                future = self.preloader.submit(self.readLangDb, lang)
+                self.pendingLanguages[lang] = future
+            future.add_done_callback(
+                lambda future, lang=lang: self.preloadDone(lang, future))
+
+    def preloadDone(self, lang: str, future: "Future") -> None:
+        if future.cancelled() or future.exception():
+            # Leave failures to langLoader, which reports them to the user
+            with self.langCacheLock:
+                self.pendingLanguages.pop(lang, None)
+            return
+        self.cacheLangDb(lang, future.result())
 
     def langDbConfigurer(self, 
           lang: str, 
           rawLangDb: Dict[str, List[str]]) -> Tuple[str: Dict[str, List[str]]]:
         '''Make the order of arrays more logical based on hierarchy 
-        (using array slicing)'''
-        rawLangDb["entries"][1:3] = [rawLangDb["entries"][1:3]] 
-        rawLangDb["fontsize"][1:4] = [rawLangDb["fontsize"][1:4]]
-        self.values = rawLangDb["appearance"]
-        self.groupedValues = [self.values[0], self.values[2:5]], [
-                                            self.values[1], self.values[5:]]
-        rawLangDb["appearance"] = self.groupedValues
+        (see langbundle.shapeLangDb)'''
+        import langbundle
+        rawLangDb = langbundle.shapeLangDb(rawLangDb)
 
         return (lang, rawLangDb) # Assigned to the variable loadedLangTuple 
 
@@ -597,5 +1195,36 @@ class Languages(ctk.CTkFrame):
 if __name__ == "__main__": # Allows program to only run when the file is 
                            # executed as a script, allowing for modularity 
                            # and reusability
-    program = Program("Summing Series", (700, 580)) 
-    program.mainloop() 
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(
+                description="Summing Series calculator (--batch [options] "
+                            "runs the headless batch mode, see --batch -h)")
+    parser.add_argument("--fast-start", action="store_true", 
+                        help="build the sidebar and load translations once "
+                             "the window is idle")
+    parser.add_argument("--startup-time", action="store_true", 
+                        help="print how long each startup phase took")
+    parser.add_argument("--metrics", metavar="FILE", 
+                        help="record call counts and latencies of the hot "
+                             "paths and write them to FILE on exit")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT", 
+                        help="record metrics and serve them as JSON on "
+                             "http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--profile", metavar="FILE", 
+                        help="run under cProfile and write the stats to FILE")
+    args = parser.parse_args()
+    timer = StartupTimer(startupStarted, enabled=args.startup_time)
+    timer.mark("imports")
+    if args.metrics or args.metrics_port is not None: # See instrumentation.py
+        instrumentation.enable()
+    if args.metrics_port is not None:
+        instrumentation.serve(args.metrics_port)
+    with instrumentation.profiled(args.profile):
+        program = Program("Summing Series", (700, 580), args.fast_start, 
+                          timer) 
+        program.mainloop()
+        while program.restartRequested: # File > Restart
+            program = Program("Summing Series", (700, 580), args.fast_start) 
+            program.mainloop() 
+    if args.metrics:
+        instrumentation.dump(args.metrics)
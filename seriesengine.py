@@ -0,0 +1,2077 @@
+''' Headless series engine. Contains the arithmetic and geometric series
+formulas used by the calculator, without any dependency on customtkinter or
+tkinter, so that sums can be computed in scripts and back-end jobs.
+
+Error codes returned by the engine index into the "errors" array of the
+language databases (see translator.py):
+0 - ValueError, 1 - InvalidNumberOfTerms, 2 - OverflowError, 
+3 - NoSolution (inverse solvers only), 4 - Divergent (sums to infinity only),
+5 - NotConverged (sums to infinity only)
+
+Precision modes:
+"float"   - Fast binary floating point (the calculator's original behaviour)
+"decimal" - decimal.Decimal using decimalContext (or a context passed in)
+"exact"   - fractions.Fraction, results are exact rational numbers
+'''
+
+import ast
+import decimal
+import functools
+import itertools
+import math
+import operator
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from decimal import Decimal
+from fractions import Fraction
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+np = None # numpy is optional, see _numpy
+
+Number = Union[int, float, Decimal, Fraction]
+
+ARITHMETIC = 1 # Same values as the calculator's radiobuttons
+GEOMETRIC = 2
+CUSTOM = 3 # Terms given by a formula in k (see compileFormula), the first 
+           # term argument holds the formula and the ratio argument r
+ARITHMETICO_GEOMETRIC = 4 # Terms (a + k * d) * r ** k, the ratio argument 
+                          # holds the (d, r) pair
+POWER = 5 # 1 ** p + 2 ** p + ... + n ** p, the first term argument holds the
+          # exponent p and the ratio argument is ignored
+
+NO_ERROR = -1
+VALUE_ERROR = 0
+TERMS_ERROR = 1
+OVERFLOW_ERROR = 2
+NO_SOLUTION_ERROR = 3
+DIVERGENT_ERROR = 4
+NOT_CONVERGED_ERROR = 5
+
+FLOAT = "float"
+DECIMAL = "decimal"
+EXACT = "exact"
+PRECISION_MODES = (FLOAT, DECIMAL, EXACT)
+
+# Exact powers with more bits than this are reported as overflows instead of 
+# taking seconds to minutes (and gigabytes) to compute
+EXACT_BITS_LIMIT = 1 << 23
+
+# Default context for the decimal mode. The exponent limits are raised to the
+# maximum so that large powers do not overflow
+decimalContext = decimal.Context(prec=50, 
+                                 Emax=decimal.MAX_EMAX, 
+                                 Emin=decimal.MIN_EMIN)
+
+
+def _numpy(feature: str) -> Any:
+    '''Import numpy on first use. Only the vectorized kernels require it, so 
+    the calculator and scalar scripts start without paying for the import'''
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                f"{feature} requires numpy (pip install numpy)") from None
+        np = numpy
+    return np
+
+
+class InvalidNumberOfTerms(ValueError):
+    '''The length of the series is a negative number or 0'''
+
+
+class NoSolution(ValueError):
+    '''No value of the unknown gives the target sum'''
+
+
+class Divergent(ValueError):
+    '''The series has no sum to infinity'''
+
+
+class NotConverged(ValueError):
+    '''The sum to infinity could not be estimated to the tolerance. estimate
+    holds the best (sum, error estimate, terms used, method) found'''
+    def __init__(self, message: str, estimate: Tuple) -> None:
+        super().__init__(message)
+        self.estimate = estimate
+
+
+class Cancelled(Exception):
+    '''Raised by a calculation that was cancelled, see cancellable'''
+
+
+# Loops that sum term by term (custom series, sums to infinity) and the 
+# Bernoulli number table check every CANCEL_CHECK_TERMS steps whether the 
+# calculation running in their thread was cancelled
+CANCEL_CHECK_TERMS = 1024
+
+_cancellation = threading.local()
+
+
+@contextmanager
+def cancellable(event: threading.Event, 
+                deadline: Optional[float] = None) -> Iterator[None]:
+    '''Calculations in this block raise Cancelled soon after event is set,
+    or after deadline (a time.monotonic() value), so that a stale or 
+    runaway calculation frees its thread. Only the calling thread is 
+    affected'''
+    outer = getattr(_cancellation, "state", None)
+    _cancellation.state = (event, deadline)
+    try:
+        yield
+    finally:
+        _cancellation.state = outer
+
+
+def _checkCancelled() -> None:
+    state = getattr(_cancellation, "state", None)
+    if state is None:
+        return
+    event, deadline = state
+    if event.is_set():
+        raise Cancelled("The calculation was cancelled")
+    if deadline is not None and time.monotonic() > deadline:
+        raise Cancelled("The calculation took too long")
+
+
+def _checkedRange(start: int, stop: int) -> Iterator[int]:
+    '''range(start, stop), checking for cancellation every 
+    CANCEL_CHECK_TERMS numbers'''
+    for low in range(start, stop, CANCEL_CHECK_TERMS):
+        _checkCancelled()
+        yield from range(low, min(low + CANCEL_CHECK_TERMS, stop))
+
+
+def setDecimalContext(context: decimal.Context) -> None:
+    '''Replace the context used by the decimal mode'''
+    global decimalContext
+    decimalContext = context
+
+
+@functools.lru_cache(maxsize=64)
+def cachedPower(base: Union[Fraction, Decimal], 
+                exponent: int, 
+                contextKey: Optional[Tuple] = None
+                ) -> Union[Fraction, Decimal]:
+    '''base ** exponent, reused across calls with the same inputs. Fraction 
+    and Decimal powers with an integer exponent are computed by repeated 
+    squaring (Fraction powers skip the gcd reduction entirely). contextKey 
+    separates Decimal results rounded under different contexts'''
+    return base ** exponent
+
+
+def _contextKey(context: decimal.Context) -> Tuple:
+    return context.prec, context.rounding, context.Emax, context.Emin
+
+
+def _precision(mode: str, context: Optional[decimal.Context]):
+    '''Context manager that applies the decimal context in decimal mode'''
+    if mode == DECIMAL:
+        return decimal.localcontext(context or decimalContext)
+    if mode in (FLOAT, EXACT):
+        return nullcontext()
+    raise ValueError(f"Unknown precision mode: {mode}")
+
+
+def toNumber(value: Union[str, Number], mode: str = FLOAT) -> Number:
+    '''Convert a string or number into the type used by a precision mode 
+    (raises ValueError)'''
+    if mode == FLOAT:
+        return float(value)
+    if mode == EXACT:
+        return Fraction(value)
+    try:
+        number = Decimal(value.strip() if isinstance(value, str) else value)
+    except decimal.InvalidOperation: # Decimal raises this for invalid text
+        raise ValueError(f"Invalid decimal: {value!r}") from None
+    if not number.is_finite():
+        raise ValueError(f"Invalid decimal: {value!r}")
+    return number
+
+
+def _power(base: Number, exponent: int, mode: str) -> Number:
+    '''base ** exponent in a precision mode (call inside _precision)'''
+    if exponent == 0:
+        return 1 + 0 * base # Decimal("0") ** 0 is an invalid operation
+    if mode == FLOAT:
+        return base ** exponent # Raises OverflowError when out of range
+    if mode == EXACT:
+        bits = max(base.numerator.bit_length(), 
+                   base.denominator.bit_length())
+        if bits * exponent > EXACT_BITS_LIMIT and abs(base) != 1:
+            raise OverflowError(f"Exact power too large: {exponent}")
+        return cachedPower(base, exponent)
+    try:
+        return cachedPower(base, exponent, _contextKey(decimal.getcontext()))
+    except decimal.Overflow:
+        raise OverflowError("Decimal exponent limit exceeded") from None
+
+
+def geometricFactor(commonRatio: float, numberOfTerms: int) -> float:
+    '''(1 - r**n) / (1 - r) in float arithmetic, for r != 1. When r**n is 
+    close to 1 the direct formula cancels catastrophically, so r**n - 1 is 
+    evaluated as expm1(n * log1p(r - 1)) instead. The switch happens at 
+    |n * (r - 1)| < 1, where the stable form has the smaller error bound'''
+    delta = commonRatio - 1
+    if abs(delta * numberOfTerms) < 1:
+        return math.expm1(numberOfTerms * math.log1p(delta)) / delta
+    return (1 - commonRatio ** numberOfTerms) / (1 - commonRatio)
+
+
+def arithmeticSum(firstTerm: Number,
+                  commonDifference: Number,
+                  numberOfTerms: int,
+                  mode: str = FLOAT,
+                  context: Optional[decimal.Context] = None) -> Number:
+    if numberOfTerms <= 0:
+        raise InvalidNumberOfTerms(numberOfTerms)
+    if mode == FLOAT: # inf and nan are overflows, as in every other path
+        return _finite((numberOfTerms / 2)
+                       * (2 * firstTerm 
+                          + (numberOfTerms - 1) * commonDifference))
+    with _precision(mode, context):
+        firstTerm = toNumber(firstTerm, mode)
+        commonDifference = toNumber(commonDifference, mode)
+        try:
+            return (numberOfTerms 
+                    * (2 * firstTerm + (numberOfTerms - 1) * commonDifference)
+                    / 2)
+        except decimal.Overflow:
+            raise OverflowError("Decimal exponent limit exceeded") from None
+
+
+def geometricSum(firstTerm: Number,
+                 commonRatio: Number,
+                 numberOfTerms: int,
+                 mode: str = FLOAT,
+                 context: Optional[decimal.Context] = None) -> Number:
+    if numberOfTerms <= 0:
+        raise InvalidNumberOfTerms(numberOfTerms)
+    if mode == FLOAT:
+        if commonRatio == 1:
+            return _finite(firstTerm * numberOfTerms)
+        return _finite(firstTerm * geometricFactor(commonRatio, 
+                                                   numberOfTerms))
+    with _precision(mode, context):
+        firstTerm = toNumber(firstTerm, mode)
+        commonRatio = toNumber(commonRatio, mode)
+        if commonRatio == 1:
+            return firstTerm * numberOfTerms
+        power = _power(commonRatio, numberOfTerms, mode)
+        return firstTerm * (1 - power) / (1 - commonRatio)
+
+
+def seriesSum(seqType: int,
+              firstTerm: Number,
+              commonDiffOrRatio: Number,
+              numberOfTerms: int,
+              mode: str = FLOAT,
+              context: Optional[decimal.Context] = None) -> Number:
+    if seqType == ARITHMETIC:
+        return arithmeticSum(firstTerm, commonDiffOrRatio, numberOfTerms, 
+                             mode, context)
+    elif seqType == GEOMETRIC:
+        return geometricSum(firstTerm, commonDiffOrRatio, numberOfTerms, 
+                            mode, context)
+    elif seqType == CUSTOM:
+        return formulaSum(firstTerm, commonDiffOrRatio, numberOfTerms, mode, 
+                          context)
+    elif seqType == ARITHMETICO_GEOMETRIC:
+        commonDifference, commonRatio = commonDiffOrRatio
+        return arithmeticoGeometricSum(firstTerm, commonDifference, 
+                                       commonRatio, numberOfTerms, mode, 
+                                       context)
+    elif seqType == POWER:
+        return powerSeriesSum(firstTerm, numberOfTerms, mode, context)
+    raise ValueError(f"Unknown series type: {seqType}")
+
+
+def _convertInputs(seqType: int,
+                   firstTerm: Union[str, Number],
+                   commonDiffOrRatio: Any,
+                   mode: str) -> Tuple[Any, Any]:
+    '''The first term and difference/ratio arguments of seriesSum converted 
+    to the precision mode's number type (call inside _precision)'''
+    if seqType == CUSTOM:
+        return firstTerm.strip(), toNumber(commonDiffOrRatio, mode)
+    if seqType == ARITHMETICO_GEOMETRIC:
+        commonDifference, commonRatio = commonDiffOrRatio
+        return toNumber(firstTerm, mode), (toNumber(commonDifference, mode), 
+                                           toNumber(commonRatio, mode))
+    if seqType == POWER:
+        return toExponent(firstTerm), None
+    return toNumber(firstTerm, mode), toNumber(commonDiffOrRatio, mode)
+
+
+def parseInputs(firstTerm: str,
+                commonDiffOrRatio: str,
+                numberOfTerms: str,
+                mode: str = FLOAT) -> Tuple[Number, Number, int]:
+    '''Convert raw entry text into numbers (raises ValueError)'''
+    return (toNumber(firstTerm, mode), toNumber(commonDiffOrRatio, mode), 
+            int(numberOfTerms))
+
+
+def evaluate(seqType: int,
+             firstTerm: Number,
+             commonDiffOrRatio: Number,
+             numberOfTerms: int,
+             mode: str = FLOAT,
+             context: Optional[decimal.Context] = None
+             ) -> Tuple[Optional[Number], int]:
+    '''Compute a sum and return (sum, errorCode) instead of raising'''
+    try:
+        return seriesSum(seqType, firstTerm, commonDiffOrRatio,
+                         numberOfTerms, mode, context), NO_ERROR
+    except InvalidNumberOfTerms:
+        return None, TERMS_ERROR
+    except (ValueError, TypeError):
+        return None, VALUE_ERROR
+    except OverflowError:
+        return None, OVERFLOW_ERROR
+
+
+def formatResult(result: Number) -> str:
+    '''Text shown for a result, whole fractions are shown as integers'''
+    try:
+        if type(result) is Fraction and result.denominator == 1:
+            return str(result.numerator)
+        return str(result)
+    except ValueError: # Too many digits for int -> str, see 
+                       # sys.set_int_max_str_digits
+        with decimal.localcontext(decimalContext):
+            return str(Decimal(result.numerator) / result.denominator)
+
+
+class SumCache:
+    '''Bounded least-recently-used cache in front of evaluate. Keys are the 
+    inputs converted to the precision mode's number type (so "2", 2 and 2.0 
+    share an entry in float mode) together with the mode and, for decimal 
+    mode, the context. Error results are cached too'''
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize cannot be negative: {maxsize}")
+        self.maxsize = maxsize
+        self.entries = OrderedDict() # Oldest entry first
+        self.lock = threading.Lock() # The GUI evaluates from worker threads
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, 
+            seqType: int, 
+            firstTerm: Union[str, Number], 
+            commonDiffOrRatio: Union[str, Number], 
+            numberOfTerms: int, 
+            mode: str, 
+            context: Optional[decimal.Context]) -> Hashable:
+        with _precision(mode, context):
+            return (seqType, 
+                    *_convertInputs(seqType, firstTerm, commonDiffOrRatio, 
+                                    mode), 
+                    numberOfTerms, mode, 
+                    _contextKey(decimal.getcontext()) 
+                    if mode == DECIMAL else None)
+
+    def evaluate(self, 
+                 seqType: int,
+                 firstTerm: Union[str, Number],
+                 commonDiffOrRatio: Union[str, Number],
+                 numberOfTerms: int,
+                 mode: str = FLOAT,
+                 context: Optional[decimal.Context] = None
+                 ) -> Tuple[Optional[Number], int]:
+        '''Same as the module level evaluate, but served from the cache when 
+        the inputs were seen before'''
+        try:
+            key = self.key(seqType, firstTerm, commonDiffOrRatio, 
+                           numberOfTerms, mode, context)
+        except (ValueError, TypeError):
+            return None, VALUE_ERROR
+        except OverflowError:
+            return None, OVERFLOW_ERROR
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        result = evaluate(seqType, key[1], key[2], numberOfTerms, mode, 
+                          context)
+        with self.lock:
+            self.entries[key] = result
+            self._evict()
+        return result
+
+    def _evict(self) -> None:
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        with self.lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        '''Remove all entries and reset the counters'''
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "evictions": self.evictions,
+                    "size": len(self.entries),
+                    "maxsize": self.maxsize,
+                    "hitRate": self.hits / lookups if lookups else 0.0}
+
+
+def _operators(mode: str, context: Optional[decimal.Context]
+               ) -> Tuple[Callable, Callable, Callable]:
+    '''add, multiply and power functions for a precision mode. Generators 
+    cannot use decimal.localcontext (it would leak into the caller between 
+    yields), so decimal arithmetic goes through the context's methods'''
+    if mode == DECIMAL:
+        context = context or decimalContext
+        return context.add, context.multiply, context.power
+    if mode in (FLOAT, EXACT):
+        return operator.add, operator.mul, operator.pow
+    raise ValueError(f"Unknown precision mode: {mode}")
+
+
+def _checkSlice(numberOfTerms: Optional[int], start: int) -> None:
+    if numberOfTerms is not None and numberOfTerms <= 0:
+        raise InvalidNumberOfTerms(numberOfTerms)
+    if start < 0:
+        raise ValueError(f"start cannot be negative: {start}")
+
+
+def iterTerms(seqType: int,
+              firstTerm: Number,
+              commonDiffOrRatio: Number,
+              numberOfTerms: Optional[int] = None,
+              start: int = 0,
+              mode: str = FLOAT,
+              context: Optional[decimal.Context] = None) -> Iterator[Number]:
+    '''Lazily yield the terms with (zero-based) indexes start to 
+    numberOfTerms - 1, or forever if numberOfTerms is None. The term at 
+    start is computed directly, so skipping terms costs nothing'''
+    if seqType not in (ARITHMETIC, GEOMETRIC):
+        raise ValueError(f"Unknown series type: {seqType}")
+    _checkSlice(numberOfTerms, start)
+    add, multiply, power = _operators(mode, context)
+    firstTerm = toNumber(firstTerm, mode)
+    commonDiffOrRatio = toNumber(commonDiffOrRatio, mode)
+
+    # Terms are computed from their index rather than accumulated, so float 
+    # rounding errors do not build up over billions of terms (and a stream 
+    # from start matches the one from 0)
+    if seqType == ARITHMETIC:
+        term = lambda k: add(firstTerm, multiply(k, commonDiffOrRatio))
+    else:
+        term = lambda k: multiply(firstTerm, power(commonDiffOrRatio, k))
+    indexes = (itertools.count(start) if numberOfTerms is None 
+               else range(start, numberOfTerms))
+    for k in indexes:
+        yield term(k)
+
+
+def iterPartialSums(seqType: int,
+                    firstTerm: Number,
+                    commonDiffOrRatio: Number,
+                    numberOfTerms: Optional[int] = None,
+                    start: int = 0,
+                    mode: str = FLOAT,
+                    context: Optional[decimal.Context] = None
+                    ) -> Iterator[Number]:
+    '''Lazily yield the partial sums S(start + 1) to S(numberOfTerms), where 
+    S(k) is the sum of the first k terms. The sum of the skipped terms is 
+    taken from the closed form'''
+    _checkSlice(numberOfTerms, start)
+    add = _operators(mode, context)[0]
+    total = (seriesSum(seqType, firstTerm, commonDiffOrRatio, start, mode, 
+                       context) 
+             if start > 0 else toNumber(0, mode))
+    for term in iterTerms(seqType, firstTerm, commonDiffOrRatio, 
+                          numberOfTerms, start, mode, context):
+        total = add(total, term)
+        yield total
+
+
+def iterBlocks(seqType: int,
+               firstTerm: float,
+               commonDiffOrRatio: float,
+               numberOfTerms: Optional[int] = None,
+               start: int = 0,
+               blockSize: int = 65536,
+               partialSums: bool = False) -> Iterator[Any]:
+    '''Lazily yield float64 numpy arrays of at most blockSize terms (or 
+    partial sums), starting at term index start. Only one block is held in 
+    memory at a time'''
+    np = _numpy("iterBlocks")
+    if seqType not in (ARITHMETIC, GEOMETRIC):
+        raise ValueError(f"Unknown series type: {seqType}")
+    _checkSlice(numberOfTerms, start)
+    if blockSize <= 0:
+        raise ValueError(f"blockSize must be positive: {blockSize}")
+    firstTerm = float(firstTerm)
+    commonDiffOrRatio = float(commonDiffOrRatio)
+    carry = seriesSum(seqType, firstTerm, commonDiffOrRatio, start) \
+            if partialSums and start > 0 else 0.0
+
+    low = start
+    while numberOfTerms is None or low < numberOfTerms:
+        high = (low + blockSize if numberOfTerms is None 
+                else min(low + blockSize, numberOfTerms))
+        indexes = np.arange(low, high, dtype=np.float64)
+        if seqType == ARITHMETIC:
+            block = firstTerm + indexes * commonDiffOrRatio
+        else:
+            with np.errstate(over="ignore"):
+                block = firstTerm * np.power(commonDiffOrRatio, indexes)
+        if partialSums:
+            block = np.cumsum(block)
+            block += carry
+            carry = block[-1]
+        yield block
+        low = high
+
+
+def batchSum(seqType: int,
+             triples: Iterable[Tuple[Number, Number, int]],
+             mode: str = FLOAT,
+             context: Optional[decimal.Context] = None,
+             cache: Optional[SumCache] = None
+             ) -> Tuple[List[Optional[Number]], List[int]]:
+    '''Evaluate many (first term, difference/ratio, n) triples of the same
+    series type. Returns a list of sums and a parallel list of error codes. 
+    Repeated triples are only computed once when a cache is given. Custom 
+    series take (formula, r, n) triples, arithmetico-geometric series 
+    (a, (d, r), n) and power sums (p, anything, n)'''
+    if seqType not in (ARITHMETIC, GEOMETRIC, CUSTOM, ARITHMETICO_GEOMETRIC, 
+                       POWER):
+        raise ValueError(f"Unknown series type: {seqType}")
+    if cache is not None:
+        results = [cache.evaluate(seqType, *triple, mode, context) 
+                   for triple in triples]
+        return [r[0] for r in results], [r[1] for r in results]
+    if mode != FLOAT or seqType not in (ARITHMETIC, GEOMETRIC):
+        results = [evaluate(seqType, *triple, mode, context) 
+                   for triple in triples]
+        return [r[0] for r in results], [r[1] for r in results]
+    sums = []
+    codes = []
+    appendSum = sums.append # Bind methods locally to speed up the loop
+    appendCode = codes.append
+    for firstTerm, commonDiffOrRatio, numberOfTerms in triples:
+        try:
+            if numberOfTerms <= 0:
+                appendSum(None)
+                appendCode(TERMS_ERROR)
+                continue
+            if seqType == ARITHMETIC:
+                result = ((numberOfTerms / 2)
+                          * (2 * firstTerm + (numberOfTerms - 1)
+                             * commonDiffOrRatio))
+            elif commonDiffOrRatio == 1:
+                result = firstTerm * numberOfTerms
+            else:
+                result = (firstTerm 
+                          * geometricFactor(commonDiffOrRatio, numberOfTerms))
+            appendSum(_finite(result))
+            appendCode(NO_ERROR)
+        except OverflowError:
+            appendSum(None)
+            appendCode(OVERFLOW_ERROR)
+        except (ValueError, TypeError):
+            appendSum(None)
+            appendCode(VALUE_ERROR)
+    return sums, codes
+
+
+def vectorSum(seqType: int,
+              firstTerms: Any,
+              commonDiffsOrRatios: Any,
+              numbersOfTerms: Any) -> Tuple[Any, Any]:
+    '''Evaluate columns of inputs with numpy. Accepts arrays (or anything
+    broadcastable to a common shape) and returns a float64 array of sums and
+    an int8 array of error codes. Failed elements hold nan in the sums array'''
+    np = _numpy("vectorSum")
+    if seqType not in (ARITHMETIC, GEOMETRIC):
+        raise ValueError(f"Unknown series type: {seqType}")
+    a, d, n = np.broadcast_arrays(
+                            np.asarray(firstTerms, dtype=np.float64),
+                            np.asarray(commonDiffsOrRatios, dtype=np.float64),
+                            np.asarray(numbersOfTerms, dtype=np.float64))
+
+    # Masks replace the per-element branching of the scalar path
+    valid = np.isfinite(a) & np.isfinite(d) & (n == np.floor(n)) # Rejects nan
+    invalidTerms = valid & (n <= 0)
+    with np.errstate(all="ignore"):
+        if seqType == ARITHMETIC:
+            sums = n / 2 * (2 * a + (n - 1) * d)
+        else:
+            # Same expm1/log1p switch as geometricFactor
+            unitRatio = d == 1
+            delta = d - 1
+            nearUnit = np.abs(delta * n) < 1
+            growth = np.where(nearUnit, np.expm1(n * np.log1p(delta)), 
+                              np.power(d, n) - 1)
+            sums = np.where(unitRatio, a * n, 
+                            a * growth / np.where(unitRatio, 1.0, delta))
+    overflow = valid & ~invalidTerms & ~np.isfinite(sums)
+
+    codes = np.full(sums.shape, NO_ERROR, dtype=np.int8)
+    codes[~valid] = VALUE_ERROR
+    codes[invalidTerms] = TERMS_ERROR
+    codes[overflow] = OVERFLOW_ERROR
+    sums[codes != NO_ERROR] = np.nan
+    return sums, codes
+
+
+# Summary statistics of the terms t_k (k = 0 .. n - 1) of a series, each in 
+# closed form so their cost does not depend on the number of terms:
+# arithmetic t_k = a + k * d, geometric t_k = a * r ** k
+STATISTICS = ("sum", "mean", "variance", "sumOfSquares", "product", 
+              "lastTerm", "minimum", "maximum")
+DIRECT_PRODUCT_TERMS = 64 # Float products of up to this many terms are 
+                          # multiplied out, which is more accurate than lgamma
+PRODUCT_TERMS_LIMIT = 100000 # Decimal and exact arithmetic products have no 
+                             # closed form, longer ones are overflows
+VARIANCE_SERIES_TERMS = 48 # Enough for |n * log(r)| < 2 in float precision
+
+
+def _finite(value: Number) -> Number:
+    if isinstance(value, float) and not math.isfinite(value):
+        raise OverflowError("Result out of float range")
+    return value
+
+
+def _splitProduct(values: List[Number]) -> Number:
+    '''Product by pairwise (binary splitting) multiplication, which keeps the 
+    operands of similar size and is much faster for big exact numbers'''
+    while len(values) > 1:
+        values = [values[i] * values[i + 1] if i + 1 < len(values) 
+                  else values[i] for i in range(0, len(values), 2)]
+    return values[0]
+
+
+def _logAbsRisingProduct(z: float, numberOfTerms: int, negative: int) -> float:
+    '''log |z * (z + 1) * ... * (z + n - 1)| via lgamma, for a product 
+    without zero factors whose first `negative` factors are negative'''
+    logAbs = 0.0
+    if negative: # |z + k| = w - k for the negative factors, w = -z
+        w = -z
+        logAbs += math.lgamma(w + 1) - math.lgamma(w - negative + 1)
+    if negative < numberOfTerms:
+        logAbs += (math.lgamma(z + numberOfTerms) 
+                   - math.lgamma(z + negative))
+    return logAbs
+
+
+def _arithmeticProduct(firstTerm: Number, 
+                       commonDifference: Number, 
+                       numberOfTerms: int, 
+                       mode: str) -> Number:
+    if commonDifference == 0:
+        return _power(firstTerm, numberOfTerms, mode)
+    z = firstTerm / commonDifference # Terms are d * (z + k)
+    if z <= 0 and z == int(z) and -z < numberOfTerms:
+        return abs(0 * firstTerm) # One of the terms is zero
+    if mode == FLOAT and numberOfTerms > DIRECT_PRODUCT_TERMS:
+        negative = min(numberOfTerms, max(0, math.ceil(-z)))
+        logAbs = (numberOfTerms * math.log(abs(commonDifference)) 
+                  + _logAbsRisingProduct(z, numberOfTerms, negative))
+        negative += numberOfTerms if commonDifference < 0 else 0
+        return (-1) ** (negative % 2) * math.exp(logAbs)
+    if numberOfTerms > PRODUCT_TERMS_LIMIT and mode != FLOAT:
+        raise OverflowError(f"Too many terms for an exact product: "
+                            f"{numberOfTerms}")
+    if mode == EXACT: # Multiply integers, normalising the fraction once
+        p, q = firstTerm.numerator, firstTerm.denominator
+        r, s = commonDifference.numerator, commonDifference.denominator
+        return Fraction(_splitProduct([p * s + k * r * q 
+                                       for k in range(numberOfTerms)]), 
+                        (q * s) ** numberOfTerms)
+    return _splitProduct([firstTerm + k * commonDifference 
+                          for k in range(numberOfTerms)])
+
+
+def _geometricProduct(firstTerm: Number, 
+                      commonRatio: Number, 
+                      numberOfTerms: int, 
+                      mode: str) -> Number:
+    '''a ** n * r ** (n * (n - 1) / 2)'''
+    exponent = numberOfTerms * (numberOfTerms - 1) // 2
+    if firstTerm == 0 or (commonRatio == 0 and numberOfTerms > 1):
+        return abs(0 * firstTerm)
+    try:
+        product = (_power(firstTerm, numberOfTerms, mode) 
+                   * _power(commonRatio, exponent, mode))
+        if mode != FLOAT or (product != 0 and math.isfinite(product)):
+            return product
+    except OverflowError:
+        if mode != FLOAT:
+            raise
+    # Logarithms avoid intermediate powers that overflow or underflow to 0 
+    # while the product is in range (e.g. a huge first term and a tiny 
+    # ratio)
+    negative = (numberOfTerms if firstTerm < 0 else 0) + \
+               (exponent if commonRatio < 0 else 0)
+    logAbs = (numberOfTerms * math.log(abs(firstTerm)) 
+              + exponent * math.log(abs(commonRatio)))
+    return (-1) ** (negative % 2) * math.exp(logAbs)
+
+
+def _extrema(seqType: int, 
+             firstTerm: Number, 
+             commonDiffOrRatio: Number, 
+             numberOfTerms: int, 
+             mode: str) -> Tuple[Number, Number]:
+    '''Smallest and largest term. Arithmetic series are monotonic, so the 
+    extrema are the first and last terms. Geometric terms are monotonic in 
+    size, with alternating signs for negative ratios, so the extrema are 
+    among the first two or the last two terms'''
+    if seqType == ARITHMETIC:
+        terms = [firstTerm, 
+                 firstTerm + (numberOfTerms - 1) * commonDiffOrRatio]
+    else:
+        indexes = {0, 1, numberOfTerms - 2, numberOfTerms - 1}
+        terms = [firstTerm * _power(commonDiffOrRatio, k, mode) 
+                 for k in sorted(indexes) if 0 <= k < numberOfTerms]
+    return min(terms), max(terms)
+
+
+def _sumOfSquares(seqType: int, 
+                  firstTerm: Number, 
+                  commonDiffOrRatio: Number, 
+                  numberOfTerms: int, 
+                  mode: str) -> Number:
+    n = numberOfTerms
+    if seqType == ARITHMETIC:
+        a, d = firstTerm, commonDiffOrRatio
+        return (n * a * a + a * d * n * (n - 1) 
+                + d * d * ((n - 1) * n * (2 * n - 1) // 6))
+    # The squares form a geometric series with ratio r ** 2
+    return geometricSum(firstTerm * firstTerm, 
+                        commonDiffOrRatio * commonDiffOrRatio, n, mode, 
+                        decimal.getcontext())
+
+
+@functools.lru_cache(maxsize=1)
+def _varianceCoefficients() -> Tuple[float, ...]:
+    '''B_2m * (2 ** 2m - 2) / (2m * (2m)!) for m = 1, 2, ...'''
+    bernoulli = bernoulliNumbers(2 * VARIANCE_SERIES_TERMS + 1)
+    return tuple(float(bernoulli[2 * m] * (4 ** m - 2) 
+                       / (2 * m * math.factorial(2 * m))) 
+                 for m in range(1, VARIANCE_SERIES_TERMS + 1))
+
+
+def _geometricVarianceFactor(commonRatio: float, numberOfTerms: int) -> float:
+    '''Variance / mean ** 2 of r ** k for k = 0 .. n - 1 (r > 0), which is 
+    expm1(D) with D = K(2h) - 2 * K(h), where h = log(r) and K is the 
+    cumulant generating function of k (uniform on 0 .. n - 1). Then 
+    D = log(n * tanh(h / 2) / tanh(n * h / 2)), and for |n * h| < 2, where
+    that logarithm is close to 0, the series
+    sum of B_2m * (2 ** 2m - 2) * ((n * h) ** 2m - h ** 2m) / (2m * (2m)!)
+    Neither form cancels like E[t ** 2] - mean ** 2 does for terms that are
+    nearly equal, and neither rounds r ** 2'''
+    h = (math.log1p(commonRatio - 1) if abs(commonRatio - 1) < 0.5 
+         else math.log(commonRatio))
+    x = numberOfTerms * h
+    if abs(x) >= 2:
+        return math.expm1(math.log(numberOfTerms * math.tanh(h / 2) 
+                                   / math.tanh(x / 2)))
+    total = 0.0
+    for m, coefficient in enumerate(_varianceCoefficients(), 1):
+        term = coefficient * (x ** (2 * m) - h ** (2 * m))
+        total += term
+        if abs(term) <= sys.float_info.epsilon * abs(total):
+            break
+    return math.expm1(total)
+
+
+def _statistic(name: str, 
+               seqType: int, 
+               firstTerm: Number, 
+               commonDiffOrRatio: Number, 
+               numberOfTerms: int, 
+               mode: str) -> Number:
+    '''Compute a statistic from converted inputs (call inside _precision)'''
+    n = numberOfTerms
+    if name == "sum":
+        return seriesSum(seqType, firstTerm, commonDiffOrRatio, n, mode, 
+                         decimal.getcontext())
+    if name == "mean":
+        if seqType == ARITHMETIC:
+            return firstTerm + (n - 1) * commonDiffOrRatio / 2
+        return _statistic("sum", seqType, firstTerm, commonDiffOrRatio, n, 
+                          mode) / n
+    if name == "variance": # Population variance
+        if seqType == ARITHMETIC:
+            return commonDiffOrRatio * commonDiffOrRatio * (n * n - 1) / 12
+        mean = _statistic("mean", seqType, firstTerm, commonDiffOrRatio, n, 
+                          mode)
+        if mode == FLOAT and commonDiffOrRatio > 0: # See the factor
+            return _finite(mean * mean 
+                           * _geometricVarianceFactor(commonDiffOrRatio, n))
+        variance = (_sumOfSquares(seqType, firstTerm, commonDiffOrRatio, n, 
+                                  mode) / n - mean * mean)
+        return max(variance, 0 * variance)
+    if name == "sumOfSquares":
+        return _sumOfSquares(seqType, firstTerm, commonDiffOrRatio, n, mode)
+    if name == "product":
+        if seqType == ARITHMETIC:
+            return _arithmeticProduct(firstTerm, commonDiffOrRatio, n, mode)
+        return _geometricProduct(firstTerm, commonDiffOrRatio, n, mode)
+    if name == "lastTerm":
+        if seqType == ARITHMETIC:
+            return firstTerm + (n - 1) * commonDiffOrRatio
+        return firstTerm * _power(commonDiffOrRatio, n - 1, mode)
+    if name in ("minimum", "maximum"):
+        extrema = _extrema(seqType, firstTerm, commonDiffOrRatio, n, mode)
+        return extrema[0] if name == "minimum" else extrema[1]
+    raise ValueError(f"Unknown statistic: {name}")
+
+
+def _checkStatistic(name: str, seqType: int) -> None:
+    if name not in STATISTICS:
+        raise ValueError(f"Unknown statistic: {name}")
+    if seqType not in (ARITHMETIC, GEOMETRIC):
+        raise ValueError(f"Unknown series type: {seqType}")
+
+
+def seriesStatistic(name: str,
+                    seqType: int,
+                    firstTerm: Number,
+                    commonDiffOrRatio: Number,
+                    numberOfTerms: int,
+                    mode: str = FLOAT,
+                    context: Optional[decimal.Context] = None) -> Number:
+    '''One of STATISTICS for the terms of a series, computed in O(1) (or 
+    O(log n) for powers). Raises the same exceptions as seriesSum. Decimal 
+    and exact arithmetic products multiply the terms out and are limited to 
+    PRODUCT_TERMS_LIMIT terms'''
+    _checkStatistic(name, seqType)
+    if numberOfTerms <= 0:
+        raise InvalidNumberOfTerms(numberOfTerms)
+    with _precision(mode, context):
+        firstTerm = toNumber(firstTerm, mode)
+        commonDiffOrRatio = toNumber(commonDiffOrRatio, mode)
+        try:
+            return _finite(_statistic(name, seqType, firstTerm, 
+                                      commonDiffOrRatio, numberOfTerms, mode))
+        except decimal.Overflow:
+            raise OverflowError("Decimal exponent limit exceeded") from None
+
+
+def evaluateStatistic(name: str,
+                      seqType: int,
+                      firstTerm: Number,
+                      commonDiffOrRatio: Number,
+                      numberOfTerms: int,
+                      mode: str = FLOAT,
+                      context: Optional[decimal.Context] = None
+                      ) -> Tuple[Optional[Number], int]:
+    '''Compute a statistic and return (value, errorCode) instead of 
+    raising. Unknown statistics and series types still raise ValueError'''
+    _checkStatistic(name, seqType)
+    try:
+        return seriesStatistic(name, seqType, firstTerm, commonDiffOrRatio,
+                               numberOfTerms, mode, context), NO_ERROR
+    except InvalidNumberOfTerms:
+        return None, TERMS_ERROR
+    except (ValueError, TypeError):
+        return None, VALUE_ERROR
+    except OverflowError:
+        return None, OVERFLOW_ERROR
+
+
+def seriesSummary(seqType: int,
+                  firstTerm: Number,
+                  commonDiffOrRatio: Number,
+                  numberOfTerms: int,
+                  mode: str = FLOAT,
+                  context: Optional[decimal.Context] = None
+                  ) -> Dict[str, Tuple[Optional[Number], int]]:
+    '''Every statistic as name: (value, errorCode), so that e.g. an 
+    overflowing product does not hide the other statistics'''
+    return {name: evaluateStatistic(name, seqType, firstTerm, 
+                                    commonDiffOrRatio, numberOfTerms, mode, 
+                                    context) for name in STATISTICS}
+
+
+def batchStatistic(name: str,
+                   seqType: int,
+                   triples: Iterable[Tuple[Number, Number, int]],
+                   mode: str = FLOAT,
+                   context: Optional[decimal.Context] = None
+                   ) -> Tuple[List[Optional[Number]], List[int]]:
+    '''evaluateStatistic for many (first term, difference/ratio, n) triples 
+    of the same series type. Returns a list of values and a parallel list of 
+    error codes, like batchSum'''
+    _checkStatistic(name, seqType)
+    results = [evaluateStatistic(name, seqType, *triple, mode, context) 
+               for triple in triples]
+    return [r[0] for r in results], [r[1] for r in results]
+
+
+# Inverse solvers: given two of (first term, difference/ratio, number of 
+# terms) and a target sum, find the third. Closed forms give the answer (or 
+# a first guess) and bracketed searches make it exact
+NUMBER_OF_TERMS = "numberOfTerms"
+FIRST_TERM = "firstTerm"
+COMMON_DIFF_OR_RATIO = "commonDiffOrRatio"
+UNKNOWNS = (NUMBER_OF_TERMS, FIRST_TERM, COMMON_DIFF_OR_RATIO)
+MAX_SOLVED_TERMS = 1 << 62 # Larger numbers of terms are not searched
+RATIO_ITERATIONS = 200 # Safeguarded Newton steps allowed per ratio
+
+
+def _firstReached(reached: Callable[[int], bool], 
+                  low: int, 
+                  high: Optional[int] = None, 
+                  guess: Optional[int] = None) -> Optional[int]:
+    '''Smallest n in [low, high] with reached(n) true, for a predicate that 
+    is false and then true on the range (None if it is never true). The 
+    search gallops outwards from guess (the closed form solution) before 
+    bisecting, so an accurate guess costs two evaluations and a poor one 
+    O(log(error))'''
+    high = MAX_SOLVED_TERMS if high is None else min(high, MAX_SOLVED_TERMS)
+    if low > high:
+        return None
+    guess = low if guess is None else min(max(guess, low), high)
+    # Find lo < hi with reached(hi) true and reached(lo) false (lo may be 
+    # low - 1, which stands for "before the range")
+    if reached(guess):
+        hi, lo, step = guess, low - 1, 1
+        while hi - step >= low:
+            if not reached(hi - step):
+                lo = hi - step
+                break
+            hi -= step
+            step *= 2
+    else:
+        lo, step = guess, 1
+        while True:
+            if lo == high:
+                return None
+            hi = min(lo + step, high)
+            if reached(hi):
+                break
+            lo = hi
+            step *= 2
+    while hi - lo > 1:
+        middle = (lo + hi) // 2
+        if reached(middle):
+            hi = middle
+        else:
+            lo = middle
+    return hi
+
+
+def _ceilGuess(value: float) -> Optional[int]:
+    try:
+        return math.ceil(value) if value < MAX_SOLVED_TERMS else None
+    except (OverflowError, ValueError): # inf or nan
+        return None
+
+
+def _arithmeticTermsSearch(a: Number, 
+                           d: Number, 
+                           target: Number, 
+                           direction: int) -> List[Tuple]:
+    '''Ranges of n on which direction * (S_n - target) increases, with the 
+    closed form (quadratic) solutions as guesses. S_n grows by the term 
+    a + (n - 1) * d, whose sign changes once, at n - 1 = -a / d'''
+    if d == 0:
+        if direction * a <= 0:
+            return []
+        return [(1, None, _ceilGuess(float(target) / float(a)))]
+    try: # (d / 2) n^2 + (a - d / 2) n - target = 0
+        A, B = float(d) / 2, float(a) - float(d) / 2
+        root = math.sqrt(B * B + 4 * A * float(target))
+        roots = sorted([(-B + root) / (2 * A), (-B - root) / (2 * A)])
+    except (ValueError, OverflowError, ZeroDivisionError):
+        roots = []
+    boundary = -a / d
+    if direction * d > 0: # Terms move towards the target from some n on
+        low = max(1, math.floor(boundary) + 1)
+        guess = next((_ceilGuess(r) for r in roots if r >= low), None)
+        return [(low, None, guess)]
+    high = math.ceil(boundary) # Terms move towards the target up to here
+    guess = next((_ceilGuess(r) for r in roots if r >= 1), None)
+    return [(1, high, guess)] if high >= 1 else []
+
+
+def _geometricTermsSearch(a: Number, 
+                          r: Number, 
+                          target: Number, 
+                          direction: int) -> List[Tuple]:
+    '''Ranges of n on which direction * (S_n - target) increases. For 
+    negative ratios the partial sums alternate, so the odd and the even n 
+    are searched separately (as n = 2m + parity). Guesses come from the 
+    closed form r ** n = 1 - target * (1 - r) / a'''
+    if r == 0 or a == 0:
+        return []
+    if abs(r) < 1: # Bounded, the sums approach a / (1 - r) but never reach it
+        if direction * (a / (1 - r) - target) <= 0:
+            return []
+    try:
+        power = 1 - float(target) * (1 - float(r)) / float(a) # r ** n
+    except (OverflowError, ZeroDivisionError):
+        power = math.nan
+    if r > 0:
+        if direction * a <= 0:
+            return []
+        if r == 1:
+            return [(1, None, _ceilGuess(float(target) / float(a)), 1, 0)]
+        guess = None
+        if power > 0:
+            guess = _ceilGuess(math.log(power) / math.log(float(r)))
+        return [(1, None, guess, 1, 0)]
+    if r == -1: # The sums alternate between a and 0
+        return [(1, 1, 1, 2, 0)]
+    ranges = []
+    for parity in (1, 2): # n = 2m + parity
+        # S grows by a * r ** (n) * (1 + r) from one n of a parity to the next
+        step = a * (1 if parity == 2 else -1) * (1 + r)
+        if direction * step <= 0:
+            continue
+        guess = None
+        try: # (r ** 2) ** m = power / r ** parity
+            ratio = power / float(r) ** parity
+            if ratio > 0:
+                guess = _ceilGuess(math.log(ratio) / math.log(float(r) ** 2))
+        except (OverflowError, ValueError, ZeroDivisionError):
+            pass
+        ranges.append((0, None, guess, 2, parity))
+    return ranges
+
+
+def _solveNumberOfTerms(seqType: int, 
+                        a: Number, 
+                        d: Number, 
+                        target: Number, 
+                        mode: str) -> int:
+    '''Smallest n whose sum reaches the target: S_n >= target for targets of 
+    0 or more, S_n <= target for negative targets'''
+    direction = 1 if target >= 0 else -1
+
+    def reached(n: int, strict: bool = False, mode: str = mode, 
+                values: Tuple = (a, d, target)) -> bool:
+        first, second, goal = values
+        try:
+            total = seriesSum(seqType, first, second, n, mode, 
+                              decimal.getcontext())
+        except OverflowError:
+            # Only searched ranges move towards the target, so a sum too 
+            # big to compute is past it (checked again for the answer)
+            if strict:
+                raise
+            return True
+        return direction * (total - goal) >= 0
+
+    if reached(1, strict=True):
+        return 1
+    if seqType == ARITHMETIC:
+        ranges = [(low, high, guess, 1, 0) for low, high, guess in 
+                  _arithmeticTermsSearch(a, d, target, direction)]
+    else:
+        ranges = _geometricTermsSearch(a, d, target, direction)
+    answers = []
+    for low, high, guess, scale, offset in ranges: # n = scale * m + offset
+        strict = False
+        if mode == EXACT:
+            # Exact sums of long series are slow, so the answer is located 
+            # with decimals and only confirmed (or corrected) exactly. An 
+            # exact sum that overflows there is reported, rather than 
+            # searching for the overflow threshold
+            with decimal.localcontext(decimalContext):
+                values = tuple(Decimal(x.numerator) / x.denominator 
+                               for x in (a, d, target))
+                located = _firstReached(
+                    lambda m: reached(scale * m + offset, mode=DECIMAL, 
+                                      values=values), low, high, guess)
+            if located is not None:
+                guess, strict = located, True
+        found = _firstReached(
+                    lambda m: reached(scale * m + offset, strict), 
+                    low, high, guess)
+        if found is not None:
+            answers.append(scale * found + offset)
+    answers = [n for n in answers if n >= 1]
+    if not answers:
+        raise NoSolution("The sum never reaches the target")
+    answer = min(answers)
+    reached(answer, strict=True) # Raises OverflowError if out of range
+    return answer
+
+
+def _solveFirstTerm(seqType: int, 
+                    d: Number, 
+                    n: int, 
+                    target: Number, 
+                    mode: str) -> Number:
+    if seqType == ARITHMETIC: # target = n * a + d * n (n - 1) / 2
+        return (target - d * (n * (n - 1) // 2)) / n
+    factor = seriesSum(GEOMETRIC, 1 + 0 * d, d, n, mode, 
+                       decimal.getcontext()) # Sum with a first term of 1
+    if factor == 0: # e.g. r = -1 with an even number of terms
+        if target == 0:
+            return 0 * target # Any first term works
+        raise NoSolution("The sum is 0 for every first term")
+    return target / factor
+
+
+def _solveRatio(quotient: Number, n: int, mode: str) -> Number:
+    '''The ratio r >= 0 with 1 + r + ... + r ** (n - 1) = quotient (n >= 2, 
+    quotient > 1). The sum is increasing and convex for r >= 0, so Newton's 
+    method from the right of the root converges from above; a bracket 
+    guards it against rounding and falls back to bisection'''
+    def factor(r: Number) -> Number:
+        try:
+            return seriesSum(GEOMETRIC, 1 + 0 * r, r, n, mode, 
+                             decimal.getcontext())
+        except OverflowError:
+            return math.inf if mode == FLOAT else Decimal("Infinity")
+
+    def slope(r: Number) -> Number: # Sum of k * r ** (k - 1)
+        if abs(r - 1) * n < 1e-3: # Near 1 the closed form cancels
+            return n * (n - 1) / 2 if mode == FLOAT else \
+                   Decimal(n * (n - 1)) / 2
+        return ((1 - n * _power(r, n - 1, mode) 
+                 + (n - 1) * _power(r, n, mode)) / ((1 - r) * (1 - r)))
+
+    one = 1 + 0 * quotient
+    if quotient == n:
+        return one
+    if quotient < n: # Root in (0, 1)
+        low, high = 0 * one, one
+    else: # r ** (n - 1) < quotient for the root
+        low, high = one, quotient ** (one / (n - 1))
+    tolerance = (4 * sys.float_info.epsilon if mode == FLOAT else 
+                 Decimal(10) ** (3 - decimal.getcontext().prec))
+    r = high
+    for _ in range(RATIO_ITERATIONS):
+        try:
+            step = (factor(r) - quotient) / slope(r)
+            candidate = r - step
+        except (OverflowError, ZeroDivisionError, decimal.Overflow):
+            candidate = None
+        if candidate is None or not low < candidate < high:
+            candidate = (low + high) / 2 # Bisect instead
+        if factor(candidate) >= quotient:
+            high = candidate
+        else:
+            low = candidate
+        if abs(candidate - r) <= tolerance * abs(candidate) or \
+                high - low <= tolerance * high:
+            return candidate
+        r = candidate
+    return r
+
+
+def _solveCommonDiffOrRatio(seqType: int, 
+                            a: Number, 
+                            n: int, 
+                            target: Number, 
+                            mode: str,
+                            context: Optional[decimal.Context]) -> Number:
+    if n == 1 or (seqType == GEOMETRIC and a == 0):
+        if a == target:
+            return 0 * target # Any difference or ratio works
+        raise NoSolution("The sum does not depend on the unknown")
+    if seqType == ARITHMETIC: # target = n * a + d * n (n - 1) / 2
+        return (target - n * a) / (n * (n - 1) // 2)
+    quotient = target / a # 1 + r + ... + r ** (n - 1)
+    if n == 2:
+        return quotient - 1
+    if quotient < 1:
+        raise NoSolution("Only ratios of 0 or more are searched")
+    if quotient == 1:
+        return 0 * quotient
+    if mode == EXACT: # The ratio is irrational in general
+        with decimal.localcontext(context or decimalContext):
+            quotient = Decimal(quotient.numerator) / quotient.denominator
+            return _solveRatio(quotient, n, DECIMAL)
+    return _solveRatio(quotient, n, mode)
+
+
+def solveSeries(unknown: str,
+                seqType: int,
+                first: Union[str, Number],
+                second: Union[str, Number],
+                target: Union[str, Number],
+                mode: str = FLOAT,
+                context: Optional[decimal.Context] = None) -> Number:
+    '''Find the unknown (one of UNKNOWNS) that gives the target sum. first 
+    and second are the other two of (first term, difference/ratio, number 
+    of terms), in that order. For the number of terms, the answer is the 
+    smallest n whose sum reaches the target (S_n >= target, or <= for 
+    negative targets). Ratios are only searched among numbers of 0 or more 
+    (except for two terms), and are computed with the decimal context in 
+    exact mode, as they are irrational in general. Raises NoSolution, 
+    InvalidNumberOfTerms, ValueError or OverflowError'''
+    if unknown not in UNKNOWNS:
+        raise ValueError(f"Unknown quantity to solve for: {unknown}")
+    if seqType not in (ARITHMETIC, GEOMETRIC):
+        raise ValueError(f"Unknown series type: {seqType}")
+    with _precision(mode, context):
+        target = toNumber(target, mode)
+        try:
+            if unknown == NUMBER_OF_TERMS:
+                return _solveNumberOfTerms(seqType, toNumber(first, mode), 
+                                           toNumber(second, mode), target, 
+                                           mode)
+            known, numberOfTerms = toNumber(first, mode), int(second)
+            if numberOfTerms <= 0:
+                raise InvalidNumberOfTerms(numberOfTerms)
+            if unknown == FIRST_TERM:
+                return _finite(_solveFirstTerm(seqType, known, numberOfTerms, 
+                                               target, mode))
+            return _finite(_solveCommonDiffOrRatio(
+                        seqType, known, numberOfTerms, target, mode, context))
+        except decimal.Overflow:
+            raise OverflowError("Decimal exponent limit exceeded") from None
+
+
+def evaluateInverse(unknown: str,
+                    seqType: int,
+                    first: Union[str, Number],
+                    second: Union[str, Number],
+                    target: Union[str, Number],
+                    mode: str = FLOAT,
+                    context: Optional[decimal.Context] = None
+                    ) -> Tuple[Optional[Number], int]:
+    '''Solve and return (value, errorCode) instead of raising'''
+    try:
+        return solveSeries(unknown, seqType, first, second, target, mode, 
+                           context), NO_ERROR
+    except InvalidNumberOfTerms:
+        return None, TERMS_ERROR
+    except NoSolution:
+        return None, NO_SOLUTION_ERROR
+    except (ValueError, TypeError):
+        return None, VALUE_ERROR
+    except OverflowError:
+        return None, OVERFLOW_ERROR
+
+
+def batchSolve(unknown: str,
+               seqType: int,
+               rows: Iterable[Tuple[Any, Any, Any]],
+               mode: str = FLOAT,
+               context: Optional[decimal.Context] = None
+               ) -> Tuple[List[Optional[Number]], List[int]]:
+    '''evaluateInverse for many (first, second, target) rows of the same 
+    series type. Returns a list of values and a parallel list of error 
+    codes, like batchSum'''
+    if unknown not in UNKNOWNS:
+        raise ValueError(f"Unknown quantity to solve for: {unknown}")
+    if seqType not in (ARITHMETIC, GEOMETRIC):
+        raise ValueError(f"Unknown series type: {seqType}")
+    results = [evaluateInverse(unknown, seqType, *row, mode, context) 
+               for row in rows]
+    return [r[0] for r in results], [r[1] for r in results]
+
+
+# Custom series: the sum of t(k) for k = 1 .. n, where t is a formula typed 
+# by the user. Formulas are parsed once into a whitelisted syntax tree and 
+# compiled to a Python function per precision mode and to a numpy function 
+# that evaluates a whole block of k at once
+FORMULA_NAMES = ("k", "r", "n") # Term index, parameter, number of terms
+FORMULA_CONSTANTS = ("pi", "e", "tau")
+FORMULA_FUNCTIONS = ("sqrt", "exp", "log", "log10", "log2", "sin", "cos", 
+                     "tan", "asin", "acos", "atan", "sinh", "cosh", "tanh", 
+                     "abs", "floor", "ceil")
+FORMULA_LENGTH_LIMIT = 1000
+FORMULA_CHUNK_TERMS = 1 << 20 # Terms evaluated per numpy block (8 MB each)
+
+_formulaOperators = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, 
+                     ast.Mod, ast.Pow, ast.UAdd, ast.USub)
+# Functions and constants available beyond float mode
+_decimalFunctions = ("sqrt", "exp", "log", "log10", "log2", "abs", "floor", 
+                     "ceil")
+_exactFunctions = ("abs", "floor", "ceil")
+
+
+def _decimalPi() -> Decimal:
+    '''pi to the precision of the current context (recipe from the decimal 
+    module documentation)'''
+    with decimal.localcontext() as context:
+        context.prec += 2
+        three = Decimal(3)
+        last, t, total, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while total != last:
+            last = total
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            total += t
+    return +total
+
+
+def _exactPow(base: Fraction, exponent: Fraction) -> Fraction:
+    if exponent.denominator != 1:
+        raise ValueError("Fractional powers are not exact")
+    return _power(base, int(exponent), EXACT)
+
+
+def _formulaNamespace(mode: str) -> Dict[str, Any]:
+    '''Functions and constants a compiled formula runs with (call inside 
+    _precision for the decimal constants)'''
+    if mode == FLOAT:
+        namespace = {name: getattr(math, name) for name in FORMULA_FUNCTIONS 
+                     if name not in ("abs", "floor", "ceil")}
+        namespace.update(abs=abs, floor=math.floor, ceil=math.ceil, 
+                         pi=math.pi, e=math.e, tau=math.tau, 
+                         _pow=math.pow) # Raises instead of returning complex
+        return namespace
+    if mode == DECIMAL:
+        pi = _decimalPi()
+        return {"sqrt": Decimal.sqrt, "exp": Decimal.exp, "log": Decimal.ln,
+                "log10": Decimal.log10, 
+                "log2": lambda x: x.ln() / Decimal(2).ln(), 
+                "abs": abs, "floor": lambda x: Decimal(math.floor(x)), 
+                "ceil": lambda x: Decimal(math.ceil(x)), 
+                "pi": pi, "e": Decimal(1).exp(), "tau": 2 * pi, 
+                "_pow": operator.pow}
+    return {"abs": abs, "floor": lambda x: Fraction(math.floor(x)), 
+            "ceil": lambda x: Fraction(math.ceil(x)), "_pow": _exactPow}
+
+
+def _vectorNamespace(np: Any) -> Dict[str, Any]:
+    namespace = {name: getattr(np, name) for name in FORMULA_FUNCTIONS 
+                 if name not in ("asin", "acos", "atan")}
+    namespace.update(asin=np.arcsin, acos=np.arccos, atan=np.arctan, 
+                     pi=math.pi, e=math.e, tau=math.tau, _pow=np.power)
+    return namespace
+
+
+class _FormulaCompiler(ast.NodeTransformer):
+    '''Checks a parsed formula against the whitelist, and rewrites powers 
+    into _pow calls and number literals into names bound per precision 
+    mode'''
+    def __init__(self) -> None:
+        self.constants: List[str] = [] # Literal text of each number
+        self.names = set()
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        if not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, 
+                                 ast.Load) + _formulaOperators):
+            raise ValueError(
+                f"Not allowed in a formula: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.Call(ast.Name("_pow", ast.Load()), 
+                            [node.left, node.right], [])
+        return node
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        if type(node.value) not in (int, float):
+            raise ValueError(f"Not a number: {node.value!r}")
+        self.constants.append(repr(node.value))
+        return ast.Name(f"_c{len(self.constants) - 1}", ast.Load())
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id not in FORMULA_NAMES + FORMULA_CONSTANTS:
+            raise ValueError(f"Unknown name in formula: {node.id}")
+        self.names.add(node.id)
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if (not isinstance(node.func, ast.Name) 
+                or node.func.id not in FORMULA_FUNCTIONS 
+                or len(node.args) != 1 or node.keywords):
+            raise ValueError("Only the functions in FORMULA_FUNCTIONS, with "
+                             "one argument, can be called")
+        self.names.add(node.func.id)
+        node.args = [self.visit(node.args[0])]
+        return node
+
+
+class Formula:
+    '''A term formula parsed and compiled once. function(mode) returns the 
+    term t(k, r, n) as a Python function for a precision mode, vector(np) 
+    the same function over numpy arrays of k'''
+    def __init__(self, text: str) -> None:
+        if len(text) > FORMULA_LENGTH_LIMIT:
+            raise ValueError("Formula too long")
+        try:
+            # ^ is a power, replaced before parsing so that it binds like 
+            # ** (parsed as Python's ^, "k^2 + 1" would be k^(2 + 1))
+            tree = ast.parse(text.strip().replace("^", "**"), mode="eval")
+        except SyntaxError:
+            raise ValueError(f"Invalid formula: {text!r}") from None
+        compiler = _FormulaCompiler()
+        body = compiler.visit(tree).body
+        self.text = text
+        self.constants = compiler.constants
+        self.names = frozenset(compiler.names)
+        arguments = ast.arguments(posonlyargs=[], 
+                                  args=[ast.arg(name) 
+                                        for name in FORMULA_NAMES], 
+                                  kwonlyargs=[], kw_defaults=[], defaults=[])
+        self.code = compile(ast.fix_missing_locations(ast.Expression(
+                                ast.Lambda(arguments, body))), 
+                            "<formula>", "eval")
+        self.functions: Dict[Hashable, Callable] = {}
+        self.lock = threading.Lock()
+
+    def _build(self, namespace: Dict[str, Any], 
+               convert: Callable[[str], Any]) -> Callable:
+        namespace = dict(namespace, __builtins__={})
+        for i, constant in enumerate(self.constants):
+            namespace[f"_c{i}"] = convert(constant)
+        return eval(self.code, namespace) # Only whitelisted names and nodes
+
+    def function(self, mode: str) -> Callable:
+        '''Term function for a precision mode (call inside _precision). 
+        Raises ValueError if the formula uses functions or constants the 
+        mode cannot evaluate (exact mode has no irrational functions)'''
+        if mode == FLOAT:
+            key = mode
+        elif mode == DECIMAL:
+            key = mode, _contextKey(decimal.getcontext())
+            unsupported = self.names - set(FORMULA_NAMES + FORMULA_CONSTANTS 
+                                           + _decimalFunctions)
+        elif mode == EXACT:
+            key = mode
+            unsupported = self.names - set(FORMULA_NAMES + _exactFunctions)
+        else:
+            raise ValueError(f"Unknown precision mode: {mode}")
+        if mode != FLOAT and unsupported:
+            raise ValueError(f"Not available in {mode} mode: "
+                             f"{', '.join(sorted(unsupported))}")
+        with self.lock:
+            if key not in self.functions:
+                self.functions[key] = self._build(
+                    _formulaNamespace(mode), lambda text: toNumber(text, mode))
+            return self.functions[key]
+
+    def vector(self, np: Any) -> Callable:
+        with self.lock:
+            if "vector" not in self.functions:
+                self.functions["vector"] = self._build(_vectorNamespace(np), 
+                                                       float)
+            return self.functions["vector"]
+
+
+@functools.lru_cache(maxsize=64)
+def compileFormula(text: str) -> Formula:
+    '''Parse and compile a term formula, reused for repeated formulas 
+    (raises ValueError). Formulas are arithmetic expressions (+ - * / // % 
+    and ** or ^ for powers) of the term index k = 1 .. n, the parameter r, 
+    the number of terms n, the constants pi, e and tau and the functions in 
+    FORMULA_FUNCTIONS, e.g. "1/k**2" or "k*r**k"'''
+    return Formula(text)
+
+
+def _floatFormulaSum(formula: Formula, r: float, numberOfTerms: int) -> float:
+    '''Sums blocks of FORMULA_CHUNK_TERMS terms with numpy (pairwise 
+    summation within a block) and adds the block sums with Neumaier 
+    compensation, so memory stays bounded and the rounding error grows with 
+    log(n) rather than n'''
+    term = formula.function(FLOAT)
+    n = float(numberOfTerms)
+    try:
+        np = _numpy("Vectorized custom sums")
+    except ImportError: # Term by term, still correctly rounded
+        return _finite(math.fsum(term(float(k), r, n) for k in 
+                                 _checkedRange(1, numberOfTerms + 1)))
+    vector = formula.vector(np)
+    total = compensation = 0.0
+    for start in range(1, numberOfTerms + 1, FORMULA_CHUNK_TERMS):
+        _checkCancelled()
+        stop = min(start + FORMULA_CHUNK_TERMS, numberOfTerms + 1)
+        k = np.arange(start, stop, dtype=np.float64)
+        with np.errstate(all="ignore"):
+            values = vector(k, r, n)
+            if np.ndim(values) == 0: # The formula does not depend on k
+                blockSum = float(values) * len(k)
+            else:
+                blockSum = float(np.sum(values))
+        if not math.isfinite(blockSum):
+            # Evaluate the block term by term, which raises the same error 
+            # (division by zero, domain error) as the scalar modes
+            math.fsum(term(float(i), r, n) for i in range(start, stop))
+            raise OverflowError("Sum out of float range")
+        t = total + blockSum
+        if abs(total) >= abs(blockSum):
+            compensation += (total - t) + blockSum
+        else:
+            compensation += (blockSum - t) + total
+        total = t
+    return _finite(total + compensation)
+
+
+def formulaSum(formula: Union[str, Formula],
+               parameter: Union[str, Number],
+               numberOfTerms: int,
+               mode: str = FLOAT,
+               context: Optional[decimal.Context] = None) -> Number:
+    '''Sum of formula(k) for k = 1 .. numberOfTerms, with r = parameter. 
+    Float sums are vectorized with numpy when it is installed, decimal and 
+    exact sums are computed term by term'''
+    if numberOfTerms <= 0:
+        raise InvalidNumberOfTerms(numberOfTerms)
+    if isinstance(formula, str):
+        formula = compileFormula(formula.strip())
+    with _precision(mode, context):
+        r = toNumber(parameter, mode)
+        try:
+            if mode == FLOAT:
+                return _floatFormulaSum(formula, r, numberOfTerms)
+            term = formula.function(mode)
+            number = Decimal if mode == DECIMAL else Fraction
+            n = number(numberOfTerms)
+            total = 0
+            for k in _checkedRange(1, numberOfTerms + 1):
+                total += term(number(k), r, n)
+            return total
+        except (ZeroDivisionError, decimal.InvalidOperation) as error:
+            raise ValueError(f"Term could not be evaluated: {error!r}"
+                             ) from None
+        except decimal.Overflow:
+            raise OverflowError("Decimal exponent limit exceeded") from None
+
+
+# Sums to infinity. Geometric series (and trivial arithmetic ones) have a 
+# closed form. Custom series are summed term by term, and at every doubling 
+# of the number of terms the partial sums are extrapolated by several 
+# sequence transformations; the estimate that changed least since the last 
+# doubling is used, which typically reaches full precision in tens of terms
+INFINITE_TERMS_LIMIT = 1 << 16 # Terms of a custom series summed at most
+ACCELERATION_WINDOW = 20 # Last partial sums used by Aitken and Wynn
+RICHARDSON_LEVELS = 8 # Partial sums at 16, 32, 64, ... terms used in 
+                      # float mode (more amplify rounding errors), decimal 
+                      # mode uses all of them
+INFINITE_METHODS = ("closed form", "direct", "aitken", "wynn", "richardson")
+
+
+def _aitken(partials: List[Number]) -> Number:
+    '''Iterated Aitken delta-squared process, for linearly converging 
+    sequences'''
+    values = list(partials)
+    while len(values) >= 3:
+        accelerated = []
+        for i in range(len(values) - 2):
+            x0, x1, x2 = values[i:i + 3]
+            denominator = x2 - 2 * x1 + x0
+            if denominator == 0: # Already converged
+                return x2
+            accelerated.append(x2 - (x2 - x1) * (x2 - x1) / denominator)
+        values = accelerated
+    return values[-1]
+
+
+def _wynnEpsilon(partials: List[Number]) -> Number:
+    '''Wynn's epsilon algorithm (the Shanks transformation), for linearly 
+    converging and alternating sequences. Returns the last element of the 
+    deepest even column of the epsilon table'''
+    previous = [0 * partials[0]] * (len(partials) + 1) # Column -1
+    current = list(partials) # Column 0
+    best = current[-1]
+    for column in range(1, len(partials)):
+        following = []
+        for i in range(len(current) - 1):
+            difference = current[i + 1] - current[i]
+            if difference == 0: # Converged, later columns divide by 0
+                return current[i + 1] if column % 2 == 1 else best
+            following.append(previous[i + 1] + 1 / difference)
+        previous, current = current, following
+        if column % 2 == 0: # Odd columns are auxiliary quantities
+            best = current[-1]
+    return best
+
+
+def _richardson(partials: List[Number]) -> Number:
+    '''Richardson extrapolation of partial sums taken at n, 2n, 4n, ... 
+    terms, assuming the error is a power series in 1/n (as for terms that 
+    are rational functions of k, like 1/k**2)'''
+    row = list(partials)
+    factor = 1
+    for _ in range(len(partials) - 1):
+        factor *= 2
+        row = [(factor * row[i + 1] - row[i]) / (factor - 1) 
+               for i in range(len(row) - 1)]
+    return row[-1]
+
+
+def _acceleratedSum(term: Callable[[int], Number], 
+                    tolerance: Number, 
+                    maxTerms: int, 
+                    levels: Optional[int]) -> Tuple[Number, Number, int, str]:
+    '''Sum to infinity of term(k), k = 1, 2, ... (floats or Decimals). The 
+    error estimate of a method is the larger of its last two changes (at 
+    least the rounding error of the sum), raised to the disagreement with 
+    any other method that also meets the tolerance'''
+    total = compensation = 0 * tolerance
+    partials = [] # Partial sums S_1 .. S_n
+    checkpoints = [] # S_16, S_32, S_64, ... for Richardson
+    previous: Dict[str, Number] = {} # Each method's estimate last round
+    changes: Dict[str, Number] = {} # And how much it changed then
+    envelopes = [] # Largest |term| since the last round, per round
+    best = None # (error, value, terms, method)
+    n, target = 0, 16
+    while True:
+        envelope = 0 * tolerance
+        while n < target:
+            n += 1
+            if n % CANCEL_CHECK_TERMS == 0:
+                _checkCancelled()
+            value = term(n)
+            envelope = max(envelope, abs(value))
+            t = total + value # Neumaier compensated summation
+            if abs(total) >= abs(value):
+                compensation += (total - t) + value
+            else:
+                compensation += (value - t) + total
+            total = t
+            partials.append(total + compensation)
+        envelopes.append(envelope)
+        checkpoints.append(partials[-1])
+        window = partials[-ACCELERATION_WINDOW:]
+        estimates = {"direct": partials[-1]}
+        for method, transform, values in (
+                ("aitken", _aitken, window), 
+                ("wynn", _wynnEpsilon, window), 
+                ("richardson", _richardson, checkpoints[-(levels or 0):])):
+            try:
+                estimates[method] = transform(values)
+            except (ZeroDivisionError, OverflowError, 
+                    decimal.InvalidOperation):
+                continue
+        epsilon = (Decimal(10) ** (1 - decimal.getcontext().prec) 
+                   if isinstance(total, Decimal) else sys.float_info.epsilon)
+        # Terms that do not shrink between rounds cannot sum to a limit
+        shrinking = len(envelopes) < 2 or envelopes[-1] < envelopes[-2]
+        errors = {}
+        for method, estimate in estimates.items():
+            if method not in previous or not _isFinite(estimate):
+                continue
+            change = abs(estimate - previous[method])
+            if method in changes:
+                errors[method] = max(change, changes[method], 
+                                     epsilon * abs(estimate))
+                if method == "direct": # The tail is at least the next term
+                    errors[method] = max(errors[method], envelope)
+            changes[method] = change
+        previous = estimates
+        if shrinking and errors:
+            method = min(errors, key=errors.get)
+            estimate = estimates[method]
+            error = max([errors[method]] 
+                        + [abs(estimates[other] - estimate) 
+                           for other in errors 
+                           if errors[other] <= tolerance 
+                           * abs(estimates[other])])
+            if best is None or error < best[0]:
+                best = (error, estimate, n, method)
+            if best[0] <= tolerance * abs(best[1]):
+                break
+        if n >= maxTerms:
+            if best is None or not shrinking:
+                raise Divergent("The terms do not tend to 0")
+            # Partial sums still moving as fast as the first terms did 
+            # (like those of 1/k) are taken as diverging
+            direct = [abs(checkpoints[i] - checkpoints[i - 1]) 
+                      for i in (-1, -2)]
+            if 100 * direct[0] >= 99 * direct[1]:
+                raise Divergent("The partial sums do not converge")
+            error, value, terms, method = best
+            raise NotConverged("The tolerance was not met", 
+                               (value, error, terms, method))
+        target *= 2
+    error, value, _, method = best
+    return value, error, n, method
+
+
+def _isFinite(value: Number) -> bool:
+    return value.is_finite() if isinstance(value, Decimal) else \
+           math.isfinite(value)
+
+
+def infiniteSum(seqType: int,
+                firstTerm: Union[str, Number],
+                commonDiffOrRatio: Union[str, Number],
+                mode: str = FLOAT,
+                context: Optional[decimal.Context] = None,
+                tolerance: Optional[Number] = None,
+                maxTerms: int = INFINITE_TERMS_LIMIT
+                ) -> Tuple[Number, Number, int, str]:
+    '''Sum to infinity, returned as (sum, error estimate, terms used, 
+    method), with method one of INFINITE_METHODS. Geometric series with 
+    |r| < 1 use the closed form a / (1 - r) and arithmetico-geometric ones 
+    a / (1 - r) + d * r / (1 - r) ** 2 (no terms, no error). Custom 
+    series stop once the error estimate is below tolerance relative to the 
+    sum (about 1e-13 in float mode and 1e-25 with the default decimal 
+    context). They are computed with the decimal context in exact mode, as 
+    their sums are irrational in general. Raises Divergent for diverging 
+    series, and NotConverged (holding the best estimate) when maxTerms 
+    terms do not meet the tolerance'''
+    if seqType not in (ARITHMETIC, GEOMETRIC, CUSTOM, ARITHMETICO_GEOMETRIC,
+                       POWER):
+        raise ValueError(f"Unknown series type: {seqType}")
+    if seqType == CUSTOM:
+        formula = compileFormula(str(firstTerm).strip())
+        if "n" in formula.names:
+            raise ValueError("A series to infinity has no number of terms")
+        if mode == EXACT: # Acceleration is not exact
+            mode = DECIMAL
+            commonDiffOrRatio = toNumber(commonDiffOrRatio, EXACT)
+            with decimal.localcontext(context or decimalContext):
+                commonDiffOrRatio = (Decimal(commonDiffOrRatio.numerator) 
+                                     / commonDiffOrRatio.denominator)
+    with _precision(mode, context):
+        if seqType == POWER:
+            toExponent(firstTerm)
+            raise Divergent("The terms do not tend to 0")
+        if seqType != CUSTOM:
+            # Arithmetic and geometric series are the r = 1 and d = 0 cases
+            # of the arithmetico-geometric series
+            first, second = _convertInputs(seqType, firstTerm, 
+                                           commonDiffOrRatio, mode)
+            zero = 0 * first
+            difference, ratio = ((second, 1) if seqType == ARITHMETIC else
+                                 (zero, second) if seqType == GEOMETRIC else
+                                 second)
+            if first == 0 and difference == 0:
+                return zero, zero, 0, "closed form"
+            if abs(ratio) < 1:
+                return (_finite(first / (1 - ratio) 
+                                + difference * ratio / (1 - ratio) ** 2), 
+                        zero, 0, "closed form")
+            raise Divergent("The terms do not tend to 0")
+        second = toNumber(commonDiffOrRatio, mode)
+        if tolerance is None:
+            tolerance = (1e-13 if mode == FLOAT else 
+                         Decimal(10) ** (25 - decimal.getcontext().prec))
+        function = formula.function(mode)
+        number = float if mode == FLOAT else Decimal
+        try:
+            return _acceleratedSum(
+                        lambda k: function(number(k), second, None), 
+                        tolerance, maxTerms, 
+                        RICHARDSON_LEVELS if mode == FLOAT else None)
+        except (ZeroDivisionError, decimal.InvalidOperation) as error:
+            raise ValueError(f"Term could not be evaluated: {error!r}"
+                             ) from None
+        except decimal.Overflow:
+            raise OverflowError("Decimal exponent limit exceeded") from None
+
+
+def evaluateInfinite(seqType: int,
+                     firstTerm: Union[str, Number],
+                     commonDiffOrRatio: Union[str, Number],
+                     mode: str = FLOAT,
+                     context: Optional[decimal.Context] = None
+                     ) -> Tuple[Optional[Tuple[Number, Number, int, str]], 
+                                int]:
+    '''infiniteSum returning (result, errorCode) instead of raising'''
+    try:
+        return infiniteSum(seqType, firstTerm, commonDiffOrRatio, mode, 
+                           context), NO_ERROR
+    except Divergent:
+        return None, DIVERGENT_ERROR
+    except NotConverged:
+        return None, NOT_CONVERGED_ERROR
+    except (ValueError, TypeError):
+        return None, VALUE_ERROR
+    except OverflowError:
+        return None, OVERFLOW_ERROR
+
+
+# Arithmetico-geometric series, terms (a + k * d) * r ** k for k = 0 .. n - 1,
+# and power sums 1 ** p + 2 ** p + ... + n ** p. Both have closed forms, the
+# latter through Faulhaber's formula with Bernoulli numbers, so their cost 
+# does not grow with the number of terms
+POWER_EXPONENT_LIMIT = 2000 # Faulhaber's formula needs p + 1 Bernoulli 
+                            # numbers, larger exponents take seconds to 
+                            # tabulate (smaller n are summed directly)
+
+_bernoulli: Tuple[Fraction, ...] = (Fraction(1),)
+_bernoulliLock = threading.Lock()
+
+
+def _bernoulliTable(size: int) -> Tuple[Fraction, ...]:
+    '''Bernoulli numbers B_0 .. B_(size - 1), with B_1 = +1/2. The even ones
+    come from the tangent numbers, computed with integers only by Brent and 
+    Harvey's algorithm in O(size ** 2) operations'''
+    half = (size - 1) // 2
+    tangent = [0, 1] + [0] * (half - 1)
+    for k in range(2, half + 1):
+        tangent[k] = (k - 1) * tangent[k - 1]
+    for k in range(2, half + 1):
+        if k % 64 == 0: # A row costs up to half big integer products
+            _checkCancelled()
+        for j in range(k, half + 1):
+            tangent[j] = (j - k) * tangent[j - 1] + (j - k + 2) * tangent[j]
+    table = [Fraction(0)] * size
+    table[0] = Fraction(1)
+    if size > 1:
+        table[1] = Fraction(1, 2)
+    for k in range(1, half + 1):
+        table[2 * k] = Fraction((-1) ** (k - 1) * 2 * k * tangent[k], 
+                                4 ** k * (4 ** k - 1))
+    return tuple(table)
+
+
+def bernoulliNumbers(count: int) -> Tuple[Fraction, ...]:
+    '''The first count Bernoulli numbers (B_1 = +1/2). The table is cached 
+    and grown by at least doubling, so repeated calls are free'''
+    global _bernoulli
+    with _bernoulliLock:
+        if len(_bernoulli) < count:
+            _bernoulli = _bernoulliTable(max(count, 2 * len(_bernoulli)))
+        return _bernoulli[:count]
+
+
+@functools.lru_cache(maxsize=64)
+def _faulhaber(exponent: int) -> Tuple[Tuple[int, ...], int]:
+    '''Integer coefficients c_0 .. c_p and denominator D such that 
+    1 ** p + ... + n ** p = (c_0 * n ** (p + 1) + ... + c_p * n) / D'''
+    bernoulli = bernoulliNumbers(exponent + 1)
+    terms = [math.comb(exponent + 1, j) * bernoulli[j] 
+             for j in range(exponent + 1)]
+    common = math.lcm(*(term.denominator for term in terms))
+    return (tuple(int(term * common) for term in terms), 
+            common * (exponent + 1))
+
+
+def _toInteger(value: Union[str, Number]) -> int:
+    '''Convert a string or number with an integer value into an int 
+    (raises ValueError)'''
+    number = Fraction(value.strip() if isinstance(value, str) else value)
+    if number.denominator != 1:
+        raise ValueError(f"Invalid integer: {value!r}")
+    return int(number)
+
+
+def toExponent(value: Union[str, Number]) -> int:
+    '''The exponent of a power sum, a whole number of 0 or more (raises 
+    ValueError)'''
+    exponent = _toInteger(value)
+    if exponent < 0:
+        raise ValueError(f"Invalid exponent: {value!r}")
+    return exponent
+
+
+def powerSum(exponent: int, numberOfTerms: int) -> int:
+    '''1 ** p + 2 ** p + ... + n ** p as an exact integer, evaluated with 
+    Faulhaber's formula in O(p) integer operations (directly when n <= p + 1,
+    which is cheaper)'''
+    if numberOfTerms <= 0:
+        raise InvalidNumberOfTerms(numberOfTerms)
+    if exponent < 0:
+        raise ValueError(f"Invalid exponent: {exponent}")
+    if (exponent + 1) * numberOfTerms.bit_length() > EXACT_BITS_LIMIT:
+        raise OverflowError(f"Exact power sum too large: {exponent}")
+    if numberOfTerms <= exponent + 1:
+        return sum(k ** exponent for k in range(1, numberOfTerms + 1))
+    if exponent > POWER_EXPONENT_LIMIT:
+        raise OverflowError(f"Exponent too large: {exponent}")
+    coefficients, denominator = _faulhaber(exponent)
+    total = 0
+    for coefficient in coefficients: # Horner's rule
+        total = total * numberOfTerms + coefficient
+    return total * numberOfTerms // denominator
+
+
+def powerSeriesSum(exponent: Union[str, Number],
+                   numberOfTerms: int,
+                   mode: str = FLOAT,
+                   context: Optional[decimal.Context] = None) -> Number:
+    '''1 ** p + 2 ** p + ... + n ** p in a precision mode. The sum is always 
+    computed exactly (see powerSum) and rounded once, so float and decimal 
+    results are correctly rounded'''
+    with _precision(mode, context):
+        total = powerSum(toExponent(exponent), numberOfTerms)
+        if mode == FLOAT:
+            return float(total) # Raises OverflowError when out of range
+        if mode == EXACT:
+            return Fraction(total)
+        try:
+            return +Decimal(total) # Unary plus rounds to the context
+        except decimal.Overflow:
+            raise OverflowError("Decimal exponent limit exceeded") from None
+
+
+def _weightedGeometric(commonRatio: float, numberOfTerms: int) -> float:
+    '''0 * r ** 0 + 1 * r ** 1 + ... + (n - 1) * r ** (n - 1) in float 
+    arithmetic, for r != 1. The closed form cancels near r = 1 like the one 
+    of geometricFactor, so for |n * (r - 1)| < 1 the sum is expanded in 
+    powers of x = log(r) instead: the sum over m of x ** m / m! times the 
+    exact power sum 1 ** (m + 1) + ... + (n - 1) ** (m + 1). Further out the
+    closed form is written in terms of r - 1'''
+    last = numberOfTerms - 1
+    if last == 0:
+        return 0.0
+    delta = commonRatio - 1
+    if abs(delta * numberOfTerms) < 1:
+        # Scaled by last ** (m + 2) so that no intermediate overflows
+        scaled = math.log1p(delta) * last
+        factor = total = 0.0
+        for m in range(64):
+            factor = 1.0 if m == 0 else factor * scaled / m
+            term = factor * (powerSum(m + 1, last) / last ** (m + 2))
+            total += term
+            if abs(term) <= 1e-17 * abs(total):
+                break
+        return total * last * last
+    # r - n * r ** n + (n - 1) * r ** (n + 1) regrouped around r - 1 (exact
+    # for r near 1), so that the terms of size n * r ** n do not cancel
+    return ((commonRatio 
+             + commonRatio ** numberOfTerms * (last * delta - 1)) 
+            / (delta * delta))
+
+
+def arithmeticoGeometricSum(firstTerm: Number,
+                            commonDifference: Number,
+                            commonRatio: Number,
+                            numberOfTerms: int,
+                            mode: str = FLOAT,
+                            context: Optional[decimal.Context] = None
+                            ) -> Number:
+    '''Sum of (a + k * d) * r ** k for k = 0 .. n - 1, from the closed form
+    a * (1 - r ** n) / (1 - r) 
+    + d * (r - n * r ** n + (n - 1) * r ** (n + 1)) / (1 - r) ** 2'''
+    if numberOfTerms <= 0:
+        raise InvalidNumberOfTerms(numberOfTerms)
+    if mode == FLOAT:
+        if commonRatio == 1:
+            return arithmeticSum(firstTerm, commonDifference, numberOfTerms)
+        return _finite(firstTerm * geometricFactor(commonRatio, numberOfTerms)
+                       + commonDifference 
+                       * _weightedGeometric(commonRatio, numberOfTerms))
+    with _precision(mode, context):
+        firstTerm = toNumber(firstTerm, mode)
+        commonDifference = toNumber(commonDifference, mode)
+        commonRatio = toNumber(commonRatio, mode)
+        if commonRatio == 1:
+            return arithmeticSum(firstTerm, commonDifference, numberOfTerms, 
+                                 mode, context)
+        try:
+            power = _power(commonRatio, numberOfTerms, mode)
+            return (firstTerm * (1 - power) / (1 - commonRatio)
+                    + commonDifference 
+                    * (commonRatio - numberOfTerms * power 
+                       + (numberOfTerms - 1) * power * commonRatio)
+                    / (1 - commonRatio) ** 2)
+        except decimal.Overflow:
+            raise OverflowError("Decimal exponent limit exceeded") from None
+
+
+# Sums modulo m of series with integer inputs, for hashing and cryptography.
+# Each closed form above is numerator / denominator with a denominator that 
+# divides the numerator exactly, so the numerator is computed modulo 
+# m * denominator and then divided exactly. This needs no modular inverse 
+# (1 - r and m need not be coprime), and the powers are computed by pow's 
+# square-and-multiply in O(log n), so n = 10 ** 18 takes microseconds
+
+
+def _modularPowerSum(exponent: int, numberOfTerms: int, modulus: int) -> int:
+    if numberOfTerms <= min(exponent + 1, POWER_EXPONENT_LIMIT):
+        return sum(pow(k, exponent, modulus) 
+                   for k in range(1, numberOfTerms + 1)) % modulus
+    if exponent > POWER_EXPONENT_LIMIT:
+        raise OverflowError(f"Exponent too large: {exponent}")
+    coefficients, denominator = _faulhaber(exponent)
+    scaled = modulus * denominator
+    total = 0
+    for coefficient in coefficients: # Horner's rule modulo m * D
+        total = (total * numberOfTerms + coefficient) % scaled
+    return total * numberOfTerms % scaled // denominator
+
+
+def modularSum(seqType: int,
+               firstTerm: Union[str, Number],
+               commonDiffOrRatio: Any,
+               numberOfTerms: int,
+               modulus: Union[str, Number]) -> int:
+    '''Sum of a series with integer inputs modulo m, in 0 .. m - 1. Takes 
+    the same arguments as seriesSum (custom series are not supported) with 
+    the modulus in place of the precision mode. Raises 
+    InvalidNumberOfTerms, ValueError (inputs that are not integers, m < 1) 
+    or OverflowError'''
+    modulus = _toInteger(modulus)
+    if modulus < 1:
+        raise ValueError(f"Invalid modulus: {modulus}")
+    n = _toInteger(numberOfTerms)
+    if n <= 0:
+        raise InvalidNumberOfTerms(n)
+    if seqType == POWER:
+        return _modularPowerSum(toExponent(firstTerm), n, modulus)
+    if seqType not in (ARITHMETIC, GEOMETRIC, ARITHMETICO_GEOMETRIC):
+        raise ValueError(f"Unknown series type: {seqType}")
+    a = _toInteger(firstTerm)
+    if seqType == ARITHMETIC:
+        d, r = _toInteger(commonDiffOrRatio), 1
+    elif seqType == GEOMETRIC:
+        d, r = 0, _toInteger(commonDiffOrRatio)
+    else:
+        d, r = (_toInteger(value) for value in commonDiffOrRatio)
+    r %= modulus # The terms, and so the sum, only depend on r modulo m
+    if r == 1 % modulus: # Arithmetic (with m = 1 every sum is 0)
+        return n * (2 * a + (n - 1) * d) // 2 % modulus
+    # (1 - r) ** 2 * S = a * (1 - r ** n) * (1 - r) 
+    #                    + d * (r - n * r ** n + (n - 1) * r ** (n + 1))
+    divisor = (1 - r) ** 2
+    scaled = modulus * divisor
+    power = pow(r, n, scaled)
+    numerator = (a * (1 - power) * (1 - r) 
+                 + d * (r - n * power + (n - 1) * power * r)) % scaled
+    return numerator // divisor
+
+
+def evaluateModular(seqType: int,
+                    firstTerm: Union[str, Number],
+                    commonDiffOrRatio: Any,
+                    numberOfTerms: int,
+                    modulus: Union[str, Number]
+                    ) -> Tuple[Optional[int], int]:
+    '''modularSum returning (sum, errorCode) instead of raising'''
+    try:
+        return modularSum(seqType, firstTerm, commonDiffOrRatio, 
+                          numberOfTerms, modulus), NO_ERROR
+    except InvalidNumberOfTerms:
+        return None, TERMS_ERROR
+    except (ValueError, TypeError):
+        return None, VALUE_ERROR
+    except OverflowError:
+        return None, OVERFLOW_ERROR
+
+
+def batchModularSum(seqType: int,
+                    triples: Iterable[Tuple[Any, Any, int]],
+                    modulus: Union[str, Number]
+                    ) -> Tuple[List[Optional[int]], List[int]]:
+    '''Evaluate many triples of the same series type modulo m, like 
+    batchSum. Returns a list of sums and a parallel list of error codes'''
+    if seqType not in (ARITHMETIC, GEOMETRIC, ARITHMETICO_GEOMETRIC, POWER):
+        raise ValueError(f"Unknown series type: {seqType}")
+    results = [evaluateModular(seqType, *triple, modulus) 
+               for triple in triples]
+    return [r[0] for r in results], [r[1] for r in results]
@@ -0,0 +1,37 @@
+''' Exact references shared by the engine tests '''
+
+import decimal
+from decimal import Decimal
+from fractions import Fraction
+
+import seriesengine as engine
+from seriesengine import DECIMAL, EXACT, FLOAT
+
+
+def exact(value):
+    return Fraction(value)
+
+
+def agree(result, reference, mode):
+    '''result of a precision mode is reference, up to rounding'''
+    if mode == EXACT:
+        return result == reference
+    tolerance = 1e-12 if mode == FLOAT else Fraction(1, 10 ** 40)
+    error = abs(Fraction(result) - reference)
+    return error <= tolerance * max(abs(reference), 1)
+
+
+def modeInput(value, mode):
+    '''Decimal cannot parse "1/3", pass it rounded instead'''
+    if mode == DECIMAL and "/" in value:
+        with decimal.localcontext(engine.decimalContext):
+            return Decimal(exact(value).numerator) / exact(value).denominator
+    return value
+
+
+def arithmeticTerms(a, d, n):
+    return [a + k * d for k in range(n)]
+
+
+def geometricTerms(a, r, n):
+    return [a * r ** k for k in range(n)]
@@ -0,0 +1,48 @@
+''' batchSum gives the same results and error codes as evaluating the rows 
+one by one, and so do the vectorized kernels for float columns '''
+
+import math
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import ARITHMETIC, GEOMETRIC
+
+# Finite inputs, including sums beyond the float range
+FLOAT_ROWS = [(1.0, 2.0, 10), (3.0, 0.5, 4), (1.0, 2.0, 0), (1e308, 1e308, 10),
+              (-1e308, -1e308, 10), (2.0, 10.0, 400), (-1.0, -10.0, 401), 
+              (1e300, 1.0, 10 ** 9), (1.0, 1.0 + 1e-9, 1000)]
+
+
+@pytest.mark.parametrize("mode", engine.PRECISION_MODES)
+def test_batchSumMatchesEvaluate(mode):
+    triples = [("1", "2", 10), ("3", "0.5", 4), ("1", "2", 0), ("x", "1", 3)]
+    sums, codes = engine.batchSum(GEOMETRIC, triples, mode)
+    cached = engine.batchSum(GEOMETRIC, triples, mode, 
+                             cache=engine.SumCache(8))
+    for triple, result, code in zip(triples, sums, codes):
+        assert engine.evaluate(GEOMETRIC, *triple, mode) == (result, code) \
+            or mode == engine.FLOAT # Float batches take numbers, not text
+    assert cached[1] == [engine.NO_ERROR, engine.NO_ERROR, 
+                         engine.TERMS_ERROR, engine.VALUE_ERROR]
+
+
+@pytest.mark.parametrize("seqType", [ARITHMETIC, GEOMETRIC])
+def test_floatOverflowIsReportedEverywhere(seqType):
+    sums, codes = engine.batchSum(seqType, FLOAT_ROWS)
+    for row, result, code in zip(FLOAT_ROWS, sums, codes):
+        assert engine.evaluate(seqType, *row) == (result, code)
+        assert result is None or math.isfinite(result)
+    assert engine.OVERFLOW_ERROR in codes
+
+
+@pytest.mark.parametrize("seqType", [ARITHMETIC, GEOMETRIC])
+def test_scalarAndVectorOverflowAgree(seqType):
+    np = pytest.importorskip("numpy")
+    first, second, n = (np.array(column) for column in zip(*FLOAT_ROWS))
+    sums, codes = engine.vectorSum(seqType, first, second, n)
+    scalarSums, scalarCodes = engine.batchSum(seqType, FLOAT_ROWS)
+    assert list(codes) == scalarCodes
+    for vector, scalar in zip(sums, scalarSums):
+        if scalar is not None:
+            assert math.isclose(vector, scalar, rel_tol=1e-12)
@@ -0,0 +1,47 @@
+''' Calculations inside seriesengine.cancellable stop once cancelled '''
+
+import threading
+import time
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import CUSTOM, DECIMAL, EXACT
+
+
+def test_cancellableEvent():
+    event = threading.Event()
+    with engine.cancellable(event):
+        assert engine.formulaSum("k", 0, 5000, DECIMAL) == 5000 * 5001 / 2
+        event.set()
+        with pytest.raises(engine.Cancelled):
+            engine.formulaSum("k", 0, 5000, EXACT)
+        with pytest.raises(engine.Cancelled):
+            engine.infiniteSum(CUSTOM, "1/k**2", 0, DECIMAL)
+    # Only calculations inside the block are cancelled
+    assert engine.formulaSum("k", 0, 5000, EXACT) == 5000 * 5001 // 2
+
+
+def test_cancellableDeadline():
+    with engine.cancellable(threading.Event(), time.monotonic() - 1):
+        with pytest.raises(engine.Cancelled):
+            engine.formulaSum("1/k", 0, 5000, DECIMAL)
+
+
+def test_cancellableFromAnotherThread():
+    event = threading.Event()
+    outcome = []
+
+    def run():
+        with engine.cancellable(event):
+            try:
+                engine.formulaSum("1/k", 0, 10 ** 9, EXACT)
+            except engine.Cancelled:
+                outcome.append("cancelled")
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.05)
+    event.set()
+    thread.join(5)
+    assert not thread.is_alive() and outcome == ["cancelled"]
@@ -0,0 +1,71 @@
+''' Arithmetico-geometric and power sums against brute force '''
+
+import decimal
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import ARITHMETICO_GEOMETRIC, DECIMAL, EXACT, FLOAT, POWER
+
+from helpers import agree, exact
+
+
+@pytest.mark.parametrize("mode", engine.PRECISION_MODES)
+@pytest.mark.parametrize("a, d, r, n", [("1", "2", "3", 10), 
+                                        ("2", "-1", "0.5", 20), 
+                                        ("1", "1", "1", 5), 
+                                        ("3", "2", "-2", 7),
+                                        ("0.5", "0.25", "1.5", 1)])
+def test_arithmeticoGeometricSum(a, d, r, n, mode):
+    reference = sum((exact(a) + k * exact(d)) * exact(r) ** k 
+                    for k in range(n))
+    if mode == FLOAT: # The float paths take numbers
+        a, d, r = float(a), float(d), float(r)
+    assert agree(engine.seriesSum(ARITHMETICO_GEOMETRIC, a, (d, r), n, mode),
+                 reference, mode)
+
+
+@pytest.mark.parametrize("x", [-30, -3, -1.01, -0.5, 0.5, 1.01, 3, 30])
+def test_arithmeticoGeometricNearOne(x):
+    # r = 1 + x / n, where the closed form cancels. Exact references for 
+    # n = 10 ** 4, and 100 digit ones for n = 10 ** 9
+    n = 10 ** 4
+    r = 1 + x / n
+    reference = engine.arithmeticoGeometricSum(0, 1, Fraction(r), n, EXACT)
+    assert agree(engine.arithmeticoGeometricSum(0.0, 1.0, r, n), reference, 
+                 FLOAT)
+    n = 10 ** 9
+    r = 1 + x / n
+    context = decimal.Context(prec=100, Emax=10 ** 6, Emin=-10 ** 6)
+    reference = engine.arithmeticoGeometricSum(0, 1, Decimal(r), n, DECIMAL, 
+                                               context)
+    assert agree(engine.arithmeticoGeometricSum(0.0, 1.0, r, n), 
+                 Fraction(reference), FLOAT)
+
+
+@pytest.mark.parametrize("p", range(0, 25))
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 40, 100])
+def test_powerSum(p, n):
+    reference = sum(k ** p for k in range(1, n + 1))
+    assert engine.powerSum(p, n) == reference
+    for mode in engine.PRECISION_MODES:
+        assert agree(engine.seriesSum(POWER, p, None, n, mode), reference, 
+                     mode)
+
+
+def test_bernoulliNumbers():
+    # B_m = -(1 / (m + 1)) * sum of C(m + 1, j) * B_j for j < m
+    reference = [Fraction(1)]
+    for m in range(1, 40):
+        reference.append(-sum(math.comb(m + 1, j) * reference[j] 
+                              for j in range(m)) / (m + 1))
+    reference[1] = Fraction(1, 2) # The convention used by Faulhaber's sums
+    assert list(engine.bernoulliNumbers(40)) == reference
+
+
+def test_powerSumHugeN():
+    n = 10 ** 18
+    assert engine.powerSum(3, n) == (n * (n + 1) // 2) ** 2
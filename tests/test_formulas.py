@@ -0,0 +1,54 @@
+''' Custom term formulas: sums against brute force, and the sandbox '''
+
+from fractions import Fraction
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import CUSTOM, EXACT
+
+from helpers import agree
+
+
+@pytest.mark.parametrize("mode", engine.PRECISION_MODES)
+@pytest.mark.parametrize("formula, terms", [
+    ("1/k**2", lambda k, r: Fraction(1, k ** 2)),
+    ("k*r**k", lambda k, r: k * r ** k),
+    ("(-1)^k * (k // 2) + k % 3", lambda k, r: (-1) ** k * (k // 2) + k % 3),
+    ("abs(r - k) + floor(k / 3)", lambda k, r: abs(r - k) + k // 3),
+])
+def test_formulaSum(formula, terms, mode):
+    r = Fraction(1, 2)
+    reference = sum(terms(k, r) for k in range(1, 31))
+    assert agree(engine.seriesSum(CUSTOM, formula, "0.5", 30, mode), 
+                 reference, mode)
+
+
+@pytest.mark.parametrize("formula", [
+    "__import__('os')",
+    "k.__class__",
+    "().__class__",
+    "[k for k in range(10)]",
+    "lambda: 1",
+    "open('x')",
+    "sqrt(k, 2)",
+    "sqrt(x=k)",
+    "eval('1')",
+    "'text'",
+    "k if k else 1",
+    "k < 1",
+    "k; 1",
+    "x",
+    "k" * (engine.FORMULA_LENGTH_LIMIT + 1),
+])
+def test_formulaSandboxRejects(formula):
+    with pytest.raises(ValueError):
+        engine.compileFormula(formula)
+
+
+def test_formulaModeRestrictions():
+    with pytest.raises(ValueError): # No irrational functions when exact
+        engine.formulaSum("sin(k)", 0, 3, EXACT)
+    with pytest.raises(ValueError):
+        engine.formulaSum("k**0.5", 0, 3, EXACT)
+    assert engine.evaluate(CUSTOM, "1/(k-2)", 0, 3)[1] == engine.VALUE_ERROR
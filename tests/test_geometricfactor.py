@@ -0,0 +1,19 @@
+''' Float geometric sums with a ratio close to 1 against exact references '''
+
+from fractions import Fraction
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import EXACT, FLOAT
+
+from helpers import agree
+
+
+@pytest.mark.parametrize("ratio", [1 + 1e-9, 1 - 1e-7, 1.0001, 0.99, -1.0])
+@pytest.mark.parametrize("n", [1, 2, 50, 1000])
+def test_geometricFactorNearOne(ratio, n):
+    # The exact closed form is checked against brute force in 
+    # test_seriesengine.py
+    reference = engine.geometricSum(1, Fraction(ratio), n, EXACT)
+    assert agree(engine.geometricFactor(ratio, n), reference, FLOAT)
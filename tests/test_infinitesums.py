@@ -0,0 +1,73 @@
+''' Sums to infinity against known constants: the error estimate bounds the 
+actual error, and slow or diverging series are reported '''
+
+import decimal
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import (
+    ARITHMETICO_GEOMETRIC,
+    CUSTOM,
+    DECIMAL,
+    EXACT,
+    FLOAT,
+    GEOMETRIC,
+    POWER,
+)
+
+
+def _decimalConstants():
+    with decimal.localcontext(engine.decimalContext):
+        pi = engine._decimalPi()
+        return {"1/k**2": pi ** 2 / 6,
+                "1/k**3": Decimal("1.2020569031595942853997381615114499907"
+                                  "649862923405"),
+                "1/k**4": pi ** 4 / 90,
+                "1/(k*(k+1))": Decimal(1),
+                "(-1)^(k+1)/k": Decimal(2).ln(),
+                "(-1)^(k+1)/(2*k-1)": pi / 4,
+                "(-1)^(k+1)/k**2": pi ** 2 / 12,
+                "0.9^k": Decimal(9)}
+
+
+@pytest.mark.parametrize("mode", [FLOAT, DECIMAL])
+@pytest.mark.parametrize("formula", list(_decimalConstants()))
+def test_infiniteSumKnownValues(formula, mode):
+    value, error, terms, method = engine.infiniteSum(CUSTOM, formula, 0, 
+                                                     mode)
+    exactValue = _decimalConstants()[formula]
+    actual = abs(Fraction(value) - Fraction(exactValue))
+    assert actual <= Fraction(error) # The estimate is an upper bound
+    tolerance = 1e-13 if mode == FLOAT else Fraction(1, 10 ** 25)
+    assert Fraction(error) <= tolerance * abs(Fraction(value))
+    assert 0 < terms <= engine.INFINITE_TERMS_LIMIT
+
+
+@pytest.mark.parametrize("formula", ["1/k**1.5", "1/k**1.1"])
+def test_infiniteSumSlowSeriesNotConverged(formula):
+    with pytest.raises(engine.NotConverged) as raised:
+        engine.infiniteSum(CUSTOM, formula, 0)
+    value, error, terms, method = raised.value.estimate
+    assert error > 1e-13 * abs(value)
+    assert engine.evaluateInfinite(CUSTOM, formula, 0) == \
+           (None, engine.NOT_CONVERGED_ERROR)
+
+
+@pytest.mark.parametrize("formula", ["1/k", "1", "(-1)^k", "k"])
+def test_infiniteSumDivergent(formula):
+    assert engine.evaluateInfinite(CUSTOM, formula, 0) == \
+           (None, engine.DIVERGENT_ERROR)
+
+
+def test_infiniteSumClosedForms():
+    assert engine.infiniteSum(GEOMETRIC, 1, 0.5) == (2.0, 0.0, 0, 
+                                                     "closed form")
+    assert engine.infiniteSum(ARITHMETICO_GEOMETRIC, 1, (1, 0.5), 
+                              EXACT)[0] == 4
+    assert engine.evaluateInfinite(GEOMETRIC, 1, 2)[1] == \
+           engine.DIVERGENT_ERROR
+    assert engine.evaluateInfinite(POWER, 2, None)[1] == \
+           engine.DIVERGENT_ERROR
@@ -0,0 +1,47 @@
+''' Streamed terms and partial sums against brute force '''
+
+from fractions import Fraction
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import ARITHMETIC, FLOAT, GEOMETRIC
+
+from helpers import agree, arithmeticTerms, exact, geometricTerms
+
+
+@pytest.mark.parametrize("mode", engine.PRECISION_MODES)
+@pytest.mark.parametrize("seqType", [ARITHMETIC, GEOMETRIC])
+@pytest.mark.parametrize("first, second", [("1", "2"), ("-2", "0.5"), 
+                                           ("3", "-1.5")])
+def test_iterTermsAndPartialSums(first, second, seqType, mode):
+    a, b = exact(first), exact(second)
+    terms = (arithmeticTerms if seqType == ARITHMETIC else geometricTerms)(
+                                                                    a, b, 12)
+    if mode == FLOAT:
+        first, second = float(a), float(b)
+    streamed = list(engine.iterTerms(seqType, first, second, 12, 3, 
+                                     mode=mode))
+    assert all(agree(t, r, mode) for t, r in zip(streamed, terms[3:]))
+    partials = list(engine.iterPartialSums(seqType, first, second, 12, 3, 
+                                           mode=mode))
+    assert all(agree(s, sum(terms[:k + 1]), mode) 
+               for k, s in zip(range(3, 12), partials))
+
+
+def test_iterTermsDoesNotDrift():
+    ratio = 1.0000001
+    n = 200000
+    *_, last = engine.iterTerms(GEOMETRIC, 1.0, ratio, n)
+    reference = Fraction(ratio) ** (n - 1)
+    assert abs(Fraction(last) - reference) <= 1e-15 * reference
+    # Streaming from start gives the same terms
+    assert next(engine.iterTerms(GEOMETRIC, 1.0, ratio, n, n - 1)) == last
+
+
+def test_iterBlocks():
+    pytest.importorskip("numpy")
+    blocks = engine.iterBlocks(ARITHMETIC, 1, 1, 10, 2, blockSize=4, 
+                               partialSums=True)
+    assert [block.tolist() for block in blocks] == [[6, 10, 15, 21], 
+                                                    [28, 36, 45, 55]]
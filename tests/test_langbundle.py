@@ -0,0 +1,94 @@
+''' The translation bundle is built when missing and rebuilt when the
+translations directory it was built from changes '''
+
+import json
+import os
+import threading
+
+import langbundle
+
+LANGUAGE = {"entries": ["First Term", "Common Difference", "Common Ratio",
+                        "Number of Terms"],
+            "fontsize": ["Font Size", "Small", "Medium", "Large", "Scale"],
+            "appearance": ["Appearance", "Theme", "Light", "Dark", "System",
+                           "Blue", "Green", "Dark Blue"]}
+
+
+def writeLanguage(translationsPath, lang, title):
+    langDb = dict(LANGUAGE, title=[title])
+    with open(os.path.join(translationsPath, f"{lang}.json"), "w") as f:
+        json.dump(langDb, f)
+
+
+def makeStale(translationsPath):
+    # Directory timestamps can be coarse, move it on explicitly
+    stamp = langbundle.directoryStamp(str(translationsPath)) + 10**9
+    os.utime(translationsPath, ns=(stamp, stamp))
+
+
+def joinRebuilds():
+    for thread in threading.enumerate():
+        if thread.name == "bundle rebuild":
+            thread.join()
+
+
+def test_openBundleBuildsAndRebuilds(tmp_path):
+    translationsPath = tmp_path / "translations"
+    translationsPath.mkdir()
+    bundlePath = str(tmp_path / langbundle.BUNDLE_NAME)
+    writeLanguage(translationsPath, "English", "Summing Series")
+
+    bundle = langbundle.openBundle(str(translationsPath), bundlePath)
+    assert bundle.languages() == ["English"]
+    assert bundle.read("English")["title"] == ["Summing Series"]
+    assert bundle.isCurrent(str(translationsPath))
+    bundle.close()
+
+    # An added file makes the bundle stale
+    writeLanguage(translationsPath, "English", "Series Sums, edited")
+    writeLanguage(translationsPath, "Spanish", "Suma de Series")
+    makeStale(translationsPath)
+    stale = langbundle.LangBundle(bundlePath)
+    assert not stale.isCurrent(str(translationsPath))
+    stale.close()
+    bundle = langbundle.openBundle(str(translationsPath), bundlePath)
+    assert bundle.languages() == ["English", "Spanish"]
+    assert bundle.read("English")["title"] == ["Series Sums, edited"]
+    bundle.close()
+
+
+def test_openBundleRebuildsInBackground(tmp_path):
+    translationsPath = tmp_path / "translations"
+    translationsPath.mkdir()
+    bundlePath = str(tmp_path / langbundle.BUNDLE_NAME)
+    writeLanguage(translationsPath, "English", "Summing Series")
+
+    # Missing: nothing is built on the calling thread
+    assert langbundle.openBundle(str(translationsPath), bundlePath,
+                                 background=True) is None
+    joinRebuilds()
+    bundle = langbundle.openBundle(str(translationsPath), bundlePath,
+                                   background=True)
+    assert bundle.languages() == ["English"]
+    bundle.close()
+
+    writeLanguage(translationsPath, "Spanish", "Suma de Series")
+    makeStale(translationsPath)
+    assert langbundle.openBundle(str(translationsPath), bundlePath,
+                                 background=True) is None
+    joinRebuilds()
+    bundle = langbundle.LangBundle(bundlePath)
+    assert bundle.isCurrent(str(translationsPath))
+    assert bundle.languages() == ["English", "Spanish"]
+    bundle.close()
+
+
+def test_openBundleReplacesCorruptedBundle(tmp_path):
+    translationsPath = tmp_path / "translations"
+    translationsPath.mkdir()
+    bundlePath = tmp_path / langbundle.BUNDLE_NAME
+    writeLanguage(translationsPath, "English", "Summing Series")
+    bundlePath.write_bytes(b"SSBUNDLE2\n")
+    bundle = langbundle.openBundle(str(translationsPath), str(bundlePath))
+    assert "English" in bundle
+    bundle.close()
@@ -0,0 +1,40 @@
+''' Modular sums against brute force sums reduced modulo m '''
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import (
+    ARITHMETIC,
+    ARITHMETICO_GEOMETRIC,
+    CUSTOM,
+    GEOMETRIC,
+    POWER,
+)
+
+from helpers import arithmeticTerms, geometricTerms
+
+
+@pytest.mark.parametrize("modulus", [1, 2, 6, 7, 97, 360, 10 ** 9 + 7])
+@pytest.mark.parametrize("a, d, r", [(3, 2, 5), (-4, 1, -3), (7, -5, 1), 
+                                     (1, 0, 0), (2, 3, 13)])
+@pytest.mark.parametrize("n", [1, 2, 5, 31])
+def test_modularSum(a, d, r, n, modulus):
+    assert engine.modularSum(ARITHMETIC, a, d, n, modulus) == \
+           sum(arithmeticTerms(a, d, n)) % modulus
+    assert engine.modularSum(GEOMETRIC, a, r, n, modulus) == \
+           sum(geometricTerms(a, r, n)) % modulus
+    assert engine.modularSum(ARITHMETICO_GEOMETRIC, a, (d, r), n, modulus) \
+           == sum((a + k * d) * r ** k for k in range(n)) % modulus
+    assert engine.modularSum(POWER, abs(d) + 2, None, n, modulus) == \
+           sum(k ** (abs(d) + 2) for k in range(1, n + 1)) % modulus
+
+
+def test_modularSumErrors():
+    assert engine.evaluateModular(GEOMETRIC, 1, 2, 0, 5)[1] == \
+           engine.TERMS_ERROR
+    assert engine.evaluateModular(GEOMETRIC, 1.5, 2, 3, 5)[1] == \
+           engine.VALUE_ERROR
+    assert engine.evaluateModular(GEOMETRIC, 1, 2, 3, 0)[1] == \
+           engine.VALUE_ERROR
+    assert engine.evaluateModular(CUSTOM, "k", 0, 3, 5)[1] == \
+           engine.VALUE_ERROR
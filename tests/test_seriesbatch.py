@@ -0,0 +1,14 @@
+''' The batch mode's command line rejects invalid options before reading 
+any input '''
+
+import pytest
+
+import seriesbatch
+
+
+@pytest.mark.parametrize("chunkSize", ["0", "-5"])
+def test_chunkSizeBelowOneIsRejected(chunkSize, capsys):
+    with pytest.raises(SystemExit) as exit:
+        seriesbatch.main(["--chunk-size", chunkSize, "missing.csv"])
+    assert exit.value.code == 2
+    assert "--chunk-size must be at least 1" in capsys.readouterr().err
@@ -0,0 +1,34 @@
+''' Arithmetic and geometric sums of seriesengine checked against brute 
+force sums of the terms on small inputs, in every precision mode '''
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import ARITHMETIC, FLOAT, GEOMETRIC
+
+from helpers import agree, arithmeticTerms, exact, geometricTerms, modeInput
+
+INPUTS = [("1", "2", 10), ("-3", "0.5", 7), ("2.5", "-1.5", 9), 
+          ("1", "1", 5), ("0", "3", 4), ("7", "-1", 6), ("1", "1/3", 12)]
+
+
+@pytest.mark.parametrize("mode", engine.PRECISION_MODES)
+@pytest.mark.parametrize("first, second, n", INPUTS)
+def test_arithmeticAndGeometricSums(first, second, n, mode):
+    a, b = exact(first), exact(second)
+    values = modeInput(first, mode), modeInput(second, mode)
+    if mode == FLOAT:
+        values = float(a), float(b)
+    assert agree(engine.seriesSum(ARITHMETIC, *values, n, mode), 
+                 sum(arithmeticTerms(a, b, n)), mode)
+    assert agree(engine.seriesSum(GEOMETRIC, *values, n, mode), 
+                 sum(geometricTerms(a, b, n)), mode)
+
+
+@pytest.mark.parametrize("mode", [engine.DECIMAL, engine.EXACT])
+def test_hugeGeometricSumsDoNotOverflow(mode):
+    # Float overflows beyond 1e308, the decimal and exact modes do not
+    assert engine.evaluate(GEOMETRIC, 1.0, 2.0, 2000)[1] == \
+           engine.OVERFLOW_ERROR
+    result, code = engine.evaluate(GEOMETRIC, "1", "2", 2000, mode)
+    assert code == engine.NO_ERROR and agree(result, 2 ** 2000 - 1, mode)
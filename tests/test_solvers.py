@@ -0,0 +1,38 @@
+''' Inverse solvers against brute force partial sums '''
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import ARITHMETIC, EXACT, FLOAT, GEOMETRIC
+
+from helpers import agree, arithmeticTerms, exact, geometricTerms
+
+
+@pytest.mark.parametrize("mode", engine.PRECISION_MODES)
+@pytest.mark.parametrize("seqType", [ARITHMETIC, GEOMETRIC])
+@pytest.mark.parametrize("first, second, n", [("1", "2", 10), ("2", "3", 6),
+                                              ("-1", "2", 8)])
+def test_solveSeries(first, second, n, seqType, mode):
+    a, b = exact(first), exact(second)
+    terms = (arithmeticTerms if seqType == ARITHMETIC else geometricTerms)(
+                                                                    a, b, n)
+    target = sum(terms)
+    # Smallest number of terms whose sum reaches the target
+    solved = engine.solveSeries(engine.NUMBER_OF_TERMS, seqType, first, 
+                                second, str(target), mode)
+    reached = [k for k in range(1, n + 1) 
+               if (sum(terms[:k]) >= target if target >= 0 
+                   else sum(terms[:k]) <= target)]
+    assert solved == reached[0]
+    assert agree(engine.solveSeries(engine.FIRST_TERM, seqType, second, n, 
+                                    str(target), mode), a, mode)
+    if b >= 0:
+        assert agree(engine.solveSeries(engine.COMMON_DIFF_OR_RATIO, seqType,
+                                        first, n, str(target), mode), 
+                     b, FLOAT if mode == EXACT and seqType == GEOMETRIC 
+                     else mode)
+
+
+def test_solveSeriesNoSolution():
+    assert engine.evaluateInverse(engine.NUMBER_OF_TERMS, GEOMETRIC, "1", 
+                                  "0.5", "3")[1] == engine.NO_SOLUTION_ERROR
@@ -0,0 +1,63 @@
+''' Summary statistics against brute force over the terms '''
+
+import decimal
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import ARITHMETIC, GEOMETRIC
+
+from helpers import agree, arithmeticTerms, exact, geometricTerms
+
+
+@pytest.mark.parametrize("mode", engine.PRECISION_MODES)
+@pytest.mark.parametrize("name", engine.STATISTICS)
+@pytest.mark.parametrize("seqType", [ARITHMETIC, GEOMETRIC])
+@pytest.mark.parametrize("first, second, n", 
+                         [("1", "2", 10), ("-3", "0.5", 7), ("2", "-2", 5)])
+def test_statistics(first, second, n, seqType, name, mode):
+    a, b = exact(first), exact(second)
+    terms = (arithmeticTerms if seqType == ARITHMETIC else geometricTerms)(
+                                                                    a, b, n)
+    mean = sum(terms) / n
+    reference = {"sum": sum(terms),
+                 "mean": mean,
+                 "variance": sum((t - mean) ** 2 for t in terms) / n,
+                 "sumOfSquares": sum(t * t for t in terms),
+                 "product": math.prod(terms),
+                 "lastTerm": terms[-1],
+                 "minimum": min(terms),
+                 "maximum": max(terms)}[name]
+    assert agree(engine.seriesStatistic(name, seqType, first, second, n, 
+                                        mode), reference, mode)
+
+
+@pytest.mark.parametrize("a, r, n", [(1e-10, 2.0, 40), (-2.685, 0.8548, 99), 
+                                     (2.276, 0.9097, 129), (1e300, 1e-200, 4)])
+def test_floatProductWithUnderflowingPowers(a, r, n):
+    # a ** n or r ** (n * (n - 1) / 2) is out of the float range, the 
+    # product is not
+    reference = Fraction(a) ** n * Fraction(r) ** (n * (n - 1) // 2)
+    result = engine.seriesStatistic("product", GEOMETRIC, a, r, n)
+    assert result != 0
+    assert abs(Fraction(result) - reference) <= 1e-12 * abs(reference)
+
+
+@pytest.mark.parametrize("a, r, n", [(1.0, 1 + 1e-9, 10 ** 5), 
+                                     (3.0, 1 - 1e-7, 1000), 
+                                     (1.0, 1.0000001, 2), 
+                                     (1.0, 1.0001, 10001), 
+                                     (2.0, 1.5, 40), (1.0, 0.5, 60), 
+                                     (1.0, 1e-100, 4)])
+def test_floatVarianceNearOne(a, r, n):
+    # E[t ** 2] - mean ** 2 cancels for nearly equal terms, so the float 
+    # variance is checked against 120 digit decimals, relatively
+    context = decimal.Context(prec=120, Emax=10 ** 6, Emin=-10 ** 6)
+    reference = Fraction(engine.seriesStatistic(
+                    "variance", GEOMETRIC, Decimal(a), Decimal(r), n, 
+                    engine.DECIMAL, context))
+    result = engine.seriesStatistic("variance", GEOMETRIC, a, r, n)
+    assert abs(Fraction(result) - reference) <= 1e-14 * reference
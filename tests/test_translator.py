@@ -0,0 +1,136 @@
+''' The translation pipeline, run offline through StubBackend against a
+temporary translations directory: new files, stale strings after the English
+text changes, skipped up to date languages, the manifest and retries '''
+
+import asyncio
+import copy
+import json
+
+import pytest
+
+import translator
+from translator import StubBackend
+
+
+@pytest.fixture
+def translations(tmp_path, monkeypatch):
+    '''Points the translator at an empty translations directory and
+    manifest, returns the directory'''
+    translationsPath = tmp_path / "translations"
+    translationsPath.mkdir()
+    monkeypatch.setattr(translator, "path", str(translationsPath))
+    monkeypatch.setattr(translator, "manifestPath",
+                        str(tmp_path / "translationManifest.json"))
+    monkeypatch.setattr(translator, "translationsDb",
+                        copy.deepcopy(translator.translationsDb))
+    return translationsPath
+
+
+def readLanguage(translationsPath, lang):
+    with open(translationsPath / f"{lang}.json", "r") as f:
+        return json.load(f)
+
+
+def test_writeLanguagesTranslatesEveryString(translations):
+    backend = StubBackend()
+    asyncio.run(translator.writeLanguages(["French", "German"], backend))
+    assert backend.requests == 2 # One batch per language
+    french = readLanguage(translations, "French")
+    assert french["title"] == ["[fr] Summing Series"]
+    assert french.keys() == translator.translationsDb.keys()
+    manifest = translator.loadManifest()
+    assert manifest["stale"] == {"French": {}, "German": {}}
+
+
+def test_changedEnglishStringsAreMarkedStale(translations):
+    asyncio.run(translator.writeLanguages(["French", "German"],
+                                          StubBackend()))
+    before = readLanguage(translations, "French")
+
+    translator.translationsDb["buttons"][1] = "Compute"
+    manifest = translator.loadManifest()
+    assert manifest["stale"] == {"French": {"buttons": [1]},
+                                 "German": {"buttons": [1]}}
+
+    backend = StubBackend()
+    asyncio.run(translator.updateLanguages(["French"], backend))
+    assert backend.requests == 1
+    after = readLanguage(translations, "French")
+    assert after["buttons"] == ["[fr] Clear", "[fr] Compute"]
+    assert {key: value for key, value in after.items()
+            if key != "buttons"} == {key: value for key, value in
+                                     before.items() if key != "buttons"}
+    # Only the updated language is cleared
+    assert translator.loadManifest()["stale"] == {"French": {},
+                                                  "German": {"buttons": [1]}}
+
+
+def test_upToDateLanguagesAreSkipped(translations, monkeypatch):
+    asyncio.run(translator.writeLanguages(["French"], StubBackend()))
+    opened = []
+    monkeypatch.setattr(translator, "loadJson",
+                        lambda lang: opened.append(lang))
+    backend = StubBackend()
+    asyncio.run(translator.updateLanguages(["French"], backend))
+    assert backend.requests == 0
+    assert opened == [] # Skipped without reading its file
+
+
+def test_missingStringsOfUnlistedLanguagesAreTranslated(translations):
+    # Files translated before the manifest existed only get missing strings
+    langDb = copy.deepcopy(translator.translationsDb)
+    langDb["buttons"] = ["Effacer"]
+    del langDb["title"]
+    with open(translations / "French.json", "w") as f:
+        json.dump(langDb, f)
+    asyncio.run(translator.updateLanguages(["French"], StubBackend()))
+    french = readLanguage(translations, "French")
+    assert french["buttons"] == ["Effacer", "[fr] Calculate"]
+    assert french["title"] == ["[fr] Summing Series"]
+    assert french["entries"] == translator.translationsDb["entries"]
+
+
+def test_manifestRoundTrips(translations):
+    manifest = {"source": translator.sourceHashes(),
+                "stale": {"French": {},
+                          "Japanese": {"errors": [0, 5], "title": [0]}}}
+    translator.saveManifest(manifest)
+    with open(translator.manifestPath, "r") as f:
+        assert json.load(f) == manifest
+    assert translator.loadManifest() == manifest
+
+
+class HangingBackend(StubBackend):
+    '''Its first requests never answer, so they time out'''
+    def __init__(self, hangs):
+        super().__init__()
+        self.hangs = hangs
+
+    async def translateBatch(self, texts, dest, src = "en"):
+        if self.requests < self.hangs:
+            self.requests += 1
+            await asyncio.Event().wait()
+        return await super().translateBatch(texts, dest, src)
+
+
+def test_timeoutsAreRetriedWithBackoff(monkeypatch):
+    delays = []
+    sleep = asyncio.sleep
+
+    async def recordingSleep(delay, *args):
+        delays.append(delay)
+        await sleep(0)
+    monkeypatch.setattr(translator.asyncio, "sleep", recordingSleep)
+
+    backend = HangingBackend(hangs=2)
+    result = asyncio.run(translator.translateWithRetry(
+                backend, ["Clear"], "fr", backoff=0.5, timeout=0.05))
+    assert result == ["[fr] Clear"]
+    assert backend.requests == 3
+    # The backoff doubles (the stub's own zero delay is left out)
+    assert [delay for delay in delays if delay] == [0.5, 1.0]
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(translator.translateWithRetry(
+            HangingBackend(hangs=3), ["Clear"], "fr", retries=2,
+            backoff=0.5, timeout=0.05))
@@ -0,0 +1,31 @@
+''' The numpy kernels give the scalar results and error codes '''
+
+import math
+
+import pytest
+
+import seriesengine as engine
+from seriesengine import ARITHMETIC, GEOMETRIC
+
+
+@pytest.mark.parametrize("seqType", [ARITHMETIC, GEOMETRIC])
+def test_vectorSumMatchesScalar(seqType):
+    np = pytest.importorskip("numpy")
+    first = np.array([1.0, -2.0, 3.0, 1.0, 1.0, 1.0])
+    second = np.array([2.0, 0.5, 1.0, 1.0 + 1e-9, 2.0, 2.0])
+    n = np.array([10, 7, 5, 1000, 0, 2.5])
+    sums, codes = engine.vectorSum(seqType, first, second, n)
+    for i in range(len(n) - 1):
+        value, code = engine.evaluate(seqType, first[i], second[i], int(n[i]))
+        assert code == codes[i]
+        if code == engine.NO_ERROR:
+            assert math.isclose(sums[i], value, rel_tol=1e-12)
+        else:
+            assert math.isnan(sums[i])
+    assert codes[-1] == engine.VALUE_ERROR # Fractional number of terms
+
+
+def test_vectorSumBroadcasts():
+    np = pytest.importorskip("numpy")
+    sums, codes = engine.vectorSum(ARITHMETIC, 1.0, np.array([1.0, 2.0]), 4)
+    assert list(sums) == [10.0, 16.0] and list(codes) == [engine.NO_ERROR] * 2
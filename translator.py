@@ -1,134 +1,308 @@
 '''
 This program assigns translations to a dictionary and writes it into a JSON file.
 This program is only documented for the purpose of explaining the translation process
-! Requires the googletrans module to be installed. (pip install googletrans)
+! Requires the googletrans module to be installed for real translations. (pip install googletrans)
+  The offline stub backend (--backend stub) needs no extra modules or network access.
 
-Limitations: 
-- When updating a JSON language file, new translations can only be APPENDED to a key's value
+Translations are requested asynchronously: every string a language is missing is sent
+in one batched request, up to --concurrency languages are translated at the same time,
+and failed requests (timeouts, dropped connections) are retried with exponential backoff.
+
+translationManifest.json records a hash of every English string ("source", once for all
+languages) and, per language, the strings whose translation is out of date ("stale").
+When translationsDb changes, the strings whose hash changed are marked stale in every
+language, so updates only translate those (and missing ones) and skip languages that are
+already up to date without opening their files.
+
+Limitations:
 - Due to a bug in the googletrans module, some languages will not be translatable
 - Translation to some languages result in a timeout of the Google Translate API
 '''
 
+import argparse
+import asyncio
+import copy
+import hashlib
 import json
 import os
-import googletrans
-from googletrans import Translator
-import httpx
+from typing import Dict, List, Tuple
 
-translator = Translator() 
+try: # Only needed by GoogleBackend
+    import httpx
+    from googletrans import Translator
+except ImportError:
+    httpx = None
+    Translator = None
+
+import langbundle
 
 translationsDb = { # Text within the program
-    "entries" :      ["First term", "Common difference", "Common ratio", "Number of terms"],
+    "entries" :      ["First term", "Common difference", "Common ratio", "Number of terms", "Term formula in k, e.g. 1/k**2", "Parameter r", "Exponent p"],
     "buttons" :      ["Clear", "Calculate"],
-    "radiobuttons" : ["Arithmetic Series", "Geometric Series"],
+    "radiobuttons" : ["Arithmetic Series", "Geometric Series", "Custom Series", "Arithmetico-geometric Series", "Power Sum"],
+    "solver" :       ["Solve for number of terms", "Target sum"],
+    "infinite" :     ["Sum to infinity", "Estimated error", "Terms used"],
     "fontsize" :     ["Size", "Small", "Medium", "Large"],
     "appearance" :   ["Appearance", "Themes", "Light", "Dark", "System", "Blue", "Green", "Dark blue"],
     "languages" :    ["Languages"],
     "errors" :       ["An exception occured: ValueError - Ensure all fields are filled and have numeric entries",
                       "An exception occured: InvalidNumberOfTerms - The length of the series cannot be a negative number or 0, please choose an appropriate length",
-                      "An exception occured: OverflowError - Please reduce the value of the entered integers"],
-    "filemenu" :     ["File", "Restart", "Exit"], 
+                      "An exception occured: OverflowError - Please reduce the value of the entered integers",
+                      "An exception occured: NoSolution - No value reaches the target sum, please check the entered values",
+                      "An exception occured: Divergent - The series does not converge, so it has no sum to infinity",
+                      "An exception occured: NotConverged - The series converges too slowly to estimate its sum to infinity accurately"],
+    "filemenu" :     ["File", "Restart", "Exit"],
     "title" :        ["Summing Series"],
     "langloader":    ["Translator", "Program is already set to", "is either not available, or its JSON data is formatted incorrectly"],
     "destroy":       ["Do you want to {}? All entry data will be lost", "quit", "restart"]
 }
 
-transDict = translationsDb.copy() 
+currentDir = os.path.dirname(os.path.abspath(__file__))
+path = os.path.join(currentDir, "translations")
+manifestPath = os.path.join(currentDir, "translationManifest.json")
 
-languages = googletrans.LANGUAGES
-languages = {v.title(): k for k, v in languages.items()} # Reverse and capitalise values
+with open(os.path.join(currentDir, "langCodes.json"), "r") as f:
+    languages = {v: k for k, v in json.load(f).items()} # Language name: code
 
-currentDir = os.path.dirname(os.path.abspath(__file__)) 
-path = os.path.join(currentDir, "translations")
+# Errors worth retrying: the request timed out or the connection was dropped
+retryableErrors = (asyncio.TimeoutError, TimeoutError, ConnectionError)
+if httpx is not None:
+    retryableErrors += (httpx.ReadError, httpx.TimeoutException)
 
 
-def jsonUpdater(lang):
-    '''Updates existing files'''
+class TranslationBackend:
+    '''Interface for translation services. translateBatch receives every string
+    that is missing from a language and returns their translations in order'''
+    async def translateBatch(self, texts: List[str], dest: str, src: str = "en") -> List[str]:
+        raise NotImplementedError
+
+
+class GoogleBackend(TranslationBackend):
+    '''Google Translate through googletrans. The strings of a batch are joined by
+    line breaks and sent as one request, then split again'''
+    separator = "\n"
+
+    def __init__(self):
+        if Translator is None:
+            raise ImportError("The google backend requires googletrans (pip install googletrans)")
+        self.translator = Translator()
+
+    async def translateBatch(self, texts, dest, src = "en"):
+        # googletrans is synchronous, so requests run in worker threads
+        joined = await asyncio.to_thread(self.translator.translate, self.separator.join(texts), dest = dest, src = src)
+        translations = joined.text.split(self.separator)
+        if len(translations) == len(texts):
+            return translations
+        # Google merged or split lines, translate the strings one by one instead
+        results = await asyncio.to_thread(self.translator.translate, texts, dest = dest, src = src)
+        return [result.text for result in results]
+
+
+class StubBackend(TranslationBackend):
+    '''Offline stand-in for testing: "translates" by tagging each string with the
+    language code. Can simulate network latency and a number of failed requests'''
+    def __init__(self, delay = 0.0, failures = 0):
+        self.delay = delay
+        self.failures = failures # Requests that raise a retryable error first
+        self.requests = 0
+
+    async def translateBatch(self, texts, dest, src = "en"):
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("Simulated dropped connection")
+        return [f"[{dest}] {text}" for text in texts]
+
+
+backends = {"google": GoogleBackend, "stub": StubBackend}
+
+
+async def translateWithRetry(backend, texts, dest, retries = 3, backoff = 0.5, timeout = 30.0):
+    '''Translate one batch, retrying retryable errors after 0.5s, 1s, 2s... (backoff doubles)'''
+    for attempt in range(retries + 1):
+        try:
+            return await asyncio.wait_for(backend.translateBatch(texts, dest = dest, src = "en"), timeout)
+        except retryableErrors:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(backoff * 2 ** attempt)
+
+
+async def translateAll(backend, jobs: Dict[str, List[str]], concurrency = 8, **retryOptions) -> Dict[str, object]:
+    '''Translate {language: [missing strings]} with at most concurrency requests in flight.
+    Returns {language: translations}, or {language: exception} for languages that failed'''
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def translateLanguage(lang, texts):
+        if languages[lang] == "en":
+            return texts # Takes text straight from this scripts base text dictionary
+        async with semaphore:
+            return await translateWithRetry(backend, texts, languages[lang], **retryOptions)
+
+    names = [lang for lang in jobs if jobs[lang]]
+    results = await asyncio.gather(*(translateLanguage(lang, jobs[lang]) for lang in names), return_exceptions = True)
+    return dict(zip(names, results))
+
+
+def loadJson(lang):
+    '''Returns the language's translations, or None if they cannot be read'''
     jsonFile = os.path.join(path, f"{lang}.json")
     if not os.path.exists(jsonFile):
-        print("File does not exist. Try writing a new file instead.")
-        return 
-    
+        print(f"{lang}: File does not exist. Try writing a new file instead.")
+        return None
     try:
-        # Attempt to load jsonFile
         with open(jsonFile, "r") as f:
-            jsonDict = json.load(f)
-
+            return json.load(f)
     except json.decoder.JSONDecodeError:
         print(f"{lang}'s JSON data is either formatted incorrectly, or it is empty.")
-        return
+        return None
 
-    changes = {"keys": 0, "arrays": 0} # Keep track of changes
-    for key in translationsDb:
-        if key not in jsonDict:
-            jsonDict[key] = [] # Add missing keys
-            changes["keys"] += 1 
-
-        transDbLen = len(translationsDb[key])
-        dataLen = len(jsonDict[key])
-
-        if transDbLen > dataLen: # This means there are missing array elements
-            missingItems = translationsDb[key][dataLen:] # Find all missing items in each key's array
-            for i, item in enumerate(missingItems):
-                # Translation process
-                transtext = translator.translate(item, dest = languages[lang], src = "en")
-                missingItems[i] = transtext.text
-            jsonDict[key].extend(missingItems)
-            changes["arrays"] += len(missingItems)
-
-    print(f"{lang} was updated with {changes['keys']} keys added and {changes['arrays']} array items added.")
-
-    with open(jsonFile, "w") as f:
-        newJsonDict = json.dumps(jsonDict, indent = 4) # Serialise data and make it JSON ready
-        f.write(newJsonDict) # Write updated translations to the jsonFile (f)
-
-def updateAll():
-    '''Executes jsonUpdater on ALL languages in the current directory'''
-    langList = sorted(os.listdir(path)) 
-    langList = [lang.replace(".json", "") for lang in langList]
-    for lang in langList:
-        jsonUpdater(lang)
 
-def jsonWriter(lang):
-    '''Writes new translations to files'''
-    jsonFile = os.path.join(path, f"{lang}.json")
-    
-    # Create new file if it doesnt exist
-    if not os.path.exists(jsonFile):
-        open(f"{path}/{lang}.json", "x")
+def saveJson(lang, jsonDict):
+    with open(os.path.join(path, f"{lang}.json"), "w") as f:
+        f.write(json.dumps(jsonDict, indent = 4)) # Serialise data and make it JSON ready
 
-    if os.path.getsize(jsonFile) > 0:
-        print(f"Data appears to already exist in {lang}.json. You might want to try updating it instead.")
-        return
+def textHash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+def sourceHashes():
+    '''{key: [hash of each English string]} for the current translationsDb'''
+    return {key: [textHash(text) for text in texts] for key, texts in translationsDb.items()}
+
+def loadManifest():
+    '''{"source": {key: [hash, ...]}, "stale": {language: {key: [index, ...]}}}, brought
+    up to date with translationsDb: strings whose English text changed (or that were added)
+    since the manifest was saved are marked stale in every language it lists'''
+    try:
+        with open(manifestPath, "r") as f:
+            manifest = json.load(f)
+    except (OSError, json.decoder.JSONDecodeError):
+        manifest = {}
+    recorded = manifest.get("source", {})
+    hashes = sourceHashes()
+    changed = {key: [i for i, sourceHash in enumerate(hashes[key])
+                     if i >= len(recorded.get(key, [])) or recorded[key][i] != sourceHash]
+               for key in hashes}
+    stale = manifest.get("stale", {})
+    for lang, staleIndexes in stale.items():
+        for key, indexes in changed.items():
+            if indexes:
+                staleIndexes[key] = sorted(set(staleIndexes.get(key, [])) | set(indexes))
+    return {"source": hashes, "stale": stale}
+
+def saveManifest(manifest):
+    '''One line per source key and per language, so the file stays short'''
+    def block(name, entries):
+        rows = [f"        {json.dumps(key)}: {json.dumps(value, ensure_ascii = False, sort_keys = True)}"
+                for key, value in sorted(entries.items())]
+        return f"    {json.dumps(name)}: {{\n" + ",\n".join(rows) + "\n    }"
+    with open(manifestPath, "w") as f:
+        f.write("{\n" + block("source", manifest["source"]) + ",\n"
+                + block("stale", manifest["stale"]) + "\n}\n")
 
+def findStale(jsonDict, staleIndexes) -> List[Tuple[str, int, str]]:
+    '''(key, index, English text) of every array element that is missing from jsonDict
+    or is marked stale in the manifest. Languages the manifest does not list (files
+    translated before it existed) only get their missing elements'''
+    stale = []
     for key in translationsDb:
-        for i, text in enumerate(translationsDb[key]):
-            if lang != "en":
+        dataLen = len(jsonDict.get(key, []))
+        marked = set(staleIndexes.get(key, []))
+        for i, item in enumerate(translationsDb[key]):
+            if i >= dataLen or i in marked:
+                stale.append((key, i, item))
+    return stale
+
 
-                try:
-                    transtext = translator.translate(translationsDb[key][i], dest = languages[lang], src = "en")
+async def updateLanguages(langList, backend, concurrency = 8):
+    '''Translates missing and changed strings of existing files'''
+    manifest = loadManifest()
+    # Languages whose translations were made from the current English text need no work
+    upToDate = [lang for lang in langList if manifest["stale"].get(lang) == {}]
+    for lang in upToDate:
+        print(f"{lang} is up to date.")
+    langList = [lang for lang in langList if lang not in upToDate]
 
-                except TypeError or TimeoutError or httpx.ReadError:
-                    print(f"Due to a bug with the googletrans module, translation to some languages such as {lang} result in incomplete translation. Sorry.")
-                    with open(jsonFile, "w") as f:
-                        f.truncate(0) # Delete failed translation data
-                    return
+    jsonDicts = {lang: jsonDict for lang in langList if (jsonDict := loadJson(lang)) is not None}
+    plans = {lang: findStale(jsonDict, manifest["stale"].get(lang, {}))
+             for lang, jsonDict in jsonDicts.items()}
+    results = await translateAll(backend, {lang: [item[2] for item in plan] for lang, plan in plans.items()}, concurrency)
 
-                transDict[key][i] = transtext.text
+    for lang, plan in plans.items():
+        translations = results.get(lang, [])
+        if isinstance(translations, BaseException):
+            print(f"{lang} could not be updated ({type(translations).__name__}). Try again later.")
+            continue
+        jsonDict = jsonDicts[lang]
+        addedKeys = 0
+        for (key, i, _), text in zip(plan, translations):
+            if key not in jsonDict:
+                jsonDict[key] = [] # Add missing keys
+                addedKeys += 1
+            if i < len(jsonDict[key]):
+                jsonDict[key][i] = text # The English text changed
             else:
-                transDict[key][i] = text # Takes text straight from this scripts base text dictionary
+                jsonDict[key].append(text) # Stale elements are visited in order, so this is index i
+        print(f"{lang} was updated with {addedKeys} keys added and {len(plan)} array items translated.")
+        if plan:
+            saveJson(lang, jsonDict)
+        manifest["stale"][lang] = {}
+    saveManifest(manifest)
 
-        newJsonDict = json.dumps(transDict, indent = 4)
 
-        with open(f"{path}/{lang}.json", "w") as f: 
-            f.write(newJsonDict)
-            
-    print(f"{lang} translations are complete")
+async def writeLanguages(langList, backend, concurrency = 8):
+    '''Writes new translations to files'''
+    jobs = []
+    for lang in langList:
+        jsonFile = os.path.join(path, f"{lang}.json")
+        if os.path.exists(jsonFile) and os.path.getsize(jsonFile) > 0:
+            print(f"Data appears to already exist in {lang}.json. You might want to try updating it instead.")
+            continue
+        jobs.append(lang)
+    plan = findStale({}, {})
+    results = await translateAll(backend, {lang: [item[2] for item in plan] for lang in jobs}, concurrency)
+
+    manifest = loadManifest()
+    for lang in jobs:
+        translations = results[lang]
+        if isinstance(translations, BaseException):
+            print(f"Due to a bug with the googletrans module, translation to some languages such as {lang} result in incomplete translation. Sorry.")
+            continue
+        transDict = copy.deepcopy(translationsDb)
+        for (key, i, _), text in zip(plan, translations):
+            transDict[key][i] = text
+        saveJson(lang, transDict)
+        manifest["stale"][lang] = {}
+        print(f"{lang} translations are complete")
+    saveManifest(manifest)
+
+
+def jsonUpdater(lang, backend = None):
+    '''Updates existing files'''
+    asyncio.run(updateLanguages([lang], backend or GoogleBackend()))
 
-def onStart():
-    updateAllChoice = True if input(f"Do you wish to update all language JSONs in {path}? (Y/n): ").upper() in ["Y", "Yes"] else False
+def updateAll(backend = None, concurrency = 8):
+    '''Executes jsonUpdater on ALL languages in the current directory, concurrently'''
+    langList = sorted(os.listdir(path))
+    langList = [lang.replace(".json", "") for lang in langList]
+    asyncio.run(updateLanguages(langList, backend or GoogleBackend(), concurrency))
+
+def jsonWriter(lang, backend = None):
+    '''Writes new translations to files'''
+    asyncio.run(writeLanguages([lang], backend or GoogleBackend()))
+
+def compileBundle():
+    '''Rebuilds translations.bundle, which the program loads languages from'''
+    skipped = langbundle.buildBundle(path)
+    print(f"Compiled {langbundle.BUNDLE_NAME}"
+          + (f" (skipped {', '.join(skipped)})" if skipped else ""))
+
+def onStart(backend, concurrency):
+    updateAllChoice = True if input(f"Do you wish to update all language JSONs in {path}? (Y/n): ").upper() in ["Y", "YES"] else False
     if updateAllChoice:
-        updateAll()
+        updateAll(backend, concurrency)
+        compileBundle()
         return
 
     print("\nRefer to the values of langCodes.json for the following input")
@@ -136,13 +310,22 @@ def onStart():
     if lang not in languages.keys():
         print("\nInvalid language\n")
         return
-            
+
     choice = str(input(f"\nEnter 1 to update {lang}'s existing json file.\nEnter 2 to write new translations into {lang}.json (file will be created if it doesn't exist)\n"))
     if choice == "1":
-        jsonUpdater(lang)
+        jsonUpdater(lang, backend)
+        compileBundle()
     elif choice == "2":
-        jsonWriter(lang)
+        jsonWriter(lang, backend)
+        compileBundle()
     else:
         print("\nEnter either 1 or 2")
 
-onStart()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Translate the program's text into other languages")
+    parser.add_argument("--backend", choices = sorted(backends), default = "google",
+                        help = "translation service, 'stub' works offline (default: google)")
+    parser.add_argument("--concurrency", type = int, default = 8,
+                        help = "languages translated at the same time (default: 8)")
+    args = parser.parse_args()
+    onStart(backends[args.backend](), args.concurrency)